@@ -0,0 +1 @@
+# Benchmarks package (run with: python -m benchmarks run)
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Command line entry point: python -m benchmarks {run,compare}
+"""
+import argparse
+import json
+import os
+import sys
+
+# Benchmarks never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game.constants import BENCHMARK_SEED
+from .runner import BENCHMARKS, DEFAULT_THRESHOLD, run_benchmarks, write_report, compare_reports
+from . import suites  # Registers the benchmarks
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="World, physics and rendering benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="run benchmarks and write the results as JSON")
+    run_parser.add_argument("names", nargs="*", metavar="NAME",
+                            help=f"benchmarks to run (default all: {', '.join(BENCHMARKS)})")
+    run_parser.add_argument("--seed", type=int, default=BENCHMARK_SEED,
+                            help="world seed used by the benchmarks")
+    run_parser.add_argument("--samples", type=int,
+                            help="timed samples per benchmark (default per benchmark)")
+    run_parser.add_argument("--output", metavar="PATH",
+                            help="write results to PATH (default logs/bench_<time>.json)")
+    
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline", help="baseline results JSON")
+    compare_parser.add_argument("current", help="current results JSON")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative median slowdown flagged as a regression (default 0.10)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    
+    if args.command == "run":
+        unknown = [name for name in args.names if name not in BENCHMARKS]
+        if unknown:
+            print(f"Unknown benchmarks: {', '.join(unknown)}")
+            return 2
+        
+        import pygame
+        pygame.init()
+        report = run_benchmarks(args.names, args.seed, args.samples)
+        print(f"Benchmark results written to {write_report(report, args.output)}")
+        return 0
+    
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r') as f:
+        current = json.load(f)
+    
+    regressions = compare_reports(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Benchmark registration, timing and result comparison
+"""
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from game.benchmark import summarize_timings, get_git_commit
+
+# Registered benchmarks in definition order: name -> (factory, samples)
+BENCHMARKS = {}
+
+DEFAULT_SAMPLES = 20
+DEFAULT_THRESHOLD = 0.10  # Relative slowdown of the median flagged as a regression
+
+def benchmark(name, samples=DEFAULT_SAMPLES):
+    """Register a benchmark
+    
+    The decorated factory does any setup and returns a Case; only
+    Case.run is timed.
+    """
+    def decorator(factory):
+        BENCHMARKS[name] = (factory, samples)
+        return factory
+    return decorator
+
+class Case:
+    """A timed operation with optional untimed per-sample setup"""
+    
+    def __init__(self, run, ops=1, setup=None, teardown=None):
+        self.run = run
+        self.ops = ops  # Operations performed by one call of run
+        self.setup = setup
+        self.teardown = teardown
+
+def time_case(case, samples):
+    """Time a case and return per-operation timings in microseconds"""
+    timings = []
+    clock = time.perf_counter_ns
+    
+    # One untimed call warms caches and lazily loaded chunks
+    if case.setup:
+        case.setup()
+    case.run()
+    
+    for _ in range(samples):
+        if case.setup:
+            case.setup()
+        start = clock()
+        case.run()
+        timings.append((clock() - start) / 1000.0 / case.ops)
+    return timings
+
+def run_benchmarks(names=None, seed=0, samples=None):
+    """Run the selected benchmarks and return the results report"""
+    report = {
+        'commit': get_git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'seed': seed,
+        'unit': 'us/op',
+        'results': {}
+    }
+    
+    for name in names or list(BENCHMARKS.keys()):
+        factory, default_samples = BENCHMARKS[name]
+        case = factory(seed)
+        try:
+            timings = time_case(case, samples or default_samples)
+        finally:
+            if case.teardown:
+                case.teardown()
+        
+        stats = summarize_timings(timings)
+        stats['min'] = min(timings)
+        stats['samples'] = len(timings)
+        stats['ops'] = case.ops
+        report['results'][name] = stats
+        print(f"{name:>28}: median {stats['p50']:>12.3f} us/op  "
+              f"p95 {stats['p95']:>12.3f}  min {stats['min']:>12.3f}")
+    
+    return report
+
+def write_report(report, output=None):
+    """Write a results report as JSON and return its path"""
+    if output is None:
+        os.makedirs("logs", exist_ok=True)
+        output = f"logs/bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    return output
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare median timings and return the names that regressed beyond threshold"""
+    regressions = []
+    print(f"{'benchmark':>28}  {'baseline':>12}  {'current':>12}  change")
+    
+    for name, stats in current['results'].items():
+        base_stats = baseline['results'].get(name)
+        if base_stats is None:
+            print(f"{name:>28}  {'-':>12}  {stats['p50']:>12.3f}  new")
+            continue
+        
+        change = (stats['p50'] - base_stats['p50']) / base_stats['p50'] if base_stats['p50'] else 0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:>28}  {base_stats['p50']:>12.3f}  {stats['p50']:>12.3f}  {change:+7.1%}{flag}")
+    
+    return regressions
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Benchmarks for world generation, chunk I/O, block queries, item drops,
+crafting and world rendering
+"""
+import copy
+import random
+from game.constants import *
+from game.world import World, Chunk
+from game.crafting import CraftingSystem
+from game.replay import TickInput, RecordedKeys, clear_save
+from .runner import benchmark, Case
+
+BENCHMARK_WORLD = "_bench"
+QUERY_COUNT = 10000  # Block queries per timed call
+DROP_TYPES = [BLOCK_DIRT, BLOCK_STONE, BLOCK_WOOD, BLOCK_SAND]
+
+def create_world(seed):
+    """Create a fresh world with the chunks around spawn loaded"""
+    clear_save(BENCHMARK_WORLD)
+    world = World(seed=seed, save_name=BENCHMARK_WORLD)
+    world.ensure_chunks_loaded(0)
+    return world
+
+def remove_world():
+    """Delete the scratch world"""
+    clear_save(BENCHMARK_WORLD)
+
+def get_query_positions(seed, count=QUERY_COUNT):
+    """Get fixed block positions spread over the chunks around spawn"""
+    rng = random.Random(seed)
+    span = RENDER_DISTANCE * CHUNK_SIZE
+    return [(rng.randint(-span, span), rng.randint(0, WORLD_HEIGHT - 1)) for _ in range(count)]
+
+@benchmark("chunk_generate")
+def bench_chunk_generate(seed):
+    chunk_indexes = list(range(-32, 32))
+    state = {'next': 0}
+    
+    def run():
+        chunk_x = chunk_indexes[state['next'] % len(chunk_indexes)]
+        state['next'] += 1
+        Chunk(chunk_x).generate(seed)
+    
+    return Case(run)
+
+@benchmark("chunk_save_load")
+def bench_chunk_save_load(seed):
+    world = create_world(seed)
+    chunk = world.chunks[0]
+    
+    def run():
+        chunk.modified = True
+        world.save_chunk(chunk)
+        world.load_chunk_from_disk(chunk.chunk_x)
+    
+    return Case(run, teardown=remove_world)
+
+@benchmark("world_get_block")
+def bench_world_get_block(seed):
+    world = create_world(seed)
+    positions = get_query_positions(seed)
+    get_block = world.get_block
+    
+    def run():
+        for x, y in positions:
+            get_block(x, y)
+    
+    return Case(run, ops=len(positions), teardown=remove_world)
+
+@benchmark("world_is_solid")
+def bench_world_is_solid(seed):
+    world = create_world(seed)
+    positions = get_query_positions(seed)
+    is_solid = world.is_solid
+    
+    def run():
+        for x, y in positions:
+            is_solid(x, y)
+    
+    return Case(run, ops=len(positions), teardown=remove_world)
+
+def bench_item_drops(seed, count):
+    """Update and stack count drops scattered over the simulated chunks"""
+    world = create_world(seed)
+    rng = random.Random(seed)
+    span = SIMULATION_DISTANCE * CHUNK_SIZE * BLOCK_SIZE
+    
+    for _ in range(count):
+        world.add_item_drop(rng.uniform(-span, span), rng.uniform(0, SURFACE_LEVEL * BLOCK_SIZE),
+                            rng.choice(DROP_TYPES))
+    initial_drops = copy.deepcopy(world.item_drops)
+    
+    def setup():
+        # Stacking merges drops, so every sample starts from the same set
+        world.item_drops = copy.deepcopy(initial_drops)
+    
+    return Case(world.update_item_drops, setup=setup, teardown=remove_world)
+
+@benchmark("item_drops_100")
+def bench_item_drops_100(seed):
+    return bench_item_drops(seed, 100)
+
+@benchmark("item_drops_1000", samples=5)
+def bench_item_drops_1000(seed):
+    return bench_item_drops(seed, 1000)
+
+@benchmark("item_drops_10000", samples=2)
+def bench_item_drops_10000(seed):
+    return bench_item_drops(seed, 10000)
+
+@benchmark("crafting_update_result")
+def bench_crafting_update_result(seed):
+    crafting = CraftingSystem()
+    crafting.crafting_grid = [[(BLOCK_WOOD, 1), (BLOCK_WOOD, 1)],
+                              [None, (ITEM_STICK, 2)]]
+    
+    def run():
+        for _ in range(100):
+            crafting.update_result()
+    
+    return Case(run, ops=100)
+
+@benchmark("draw_world")
+def bench_draw_world(seed):
+    from game.game import Game
+    
+    game = Game(max_fps=0)
+    clear_save(BENCHMARK_WORLD)
+    game.init_game_world(seed=seed, save_name=BENCHMARK_WORLD)
+    idle = TickInput(RecordedKeys([]), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    for _ in range(30):
+        game.update_game(idle)
+    
+    def run():
+        game.screen.fill((135, 206, 235))
+        game.renderer.draw_world(game.world, game.camera)
+    
+    # Load the lazily loaded textures in view, so samples never draw placeholders
+    run()
+    game.texture_manager.finish_pending_textures()
+    
+    return Case(run, teardown=remove_world)
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Headless rendering benchmark using the SDL dummy video driver
+"""
+import json
+import os
+import subprocess
+import time
+import pygame
+from datetime import datetime
+from .constants import *
+from .replay import TickInput, RecordedKeys, clear_save
+from .utils import percentile
+
+# Scripted camera paths: keybinds held every frame (jump clears terrain steps)
+# and whether the inventory is open
+BENCHMARK_SCENARIOS = {
+    'static': {'keybinds': [], 'inventory_open': False},
+    'walking': {'keybinds': ['move_right', 'jump'], 'inventory_open': False},
+    'sprinting': {'keybinds': ['move_right', 'sprint', 'jump'], 'inventory_open': False},
+    'inventory_open': {'keybinds': [], 'inventory_open': True}
+}
+
+BENCHMARK_PHASES = ['update', 'draw_world', 'draw_player', 'draw_ui', 'draw_inventory', 'flip']
+
+def summarize_timings(samples):
+    """Summarize a list of millisecond timings"""
+    if not samples:
+        return {'mean': 0, 'p50': 0, 'p95': 0, 'p99': 0, 'max': 0}
+    return {
+        'mean': sum(samples) / len(samples),
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+        'max': max(samples)
+    }
+
+def get_git_commit():
+    """Get the current git commit, if the game runs from a checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def climb_obstacle(game):
+    """Lift the player onto the column ahead so scripted paths keep moving"""
+    player = game.player
+    column_x = int((player.x + player.width + BLOCK_SIZE // 2) // BLOCK_SIZE)
+    for y in range(WORLD_HEIGHT):
+        if game.world.is_solid(column_x, y):
+            player.x = column_x * BLOCK_SIZE + 2
+            player.y = y * BLOCK_SIZE - player.height - 1
+            player.vel_y = 0
+            return
+
+def run_scenario(game, scenario, frames, seed):
+    """Run one scripted scenario and return per-phase timings in milliseconds"""
+    clear_save(BENCHMARK_SAVE_NAME)
+    game.init_game_world(seed=seed, save_name=BENCHMARK_SAVE_NAME)
+    
+    pressed = [game.player.get_key_code(keybind) for keybind in scenario['keybinds']]
+    keys = RecordedKeys(key for key in pressed if key is not None)
+    mouse_pos = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    if scenario['inventory_open']:
+        game.inventory_gui.is_open = True
+    
+    timings = dict((phase, []) for phase in BENCHMARK_PHASES)
+    clock = time.perf_counter
+    
+    for frame in range(BENCHMARK_WARMUP_FRAMES + frames):
+        phase_times = {}
+        
+        previous_x = game.player.x
+        start = clock()
+        game.update_game(TickInput(keys, mouse_pos))
+        phase_times['update'] = clock() - start
+        
+        # Trees and cliffs taller than a jump would stall the moving scenarios
+        if scenario['keybinds'] and game.player.x == previous_x:
+            climb_obstacle(game)
+        
+        start = clock()
+        game.screen.fill((135, 206, 235))
+        game.camera.interpolate(1.0)
+        game.renderer.draw_world(game.world, game.camera)
+        phase_times['draw_world'] = clock() - start
+        
+        start = clock()
+        game.player.draw(game.screen, game.camera.render_x, game.camera.render_y)
+        phase_times['draw_player'] = clock() - start
+        
+        start = clock()
+        game.renderer.draw_ui(game.player)
+        phase_times['draw_ui'] = clock() - start
+        
+        start = clock()
+        game.inventory_gui.draw(game.player)
+        phase_times['draw_inventory'] = clock() - start
+        
+        start = clock()
+        pygame.display.flip()
+        phase_times['flip'] = clock() - start
+        
+        if frame >= BENCHMARK_WARMUP_FRAMES:
+            for phase, seconds in phase_times.items():
+                timings[phase].append(seconds * 1000)
+    
+    game.world.cleanup()
+    
+    frame_totals = [sum(values) for values in zip(*timings.values())]
+    results = dict((phase, summarize_timings(samples)) for phase, samples in timings.items())
+    results['frame'] = summarize_timings(frame_totals)
+    return results
+
+def run_benchmark(frames=BENCHMARK_FRAMES, seed=BENCHMARK_SEED, output=None, scenarios=None):
+    """Run the headless benchmark and write the results as JSON; returns an exit code"""
+    # Benchmarks never open a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from .game import Game
+    
+    game = Game(max_fps=0)
+    scenario_names = scenarios or list(BENCHMARK_SCENARIOS.keys())
+    
+    report = {
+        'commit': get_git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'frames': frames,
+        'scenarios': {}
+    }
+    
+    for name in scenario_names:
+        results = run_scenario(game, BENCHMARK_SCENARIOS[name], frames, seed)
+        report['scenarios'][name] = results
+        
+        frame_stats = results['frame']
+        print(f"{name:>15}: frame p50 {frame_stats['p50']:.2f}ms  "
+              f"p95 {frame_stats['p95']:.2f}ms  p99 {frame_stats['p99']:.2f}ms")
+        for phase in BENCHMARK_PHASES:
+            stats = results[phase]
+            print(f"{'':>17}{phase:<15} p50 {stats['p50']:.3f}ms  "
+                  f"p95 {stats['p95']:.3f}ms  p99 {stats['p99']:.3f}ms")
+    
+    if output is None:
+        os.makedirs("logs", exist_ok=True)
+        output = f"logs/benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results written to {output}")
+    return 0
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .constants import *
+from .utils import lerp
 
 class Camera:
     def __init__(self):
@@ -7,9 +8,19 @@ class Camera:
         self.target_x = 0
         self.target_y = 0
         self.smoothing = 0.1
+        
+        # Position at the previous simulation tick and the interpolated
+        # position used for drawing between ticks
+        self.prev_x = 0
+        self.prev_y = 0
+        self.render_x = 0
+        self.render_y = 0
     
     def update(self, player):
         """Update camera to follow player smoothly"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Calculate target position (center camera on player)
         self.target_x = player.x + player.width // 2 - SCREEN_WIDTH // 2
         self.target_y = player.y + player.height // 2 - SCREEN_HEIGHT // 2
@@ -27,4 +38,13 @@ class Camera:
         
         # Ensure camera stays within bounds
         self.x = max(0, min(max_x, self.x))
-        self.y = max(0, min(max_y, self.y))
\ No newline at end of file
+        self.y = max(0, min(max_y, self.y))
+        
+        # Without interpolation the camera renders at its simulated position
+        self.render_x = self.x
+        self.render_y = self.y
+    
+    def interpolate(self, alpha):
+        """Set the render position between the last two simulation ticks"""
+        self.render_x = lerp(self.prev_x, self.x, alpha)
+        self.render_y = lerp(self.prev_y, self.y, alpha)
\ No newline at end of file
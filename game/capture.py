@@ -0,0 +1,111 @@
+"""
+On-demand cProfile and tracemalloc captures of a running session
+"""
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from datetime import datetime
+from .constants import *
+
+def capture_path(prefix, extension, directory="logs"):
+    """Get a timestamped output path in the logs directory"""
+    os.makedirs(directory, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(directory, f"{prefix}_{timestamp}.{extension}")
+
+class ProfileCapture:
+    """Run cProfile over a number of frames and write the stats"""
+    
+    def __init__(self):
+        self.active = False
+        self.profile = None
+        self.frames_remaining = 0
+    
+    def start(self, frames=PROFILE_CAPTURE_FRAMES):
+        """Start profiling for the given number of frames"""
+        if self.active:
+            return
+        self.frames_remaining = frames
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        self.active = True
+    
+    def end_frame(self):
+        """Count a frame and finish the capture once enough frames are profiled"""
+        if not self.active:
+            return None
+        self.frames_remaining -= 1
+        if self.frames_remaining <= 0:
+            return self.stop()
+        return None
+    
+    def stop(self):
+        """Stop profiling and write the stats, returning the report path
+        
+        Raw stats go to a .prof file for snakeviz/pstats; a .txt report
+        next to it lists the top functions by cumulative time.
+        """
+        if not self.active:
+            return None
+        self.profile.disable()
+        self.active = False
+        
+        stats_path = capture_path("profile", "prof")
+        self.profile.dump_stats(stats_path)
+        
+        report = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=report)
+        stats.sort_stats('cumulative').print_stats(PROFILE_REPORT_LINES)
+        report_path = stats_path[:-len(".prof")] + ".txt"
+        with open(report_path, 'w') as f:
+            f.write(report.getvalue())
+        
+        self.profile = None
+        return report_path
+
+class AllocationCapture:
+    """Diff tracemalloc snapshots taken at two points of a session"""
+    
+    def __init__(self):
+        self.baseline = None
+        self.started_tracing = False
+    
+    @property
+    def active(self):
+        """Whether a baseline is waiting for the second snapshot"""
+        return self.baseline is not None
+    
+    def take_snapshot(self):
+        """Snapshot traced allocations, excluding tracemalloc's own"""
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__)
+        ])
+    
+    def toggle(self):
+        """Take the baseline snapshot, or diff against it and return the report path"""
+        if self.baseline is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self.started_tracing = True
+            self.baseline = self.take_snapshot()
+            return None
+        
+        snapshot = self.take_snapshot()
+        differences = snapshot.compare_to(self.baseline, 'lineno')
+        current, peak = tracemalloc.get_traced_memory()
+        
+        report_path = capture_path("allocations", "txt")
+        with open(report_path, 'w') as f:
+            f.write(f"Traced memory: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)\n")
+            f.write(f"Top {PROFILE_REPORT_LINES} allocation changes since the first snapshot:\n\n")
+            for difference in differences[:PROFILE_REPORT_LINES]:
+                f.write(f"{difference}\n")
+        
+        self.baseline = None
+        if self.started_tracing:
+            # Tracing slows allocation noticeably, so only keep it on between presses
+            tracemalloc.stop()
+            self.started_tracing = False
+        return report_path
\ No newline at end of file
@@ -1,7 +1,13 @@
 # Game constants
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
-FPS = 60
+FPS = 60  # Render frame cap (0 = uncapped)
+
+# Simulation timing - physics constants below are expressed per tick
+TICK_RATE = 60  # Simulation ticks per second
+MAX_TICKS_PER_FRAME = 5  # Drop simulation backlog beyond this many ticks per frame
+MAX_FRAME_TIME = 0.25  # Seconds; longer frames are clamped to avoid a spiral of death
+VSYNC = False
 
 # Block size
 BLOCK_SIZE = 32
@@ -35,6 +41,21 @@ BLOCK_LEAVES = 7
 BLOCK_COAL = 8
 BLOCK_IRON = 9
 
+# Biome types
+BIOME_PLAINS = 0
+BIOME_FOREST = 1
+BIOME_DESERT = 2
+BIOME_MOUNTAINS = 3
+BIOME_COUNT = 4
+
+# Biome climate (temperature, downfall), used to look up grass and foliage colours
+BIOME_CLIMATES = {
+    BIOME_PLAINS: (0.8, 0.4),
+    BIOME_FOREST: (0.7, 0.8),
+    BIOME_DESERT: (2.0, 0.0),
+    BIOME_MOUNTAINS: (0.2, 0.3),
+}
+
 # Block colors with 8-bit style
 BLOCK_COLORS = {
     BLOCK_AIR: None,
@@ -73,6 +94,17 @@ WORLD_HEIGHT = 150
 SURFACE_LEVEL = 80
 CHUNK_SIZE = 16  # Blocks per chunk
 RENDER_DISTANCE = 8  # Chunks to render around player
+SIMULATION_DISTANCE = 2  # Chunks each side of the camera loaded immediately and simulated
+GENERATION_VERSION = 2  # Bump whenever Chunk.generate output changes for a seed
+OLDEST_GENERATION_VERSION = 1  # Older generators are kept so existing worlds extend without seams
+
+# Chunk generation stages, run in order (Chunk.stage is the last one completed)
+GEN_STAGE_NONE = 0
+GEN_STAGE_BIOMES = 1
+GEN_STAGE_TERRAIN = 2
+GEN_STAGE_ORES = 3
+GEN_STAGE_STRUCTURES = 4
+GEN_STAGE_NAMES = ["none", "biomes", "terrain", "ores", "structures"]
 
 # Hotbar settings
 HOTBAR_SIZE = 9
@@ -99,7 +131,88 @@ DEFAULT_KEYBINDS = {
     'place': 'right_click'
 }
 
+# Input recording and replay
+RECORDING_VERSION = 2  # Bump when recorded input or state hashes change meaning
+REPLAY_HASH_INTERVAL = 60  # Ticks between state hashes
+RECORDING_SAVE_NAME = "_recording"  # Scratch saves, wiped so worlds regenerate from the seed
+REPLAY_SAVE_NAME = "_replay"
+
+# Headless benchmark
+BENCHMARK_SEED = 12345
+BENCHMARK_FRAMES = 600  # Measured frames per scenario
+BENCHMARK_WARMUP_FRAMES = 30
+BENCHMARK_SAVE_NAME = "_benchmark"
+
+# Frame profiler
+PROFILER_WINDOW = 120  # Frames of history for rolling percentiles
+PROFILER_STATS_INTERVAL = 15  # Frames between percentile recalculations
+
+# Trace capture
+TRACE_CAPTURE_FRAMES = 120  # Frames recorded per capture
+
+# Profiling captures
+PROFILE_CAPTURE_FRAMES = 300  # Frames profiled by cProfile per capture
+PROFILE_REPORT_LINES = 40  # Entries listed in profile and allocation reports
+TRACEMALLOC_FRAMES = 10  # Stack depth recorded for each allocation
+
+# Metrics
+METRICS_DUMP_INTERVAL = 5.0  # Seconds between time-series samples
+METRICS_HISTOGRAM_BOUNDS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000]  # Milliseconds
+METRICS_HOST = "127.0.0.1"  # Health endpoint only listens locally
+METRICS_PUBLISH_INTERVAL = 1.0  # Seconds between health snapshots for the endpoint
+
+# Performance monitor
+PERFORMANCE_WINDOW = 120  # Frames in the recent frame-time ring buffer
+FRAME_HISTOGRAM_PRECISION = 0.01  # Relative width of frame-time histogram buckets
+HITCH_THRESHOLDS_MS = [33.3, 50, 100]  # Frame times counted as hitches
+PERFORMANCE_CRITICAL_P95_MS = 1000 / 30  # Recent p95 above this (under 30 FPS) is critical
+
+# Job scheduler (lower priority values run first)
+JOB_PRIORITY_HIGH = 0
+JOB_PRIORITY_NORMAL = 10
+JOB_PRIORITY_CHUNK_LOAD = 20  # Plus the chunk's distance from the camera
+JOB_PRIORITY_CHUNK_SAVE = 40
+SCHEDULER_FLIP_RESERVE = 0.002  # Seconds of the frame budget kept free for the display flip
+SCHEDULER_MAX_STARVED_FRAMES = 30  # Frames without progress before a job runs regardless
+SCHEDULER_COST_SMOOTHING = 0.2  # Weight of the latest run in a job name's run time estimate
+SCHEDULER_MAX_JOB_ESTIMATE = 0.008  # Seconds; run time estimates are capped here so long jobs still get scheduled
+SCHEDULER_MAX_SKIPPED_JOBS = 32  # Jobs passed over per frame looking for one that fits
+
+# Memory accounting (estimated bytes per subsystem)
+MEMORY_BUDGETS = {
+    'chunks': 2 * 1024 * 1024,
+    'item_drops': 1024 * 1024,
+    'textures': 32 * 1024 * 1024,
+    'cached_surfaces': 8 * 1024 * 1024
+}
+SOAK_CHUNKS = 2000  # Chunks walked out (and back) by the soak test
+SOAK_SEED = 4242
+SOAK_SAVE_NAME = "_soak"
+SOAK_DIG_INTERVAL = 25  # Chunks between blocks dug (modified chunks and drops)
+SOAK_DRAW_INTERVAL = 10  # Chunks between world draws
+SOAK_SAMPLE_INTERVAL = 50  # Chunks between memory samples
+SOAK_RSS_GROWTH_LIMIT = 32 * 1024 * 1024  # Retained RSS growth allowed after returning
+
+# Texture loading
+TEXTURE_PACK_PATH = "game/assets/VanillaDefault 1.21.5.zip"
+TEXTURE_CACHE_DIR = "cache/textures"
+TEXTURE_CACHE_VERSION = 4  # Bump whenever the cached texture layout or processing changes
+TEXTURE_ATLAS_WIDTH = 512  # Pixels; cached textures are packed on shelves of this width
+TEXTURE_DECODE_WORKERS = None  # Threads decoding pack textures (None = one per CPU)
+TEXTURE_MEMORY_BUDGET = MEMORY_BUDGETS['textures']  # Lazily loaded textures beyond this are evicted
+TEXTURE_EVICTION_MIN_IDLE_FRAMES = 300  # Frames a texture must go unused before it can be evicted
+TEXTURE_RELOAD_CHECK_INTERVAL = 1.0  # Seconds between checks of the packs for changes when hot reloading
+ANIMATION_TICKS_PER_SECOND = 20  # Rate of the clock .mcmeta frametimes count in, as in Minecraft
+PLAYER_SKIN_TEXTURE = "player_skin"  # Key texture listeners are told when the player skin changes
+COLORMAP_DEFAULT_COLORS = {'grass': (145, 189, 89), 'foliage': (119, 171, 47)}  # Used if a pack has no colormap
+
+# Logging
+LOG_RATE_LIMIT_WINDOW = 10.0  # Seconds over which repeated messages are counted
+LOG_RATE_LIMIT_BURST = 3  # Repeats of the same message logged per window before suppressing
+LOG_RATE_LIMIT_MAX_KEYS = 1024  # Distinct messages tracked at once; the oldest window closes early past this
+
 # Game states
 STATE_MENU = 0
 STATE_PLAYING = 1
-STATE_SETTINGS = 2
\ No newline at end of file
+STATE_SETTINGS = 2
+STATE_LOADING = 3  # Streaming in the spawn chunks before play starts
\ No newline at end of file
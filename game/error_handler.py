@@ -1,16 +1,120 @@
 """
 Error handling and logging utilities
 """
-import traceback
+import copy
 import logging
+import logging.handlers
+import atexit
+import json
+import math
 import os
+import queue
+import time
 from datetime import datetime
+from .constants import *
+from .utils import percentile
+
+# Background logging pipeline shared by every GameErrorHandler in the process
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+
+class UnformattedQueueHandler(logging.handlers.QueueHandler):
+    """Queue log records without formatting them, so tracebacks are rendered on the listener thread"""
+    
+    def prepare(self, record):
+        # QueueHandler.prepare formats the record on the calling thread;
+        # the listener's formatter renders the message and exc_info instead
+        return copy.copy(record)
+
+def start_log_listener(log_file):
+    """Write queued log records to the log file and console on a background thread"""
+    global _log_listener
+    if _log_listener:
+        return
+    
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(f"logs/{log_file}"), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    _log_listener = logging.handlers.QueueListener(_log_queue, *handlers)
+    _log_listener.start()
+
+def stop_log_listener():
+    """Flush queued records and stop the background logging thread"""
+    global _log_listener
+    if _log_listener:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+atexit.register(stop_log_listener)
+
+class LogRateLimiter:
+    """Let the first few repeats of a message through per window and count the rest"""
+    
+    def __init__(self, window=LOG_RATE_LIMIT_WINDOW, burst=LOG_RATE_LIMIT_BURST,
+                 max_keys=LOG_RATE_LIMIT_MAX_KEYS):
+        self.window = window
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> [window start, count in window, suppressed], oldest window first
+        self.entries = {}
+    
+    def allow(self, key):
+        """Check whether a message should be logged
+        
+        Returns (allowed, summaries) where summaries lists (key, suppressed)
+        for every window that has closed with repeats dropped, including
+        the oldest one when it is closed early to make room for a new key.
+        """
+        now = time.monotonic()
+        summaries = self.drain_expired(now)
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.entries) >= self.max_keys:
+                oldest = next(iter(self.entries))
+                suppressed = self.entries.pop(oldest)[2]
+                if suppressed:
+                    summaries.append((oldest, suppressed))
+            self.entries[key] = [now, 1, 0]
+            return True, summaries
+        
+        entry[1] += 1
+        if entry[1] > self.burst:
+            entry[2] += 1
+            return False, summaries
+        return True, summaries
+    
+    def drain_expired(self, now=None):
+        """Get the suppressed counts of windows that have closed and forget their keys"""
+        if now is None:
+            now = time.monotonic()
+        summaries = []
+        # A key's window starts when it is added, so expired entries are at the front
+        while self.entries:
+            key = next(iter(self.entries))
+            entry = self.entries[key]
+            if now - entry[0] < self.window:
+                break
+            del self.entries[key]
+            if entry[2]:
+                summaries.append((key, entry[2]))
+        return summaries
+    
+    def drain(self):
+        """Get and reset the suppressed counts of every key"""
+        summaries = [(key, entry[2]) for key, entry in self.entries.items() if entry[2]]
+        self.entries.clear()
+        return summaries
 
 class GameErrorHandler:
     """Centralized error handling for the game"""
     
     def __init__(self, log_file="game_errors.log"):
         self.log_file = log_file
+        self.rate_limiter = LogRateLimiter()
         self.setup_logging()
     
     def setup_logging(self):
@@ -18,26 +122,56 @@ class GameErrorHandler:
         # Create logs directory if it doesn't exist
         os.makedirs("logs", exist_ok=True)
         
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f"logs/{self.log_file}"),
-                logging.StreamHandler()
-            ]
+        # Records are only queued on the calling thread; formatting,
+        # including tracebacks, and file and console writes happen on the
+        # listener thread
+        start_log_listener(self.log_file)
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            self.logger.addHandler(UnformattedQueueHandler(_log_queue))
+    
+    def log_summary(self, key, suppressed):
+        """Log how many repeats of a message were suppressed"""
+        context, kind, message = key
+        self.logger.warning(
+            f"Suppressed {suppressed} repeats of {kind} in {context} "
+            f"over {self.rate_limiter.window:g}s: {message}"
         )
         
-        self.logger = logging.getLogger(__name__)
+    def should_log(self, key):
+        """Rate limit a message, reporting suppressed repeats of closed windows"""
+        allowed, summaries = self.rate_limiter.allow(key)
+        for summary_key, suppressed in summaries:
+            self.log_summary(summary_key, suppressed)
+        return allowed
+    
+    def report_suppressed(self):
+        """Report suppressed repeats of windows that closed without another message"""
+        for key, suppressed in self.rate_limiter.drain_expired():
+            self.log_summary(key, suppressed)
     
     def log_error(self, error, context="Unknown"):
         """Log an error with context"""
+        # Tracebacks are only formatted for errors that are actually logged
+        if not self.should_log((context, type(error).__name__, str(error))):
+            return
+        self.write_error(error, context)
+    
+    def write_error(self, error, context):
+        """Log an error and its traceback without rate limiting"""
         error_msg = f"Error in {context}: {str(error)}"
-        self.logger.error(error_msg)
-        self.logger.error(traceback.format_exc())
+        self.logger.error(error_msg, exc_info=error)
     
-    def log_warning(self, message, context="Unknown"):
-        """Log a warning"""
+    def log_warning(self, message, context="Unknown", key=None):
+        """Log a warning
+        
+        Repeats are rate limited by message, or by key when the message
+        varies (e.g. includes a measurement).
+        """
+        if not self.should_log((context, 'warning', key or message)):
+            return
         warning_msg = f"Warning in {context}: {message}"
         self.logger.warning(warning_msg)
     
@@ -48,7 +182,8 @@ class GameErrorHandler:
     
     def handle_critical_error(self, error, context="Unknown"):
         """Handle critical errors that might crash the game"""
-        self.log_error(error, context)
+        # Never rate limited, even if the same error was logged just before
+        self.write_error(error, context)
         
         # Try to save game state before crashing
         try:
@@ -59,6 +194,12 @@ class GameErrorHandler:
         # Show error dialog to user
         self.show_error_dialog(error, context)
     
+    def shutdown(self):
+        """Report outstanding suppressed repeats and flush the log pipeline"""
+        for key, suppressed in self.rate_limiter.drain():
+            self.log_summary(key, suppressed)
+        stop_log_listener()
+    
     def emergency_save(self):
         """Emergency save function (to be implemented by game)"""
         # This should be overridden by the game to save current state
@@ -111,47 +252,143 @@ def safe_file_operation(operation, file_path, error_handler=None, context="File
             print(f"File operation error in {context}: {e}")
         return None
 
+class FrameTimeHistogram:
+    """Log-bucketed frame-time histogram (HDR-style)
+    
+    Bucket widths grow with the value, so every recorded frame time is kept
+    to within `precision` relative error in constant memory, for a session
+    of any length.
+    """
+    
+    def __init__(self, precision=FRAME_HISTOGRAM_PRECISION):
+        self.log_base = math.log1p(precision)
+        self.buckets = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, value):
+        """Record a frame time in milliseconds"""
+        bucket = math.floor(math.log(max(value, 0.001)) / self.log_base)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def get_percentile(self, pct):
+        """Get the pct-th percentile, reported as the upper edge of its bucket"""
+        if not self.count:
+            return 0
+        target = pct / 100.0 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.max, math.exp((bucket + 1) * self.log_base))
+        return self.max
+    
+    def get_mean(self):
+        """Get the mean frame time"""
+        return self.total / self.count if self.count else 0
+
 class PerformanceMonitor:
     """Monitor game performance and detect issues"""
     
-    def __init__(self, error_handler=None):
+    def __init__(self, error_handler=None, window=PERFORMANCE_WINDOW,
+                 hitch_thresholds=HITCH_THRESHOLDS_MS):
         self.error_handler = error_handler
-        self.frame_times = []
-        self.max_samples = 100
         self.warning_threshold = 50  # ms
         self.critical_threshold = 100  # ms
     
+        # Recent frame times in a fixed ring buffer
+        self.frame_times = [0.0] * window
+        self.frame_index = 0
+        self.sample_count = 0
+        
+        # Whole-session distribution and hitch counts
+        self.histogram = FrameTimeHistogram()
+        self.hitch_thresholds = sorted(hitch_thresholds)
+        self.hitch_counts = [0] * len(self.hitch_thresholds)
+        self.session_start = time.time()
+    
     def record_frame_time(self, frame_time):
         """Record a frame time"""
-        self.frame_times.append(frame_time)
-        if len(self.frame_times) > self.max_samples:
-            self.frame_times.pop(0)
+        self.frame_times[self.frame_index] = frame_time
+        self.frame_index = (self.frame_index + 1) % len(self.frame_times)
+        self.sample_count = min(self.sample_count + 1, len(self.frame_times))
+        
+        self.histogram.record(frame_time)
+        for i, threshold in enumerate(self.hitch_thresholds):
+            if frame_time <= threshold:
+                break
+            self.hitch_counts[i] += 1
         
         # Check for performance issues
         if frame_time > self.critical_threshold:
             if self.error_handler:
                 self.error_handler.log_warning(
-                    f"Critical frame time: {frame_time}ms", 
-                    "Performance Monitor"
+                    f"Critical frame time: {frame_time:.1f}ms", 
+                    "Performance Monitor", key="Critical frame time"
                 )
         elif frame_time > self.warning_threshold:
             if self.error_handler:
                 self.error_handler.log_warning(
-                    f"High frame time: {frame_time}ms", 
-                    "Performance Monitor"
+                    f"High frame time: {frame_time:.1f}ms", 
+                    "Performance Monitor", key="High frame time"
                 )
     
+    def get_recent_frame_times(self):
+        """Get the frame times currently in the ring buffer"""
+        if self.sample_count < len(self.frame_times):
+            return self.frame_times[:self.sample_count]
+        return self.frame_times
+    
+    def get_recent_percentile(self, pct):
+        """Get a percentile of the recent frame times"""
+        return percentile(self.get_recent_frame_times(), pct)
+    
     def get_average_frame_time(self):
         """Get average frame time"""
-        if not self.frame_times:
+        if not self.sample_count:
             return 0
-        return sum(self.frame_times) / len(self.frame_times)
+        return sum(self.get_recent_frame_times()) / self.sample_count
     
     def get_fps(self):
         """Get current FPS"""
         avg_frame_time = self.get_average_frame_time()
         return 1000.0 / avg_frame_time if avg_frame_time > 0 else 0
     
+    def get_hitch_counts(self):
+        """Get the number of session frames above each hitch threshold"""
+        return dict(zip(self.hitch_thresholds, self.hitch_counts))
+    
     def is_performance_critical(self):
         """Check if performance is critically low"""
-        return self.get_fps() < 30  # Below 30 FPS is considered critical
\ No newline at end of file
+        # Tail latency, so regular stutter counts even when the average is fine
+        return self.get_recent_percentile(95) > PERFORMANCE_CRITICAL_P95_MS
+    
+    def get_session_summary(self):
+        """Get frame-time statistics for the whole session"""
+        histogram = self.histogram
+        return {
+            'frames': histogram.count,
+            'duration': round(time.time() - self.session_start, 3),
+            'mean_ms': round(histogram.get_mean(), 3),
+            'p50_ms': round(histogram.get_percentile(50), 3),
+            'p95_ms': round(histogram.get_percentile(95), 3),
+            'p99_ms': round(histogram.get_percentile(99), 3),
+            'max_ms': round(histogram.max, 3),
+            'hitches': {f"{threshold:g}ms": count
+                        for threshold, count in self.get_hitch_counts().items()}
+        }
+    
+    def write_session_summary(self, directory="logs"):
+        """Write the session summary to a timestamped file and return its path"""
+        if not self.histogram.count:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump(self.get_session_summary(), f, indent=2)
+        return path
\ No newline at end of file
@@ -2,30 +2,56 @@ import pygame
 import sys
 import json
 import os
+import time
 from .constants import *
 from .world import World
 from .player import Player
 from .camera import Camera
 from .renderer import Renderer
 from .inventory import InventoryGUI
-from .menu import MainMenu, SettingsMenu
+from .menu import MainMenu, SettingsMenu, LoadingScreen
 from .texture_manager import TextureManager
 from .error_handler import GameErrorHandler, PerformanceMonitor, safe_execute
+from .replay import TickInput, InputRecorder, clear_save
+from .profiler import FrameProfiler
+from .tracing import tracer
+from .capture import ProfileCapture, AllocationCapture
+from .metrics import metrics
+from .metrics_server import MetricsServer
+from .memory import get_memory_report
+from .scheduler import JobScheduler
 from .utils import Timer
 
 class Game:
-    def __init__(self):
+    def __init__(self, tick_rate=TICK_RATE, max_fps=FPS, vsync=VSYNC, record_path=None,
+                 trace_frames=0, metrics_port=None):
+        # Startup time is measured from here to the first menu frame
+        self.startup_time = time.perf_counter()
         pygame.init()
         
+        # Simulation runs at a fixed tick rate; rendering is capped separately
+        if tick_rate <= 0:
+            raise ValueError(f"tick_rate must be positive, got {tick_rate}")
+        self.tick_rate = tick_rate
+        self.tick_interval = 1.0 / tick_rate
+        self.tick_accumulator = 0.0
+        self.max_fps = max_fps
+        self.vsync = vsync
+        
         # Initialize error handling
         self.error_handler = GameErrorHandler()
         self.performance_monitor = PerformanceMonitor(self.error_handler)
+        self.profiler = FrameProfiler()
+        self.scheduler = JobScheduler()
+        self.profile_capture = ProfileCapture()
+        self.allocation_capture = AllocationCapture()
+        self.show_debug_overlay = False
         
         # Override emergency save
         self.error_handler.emergency_save = self.emergency_save
         
         try:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.screen = self.create_display()
             pygame.display.set_caption("2D Minecraft Survival")
             self.clock = pygame.time.Clock()
             
@@ -39,12 +65,19 @@ class Game:
             # Load settings
             self.keybinds = self.load_settings()
             
-            # Initialize texture manager
-            self.texture_manager = TextureManager()
+            # Textures load in the background so the menu shows right away,
+            # and each block texture is only decoded once it is first drawn;
+            # placeholders are drawn until they are ready. Changed packs are
+            # reloaded while the game runs
+            self.texture_manager = TextureManager(background=True, lazy=True, hot_reload=True)
+            self.textures_ready_logged = False
+            self.first_frame_logged = False
             
             # Menu system
             self.main_menu = MainMenu(self.screen)
             self.settings_menu = SettingsMenu(self.screen, self.keybinds)
+            self.loading_screen = LoadingScreen(self.screen)
+            self.loading_start = 0
             
             # Game objects (initialized when starting game)
             self.world = None
@@ -59,12 +92,37 @@ class Game:
             # Mouse state tracking
             self.mouse_held = False
             
+            # Input events waiting to be applied by the next simulation tick
+            self.pending_actions = []
+            
+            # Input recording (started when a world is entered)
+            self.record_path = record_path
+            self.recorder = None
+            
+            # Frames to trace from world entry (0 = only on F9)
+            self.trace_frames = trace_frames
+            
+            # Local health endpoint for scraping long sessions
+            self.metrics_server = None
+            self.last_health_publish = 0
+            if metrics_port is not None:
+                self.start_metrics_server(metrics_port)
+            
             self.error_handler.log_info("Game initialized successfully", "Game.__init__")
             
         except Exception as e:
             self.error_handler.handle_critical_error(e, "Game.__init__")
             raise
     
+    def create_display(self):
+        """Create the game window, with vsync if requested and supported"""
+        if self.vsync:
+            try:
+                return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                self.error_handler.log_warning(f"Vsync unavailable, falling back: {e}", "create_display")
+        return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    
     def load_settings(self):
         """Load settings from file"""
         def _load():
@@ -90,28 +148,99 @@ class Game:
         
         safe_execute(_save, self.error_handler, "save_settings")
     
-    def init_game_world(self):
-        """Initialize the game world and objects"""
+    def init_game_world(self, seed=None, save_name="default"):
+        """Initialize the game world and objects, loading everything before returning"""
         try:
-            self.error_handler.log_info("Generating world...", "init_game_world")
-            self.world = World()
-            self.error_handler.log_info("World generated!", "init_game_world")
-            
-            # Find proper spawn position
-            spawn_x, spawn_y = self.world.find_spawn_position()
-            self.error_handler.log_info(f"Spawn position: {spawn_x}, {spawn_y}", "init_game_world")
-            
-            self.player = Player(spawn_x, spawn_y, self.keybinds, self.texture_manager)
-            self.camera = Camera()
-            self.renderer = Renderer(self.screen, self.texture_manager)
-            self.inventory_gui = InventoryGUI(self.screen, self.texture_manager)
-            
-            self.error_handler.log_info("Game world initialized!", "init_game_world")
-            
+            self.texture_manager.finish_loading()
+            self.create_world(seed, save_name)
+            self.create_game_objects()
         except Exception as e:
             self.error_handler.handle_critical_error(e, "init_game_world")
             raise
     
+    def start_loading_world(self, seed=None, save_name="default"):
+        """Create the world and show the loading screen while its spawn chunks stream in"""
+        try:
+            self.loading_start = time.perf_counter()
+            self.create_world(seed, save_name)
+            # Queue the chunks around spawn; the scheduler loads them each frame
+            self.world.ensure_chunks_loaded(self.spawn_position[0])
+            self.state = STATE_LOADING
+        except Exception as e:
+            self.error_handler.handle_critical_error(e, "start_loading_world")
+            raise
+    
+    def create_world(self, seed, save_name):
+        """Create or load the world and find the spawn position"""
+        # Trace world creation when a capture was requested on the command line
+        if self.trace_frames:
+            tracer.start(self.trace_frames)
+            self.trace_frames = 0
+        
+        self.error_handler.log_info("Generating world...", "init_game_world")
+        self.scheduler.clear()
+        self.world = World(seed, save_name, self.scheduler)
+        self.error_handler.log_info("World generated!", "init_game_world")
+        
+        # Find proper spawn position
+        self.spawn_position = self.world.find_spawn_position()
+        self.error_handler.log_info(f"Spawn position: {self.spawn_position[0]}, {self.spawn_position[1]}",
+                                    "init_game_world")
+    
+    def create_game_objects(self):
+        """Create the player, camera and interface for the current world"""
+        spawn_x, spawn_y = self.spawn_position
+        if self.player:
+            self.texture_manager.remove_listener(self.player.on_texture_changed)
+        self.player = Player(spawn_x, spawn_y, self.keybinds, self.texture_manager)
+        self.camera = Camera()
+        self.renderer = Renderer(self.screen, self.texture_manager)
+        self.inventory_gui = InventoryGUI(self.screen, self.texture_manager)
+        
+        # Start simulating from a clean tick boundary
+        self.tick_accumulator = 0.0
+        self.pending_actions = []
+        self.mouse_held = False
+        
+        self.error_handler.log_info("Game world initialized!", "init_game_world")
+    
+    def update_loading(self):
+        """Enter the world once textures are loaded and every chunk in render distance is in"""
+        try:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+            
+            loaded, wanted = self.world.get_streaming_progress()
+            if self.texture_manager.loaded and loaded == wanted:
+                self.create_game_objects()
+                self.state = STATE_PLAYING
+                self.error_handler.log_info(
+                    f"World interactive after {(time.perf_counter() - self.loading_start) * 1000:.0f} ms "
+                    f"({wanted} chunks streamed)", "time_to_interactive")
+        except Exception as e:
+            self.error_handler.log_error(e, "update_loading")
+    
+    def draw_loading(self):
+        """Draw loading state"""
+        try:
+            loaded, wanted = self.world.get_streaming_progress()
+            detail = f"Chunks {loaded}/{wanted}"
+            if not self.texture_manager.loaded:
+                detail += ", loading textures"
+            self.loading_screen.draw("Loading world...", loaded / wanted, detail)
+        except Exception as e:
+            self.error_handler.log_error(e, "draw_loading")
+    
+    def update_startup(self):
+        """Swap in background-loaded textures and log startup times"""
+        textures_ready = self.texture_manager.update()
+        if textures_ready and not self.textures_ready_logged:
+            self.textures_ready_logged = True
+            self.error_handler.log_info(
+                f"Textures ready after {(time.perf_counter() - self.startup_time) * 1000:.0f} ms",
+                "time_to_interactive")
+    
     def handle_menu_events(self):
         """Handle events in menu state"""
         try:
@@ -121,8 +250,11 @@ class Game:
                 
                 action = self.main_menu.handle_event(event)
                 if action == 'play':
-                    self.init_game_world()
-                    self.state = STATE_PLAYING
+                    if self.record_path:
+                        self.start_recording()
+                        self.state = STATE_PLAYING
+                    else:
+                        self.start_loading_world()
                 elif action == 'settings':
                     self.state = STATE_SETTINGS
                 elif action == 'quit':
@@ -146,7 +278,11 @@ class Game:
             self.error_handler.log_error(e, "handle_settings_events")
     
     def handle_game_events(self):
-        """Handle events in game state"""
+        """Handle events in game state
+        
+        Gameplay input is queued as actions for the next simulation tick so
+        that ticks see the same input whether played live or replayed.
+        """
         try:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -155,44 +291,108 @@ class Game:
                 elif event.type == pygame.KEYDOWN:
                     # Hotbar selection
                     if pygame.K_1 <= event.key <= pygame.K_9:
-                        slot = event.key - pygame.K_1
-                        self.player.select_hotbar_slot(slot)
+                        self.pending_actions.append(('hotbar', event.key - pygame.K_1))
                     
                     # Toggle inventory
                     elif event.key == self.get_key_from_keybind('inventory'):
-                        self.inventory_gui.toggle()
+                        self.pending_actions.append(('toggle_inventory',))
+                    
+                    # Toggle debug overlay (not part of the simulation)
+                    elif event.key == pygame.K_F3:
+                        self.show_debug_overlay = not self.show_debug_overlay
+                    
+                    # Profile the next frames with cProfile
+                    elif event.key == pygame.K_F5:
+                        if not self.profile_capture.active:
+                            self.profile_capture.start()
+                            self.error_handler.log_info(
+                                f"Profiling the next {self.profile_capture.frames_remaining} frames", "profile")
+                    
+                    # Allocation diff between two presses
+                    elif event.key == pygame.K_F6:
+                        report_path = self.allocation_capture.toggle()
+                        if report_path:
+                            self.error_handler.log_info(f"Allocation diff written to {report_path}", "tracemalloc")
+                        else:
+                            self.error_handler.log_info("Allocation baseline taken, press F6 again to diff", "tracemalloc")
+                    
+                    # Capture a trace of the next frames
+                    elif event.key == pygame.K_F9:
+                        tracer.start()
+                        self.error_handler.log_info(f"Capturing trace to {tracer.output_path}", "trace")
                     
                     # Return to menu
                     elif event.key == pygame.K_ESCAPE:
                         if self.inventory_gui.is_open:
-                            self.inventory_gui.toggle()
+                            self.pending_actions.append(('toggle_inventory',))
                         else:
-                            # Save world before returning to menu
-                            if self.world:
-                                self.world.cleanup()
-                            self.state = STATE_MENU
+                            self.leave_game_world()
                 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Check if clicking in inventory first
-                    if self.inventory_gui.handle_click(event.pos[0], event.pos[1], self.player):
-                        continue
-                    
-                    # Only handle world interactions if inventory is closed
-                    if not self.inventory_gui.is_open:
-                        if event.button == 1 and self.keybinds['mine'] == 'left_click':  # Left click - mine
-                            self.mouse_held = True
-                        elif event.button == 3 and self.keybinds['place'] == 'right_click':  # Right click - place
-                            mouse_x, mouse_y = pygame.mouse.get_pos()
-                            self.player.place_block(self.world, mouse_x, mouse_y,
-                                                  self.camera.x, self.camera.y)
+                    self.pending_actions.append(('mouse_down', event.button, event.pos[0], event.pos[1]))
                 
                 elif event.type == pygame.MOUSEBUTTONUP:
-                    if event.button == 1:  # Left click released
-                        self.mouse_held = False
-                        self.player.stop_mining()
+                    self.pending_actions.append(('mouse_up', event.button))
         except Exception as e:
             self.error_handler.log_error(e, "handle_game_events")
     
+    def apply_action(self, action):
+        """Apply a queued input action to the simulation"""
+        kind = action[0]
+        
+        if kind == 'hotbar':
+            self.player.select_hotbar_slot(action[1])
+        
+        elif kind == 'toggle_inventory':
+            self.inventory_gui.toggle()
+        
+        elif kind == 'mouse_down':
+            button, mouse_x, mouse_y = action[1], action[2], action[3]
+            
+            # Check if clicking in inventory first
+            if self.inventory_gui.handle_click(mouse_x, mouse_y, self.player, button):
+                return
+            
+            # Only handle world interactions if inventory is closed
+            if not self.inventory_gui.is_open:
+                if button == 1 and self.keybinds['mine'] == 'left_click':  # Left click - mine
+                    self.mouse_held = True
+                elif button == 3 and self.keybinds['place'] == 'right_click':  # Right click - place
+                    self.player.place_block(self.world, mouse_x, mouse_y,
+                                          self.camera.x, self.camera.y)
+        
+        elif kind == 'mouse_up':
+            if action[1] == 1:  # Left click released
+                self.mouse_held = False
+                self.player.stop_mining()
+    
+    def leave_game_world(self):
+        """Save the world and return to the main menu"""
+        self.stop_recording()
+        
+        # Save world before returning to menu
+        if self.world:
+            self.world.cleanup()
+        self.scheduler.clear()
+        self.state = STATE_MENU
+    
+    def start_recording(self):
+        """Start a fresh world and record every tick of input"""
+        clear_save(RECORDING_SAVE_NAME)
+        self.init_game_world(save_name=RECORDING_SAVE_NAME)
+        self.recorder = InputRecorder(self.record_path)
+        self.recorder.start(self)
+        self.error_handler.log_info(f"Recording input to {self.record_path}", "start_recording")
+    
+    def stop_recording(self):
+        """Write the current recording to disk"""
+        if self.recorder:
+            self.recorder.save()
+            self.error_handler.log_info(
+                f"Saved {len(self.recorder.ticks)} recorded ticks to {self.record_path}", "stop_recording"
+            )
+            self.recorder = None
+    
     def get_key_from_keybind(self, keybind_name):
         """Convert keybind string to pygame key constant"""
         key_name = self.keybinds.get(keybind_name, '')
@@ -202,24 +402,66 @@ class Game:
             return getattr(pygame, f'K_{key_name}', pygame.K_UNKNOWN)
         return pygame.K_UNKNOWN
     
-    def update_game(self):
-        """Update game state"""
+    def step_simulation(self, elapsed):
+        """Advance the simulation in fixed ticks and return the render interpolation factor"""
+        self.tick_accumulator += elapsed
+        
+        ticks = 0
+        while self.tick_accumulator >= self.tick_interval and ticks < MAX_TICKS_PER_FRAME:
+            self.update_game()
+            self.tick_accumulator -= self.tick_interval
+            ticks += 1
+        
+        # Drop the backlog if the simulation can't keep up instead of spiralling
+        if self.tick_accumulator >= self.tick_interval:
+            self.tick_accumulator %= self.tick_interval
+        
+        self.profiler.set_count('ticks', ticks)
+        
+        return self.tick_accumulator / self.tick_interval
+    
+    def update_game(self, tick_input=None):
+        """Advance the game simulation by one fixed tick
+        
+        tick_input supplies recorded input; live input is sampled when omitted.
+        """
         try:
-            # Only update player movement if inventory is closed
-            if not self.inventory_gui.is_open:
-                keys = pygame.key.get_pressed()
-                self.player.handle_input(keys)
+            if tick_input is None:
+                tick_input = TickInput.sample(self.pending_actions)
+                self.pending_actions = []
+            
+            if self.recorder:
+                self.recorder.record(tick_input)
+            
+            profiler = self.profiler
+            with profiler.zone('player update'):
+                for action in tick_input.actions:
+                    self.apply_action(action)
+            
+                # Only update player movement if inventory is closed
+                if not self.inventory_gui.is_open:
+                    self.player.handle_input(tick_input.keys)
                 
-                # Handle continuous mining while mouse is held
-                if self.mouse_held:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    self.player.mine_block(self.world, mouse_x, mouse_y,
-                                         self.camera.x, self.camera.y)
+                    # Handle continuous mining while mouse is held
+                    if self.mouse_held:
+                        mouse_x, mouse_y = tick_input.mouse_pos
+                        self.player.mine_block(self.world, mouse_x, mouse_y,
+                                             self.camera.x, self.camera.y)
             
-            self.player.update(self.world)
-            self.player.pickup_items(self.world)
-            self.camera.update(self.player)
-            self.world.update_item_drops()
+                self.player.update(self.world)
+                self.player.pickup_items(self.world)
+                self.camera.update(self.player)
+            
+            # Stream chunks around the camera as part of the simulation so
+            # headless replays see the same terrain as rendered sessions
+            with profiler.zone('chunk streaming'):
+                self.world.ensure_chunks_loaded(self.camera.x + SCREEN_WIDTH // 2)
+            
+            with profiler.zone('item drops'):
+                self.world.update_item_drops()
+            
+            if self.recorder:
+                self.recorder.after_tick(self)
         except Exception as e:
             self.error_handler.log_error(e, "update_game")
     
@@ -237,28 +479,42 @@ class Game:
         except Exception as e:
             self.error_handler.log_error(e, "draw_settings")
     
-    def draw_game(self):
-        """Draw game state"""
+    def draw_game(self, alpha=1.0):
+        """Draw game state, interpolating moving objects between simulation ticks"""
         try:
             self.screen.fill((135, 206, 235))  # Sky blue background
             
-            # Draw world and player
-            self.renderer.draw_world(self.world, self.camera)
-            self.player.draw(self.screen, self.camera.x, self.camera.y)
+            # Position the camera between the last two ticks
+            self.camera.interpolate(alpha)
             
-            # Draw block selection highlight
-            if not self.inventory_gui.is_open:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                self.renderer.draw_block_selection(self.player, self.world, self.camera, mouse_x, mouse_y)
+            profiler = self.profiler
+            with profiler.zone('world draw'):
+                # Draw world and player
+                self.renderer.draw_world(self.world, self.camera, alpha)
+                self.player.draw(self.screen, self.camera.render_x, self.camera.render_y, alpha)
+            
+                # Draw block selection highlight
+                if not self.inventory_gui.is_open:
+                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    self.renderer.draw_block_selection(self.player, self.world, self.camera, mouse_x, mouse_y)
             
-            # Draw block breaking animation
-            self.renderer.draw_block_breaking_animation(self.player, self.camera)
+                # Draw block breaking animation
+                self.renderer.draw_block_breaking_animation(self.player, self.camera)
             
             # Draw UI
-            self.renderer.draw_ui(self.player)
+            with profiler.zone('ui'):
+                self.renderer.draw_ui(self.player)
             
             # Draw inventory GUI on top
-            self.inventory_gui.draw(self.player)
+            with profiler.zone('inventory'):
+                self.inventory_gui.draw(self.player)
+            
+            # Frame statistics for the debug overlay
+            profiler.set_count('chunks', len(self.world.chunks))
+            profiler.set_count('drops', len(self.world.item_drops))
+            profiler.set_count('blits', self.renderer.blit_count)
+            if self.show_debug_overlay:
+                self.renderer.draw_debug_overlay(profiler, self.performance_monitor)
         except Exception as e:
             self.error_handler.log_error(e, "draw_game")
     
@@ -272,11 +528,64 @@ class Game:
         except Exception as e:
             self.error_handler.log_error(e, "emergency_save")
     
+    def start_metrics_server(self, port):
+        """Start the local health endpoint; the game runs on without it if binding fails"""
+        try:
+            self.metrics_server = MetricsServer(port)
+            self.metrics_server.start()
+            self.error_handler.log_info(
+                f"Metrics endpoint on http://{self.metrics_server.host}:{self.metrics_server.port}/metrics",
+                "metrics")
+        except OSError as e:
+            self.metrics_server = None
+            self.error_handler.log_error(e, "start_metrics_server")
+    
+    def publish_health(self):
+        """Publish a health snapshot to the metrics endpoint once per interval"""
+        now = time.perf_counter()
+        if not self.metrics_server or now - self.last_health_publish < METRICS_PUBLISH_INTERVAL:
+            return
+        self.last_health_publish = now
+        
+        monitor = self.performance_monitor
+        health = {
+            'minecraft_frame_time_ms': {
+                '0.5': round(monitor.get_recent_percentile(50), 3),
+                '0.95': round(monitor.get_recent_percentile(95), 3),
+                '0.99': round(monitor.get_recent_percentile(99), 3)
+            },
+            'minecraft_frame_time_ms_sum': round(monitor.histogram.total, 3),
+            'minecraft_frame_time_ms_count': monitor.histogram.count,
+            'minecraft_fps': round(monitor.get_fps(), 1),
+            'minecraft_job_queue_depth': self.scheduler.pending,
+            'minecraft_job_starved_frames_total': self.scheduler.starved_frames,
+            'minecraft_job_max_wait_frames': self.scheduler.max_wait_frames,
+            'minecraft_frame_hitches_total': {
+                f"{threshold:g}": count for threshold, count in monitor.get_hitch_counts().items()
+            }
+        }
+        if self.state == STATE_PLAYING and self.world:
+            health['minecraft_loaded_chunks'] = len(self.world.get_loaded_chunks())
+            health['minecraft_item_drops'] = len(self.world.item_drops)
+            health['minecraft_chunks_pending_save'] = self.world.get_pending_save_count()
+            health['minecraft_save_queue_depth'] = len(self.world.pending_saves)
+            health['minecraft_memory_estimate_bytes'] = {
+                name: usage['bytes']
+                for name, usage in get_memory_report(self.world, self.texture_manager).items()
+            }
+        
+        self.metrics_server.publish(health, metrics.snapshot() if metrics.enabled else None)
+    
     def run(self):
         """Main game loop"""
         try:
+            previous_time = time.perf_counter()
             while self.running:
-                frame_start = pygame.time.get_ticks()
+                frame_start = time.perf_counter()
+                elapsed = min(frame_start - previous_time, MAX_FRAME_TIME)
+                previous_time = frame_start
+                self.profiler.begin_frame()
+                self.update_startup()
                 
                 if self.state == STATE_MENU:
                     self.handle_menu_events()
@@ -284,25 +593,67 @@ class Game:
                 elif self.state == STATE_SETTINGS:
                     self.handle_settings_events()
                     self.draw_settings()
+                elif self.state == STATE_LOADING:
+                    self.update_loading()
+                    self.draw_loading()
                 elif self.state == STATE_PLAYING:
-                    self.handle_game_events()
-                    self.update_game()
-                    self.draw_game()
+                    with self.profiler.zone('events'):
+                        self.handle_game_events()
+                    alpha = self.step_simulation(elapsed)
+                    self.draw_game(alpha)
+                
+                # Deferred work fills whatever is left of this frame's budget
+                frame_budget = 1.0 / (self.max_fps or FPS)
+                with self.profiler.zone('jobs'):
+                    self.scheduler.run_frame(frame_start + frame_budget - SCHEDULER_FLIP_RESERVE)
+                self.profiler.set_count('jobs', self.scheduler.pending)
                 
-                pygame.display.flip()
-                self.clock.tick(FPS)
+                with self.profiler.zone('display flip'):
+                    pygame.display.flip()
+                self.profiler.end_frame()
+                
+                if not self.first_frame_logged:
+                    self.first_frame_logged = True
+                    self.error_handler.log_info(
+                        f"First frame after {(time.perf_counter() - self.startup_time) * 1000:.0f} ms",
+                        "time_to_interactive")
+                
+                trace_path = tracer.end_frame()
+                if trace_path:
+                    self.error_handler.log_info(f"Trace written to {trace_path}", "trace")
+                
+                profile_path = self.profile_capture.end_frame()
+                if profile_path:
+                    self.error_handler.log_info(f"Profile written to {profile_path}", "profile")
+                
+                metrics.maybe_dump()
+                self.publish_health()
+                self.error_handler.report_suppressed()
+                self.clock.tick(self.max_fps)
                 
                 # Performance monitoring
-                frame_time = pygame.time.get_ticks() - frame_start
+                frame_time = (time.perf_counter() - frame_start) * 1000
                 self.performance_monitor.record_frame_time(frame_time)
             
             # Save world and settings before quitting
+            self.stop_recording()
+            tracer.stop()
+            self.profile_capture.stop()
+            if self.metrics_server:
+                self.metrics_server.stop()
             if self.world:
                 self.world.cleanup()
             self.save_settings()
             
+            # Sampled last so the final chunk saves are counted
+            metrics.dump()
+            summary_path = self.performance_monitor.write_session_summary()
+            if summary_path:
+                self.error_handler.log_info(f"Performance summary written to {summary_path}", "run")
+            
         except Exception as e:
             self.error_handler.handle_critical_error(e, "main_game_loop")
         finally:
+            self.error_handler.shutdown()
             pygame.quit()
             sys.exit()
\ No newline at end of file
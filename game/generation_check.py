@@ -0,0 +1,96 @@
+"""
+Golden block/biome hashes guarding deterministic terrain generation
+"""
+import hashlib
+import json
+import os
+from .constants import *
+from .world import Chunk
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "generation_golden.json")
+
+# Seeds and chunk indexes covered by the golden data, including negative
+# chunks and chunks far from spawn
+GOLDEN_SEEDS = [0, 1, 42, 4242, 12345, 987654]
+GOLDEN_CHUNKS = [-1000, -64, -17, -2, -1, 0, 1, 2, 17, 64, 1000]
+
+def hash_chunk(chunk):
+    """Hash a generated chunk's blocks and biomes separately"""
+    return {
+        'blocks': hashlib.sha1(repr(chunk.blocks).encode()).hexdigest(),
+        'biomes': hashlib.sha1(repr(chunk.biomes).encode()).hexdigest()
+    }
+
+def compute_hashes(seeds=GOLDEN_SEEDS, chunk_indexes=GOLDEN_CHUNKS, version=GENERATION_VERSION):
+    """Generate every golden chunk and return seed -> chunk -> hashes"""
+    hashes = {}
+    for seed in seeds:
+        seed_hashes = hashes[str(seed)] = {}
+        for chunk_x in chunk_indexes:
+            chunk = Chunk(chunk_x)
+            chunk.generate(seed, version)
+            seed_hashes[str(chunk_x)] = hash_chunk(chunk)
+    return hashes
+
+def load_golden(path=GOLDEN_PATH):
+    """Load the golden hashes of every generation version"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def find_mismatches(expected, actual):
+    """List (seed, chunk, part) for every hash that differs"""
+    mismatches = []
+    for seed, chunks in expected.items():
+        for chunk_x, parts in chunks.items():
+            for part, digest in parts.items():
+                if actual.get(seed, {}).get(chunk_x, {}).get(part) != digest:
+                    mismatches.append((seed, chunk_x, part))
+    return mismatches
+
+def check_generation(path=GOLDEN_PATH, update=False):
+    """Compare generation against the golden hashes of every kept generator; returns an exit code
+    
+    With update, the hashes of GENERATION_VERSION are (re)written
+    instead, which is how a deliberate generation change is recorded
+    after bumping GENERATION_VERSION.
+    """
+    version = str(GENERATION_VERSION)
+    golden = load_golden(path)
+    
+    if update:
+        actual = compute_hashes()
+        if version in golden and find_mismatches(golden[version], actual):
+            print(f"Warning: replacing golden hashes of generation version {version}; "
+                  f"bump GENERATION_VERSION if existing worlds will change")
+        golden[version] = actual
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(golden, f, indent=2, sort_keys=True)
+        print(f"Golden hashes for generation version {version} written to {path}")
+        return 0
+    
+    if version not in golden:
+        print(f"No golden hashes for generation version {version}; "
+              f"record them with --update-generation-golden")
+        return 1
+    
+    # Older generators still extend the worlds they created, so they must not drift either
+    failed = False
+    for checked_version in range(OLDEST_GENERATION_VERSION, GENERATION_VERSION + 1):
+        expected = golden.get(str(checked_version))
+        if expected is None:
+            print(f"No golden hashes for generation version {checked_version}; skipped")
+            continue
+    
+        mismatches = find_mismatches(expected, compute_hashes(version=checked_version))
+        checked = sum(len(chunks) for chunks in expected.values())
+        if mismatches:
+            for seed, chunk_x, part in mismatches:
+                print(f"Mismatch: version {checked_version} seed {seed} chunk {chunk_x} {part}")
+            print(f"{len(mismatches)} golden hashes differ for generation version {checked_version}")
+            failed = True
+        else:
+            print(f"Generation version {checked_version} matches {checked} golden chunks")
+    return 1 if failed else 0
\ No newline at end of file
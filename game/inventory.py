@@ -49,7 +49,7 @@ class InventoryGUI:
             self.selected_item = None
             self.selected_slot = None
     
-    def handle_click(self, mouse_x, mouse_y, player):
+    def handle_click(self, mouse_x, mouse_y, player, button=None):
         """Handle mouse clicks in inventory with improved mechanics"""
         if not self.is_open:
             return False
@@ -59,10 +59,14 @@ class InventoryGUI:
                 self.gui_y <= mouse_y <= self.gui_y + self.gui_height):
             return False
         
-        # Get mouse button state
-        mouse_buttons = pygame.mouse.get_pressed()
-        is_left_click = mouse_buttons[0]
-        is_right_click = mouse_buttons[2]
+        # Get mouse button state (from the click itself when known)
+        if button is None:
+            mouse_buttons = pygame.mouse.get_pressed()
+            is_left_click = mouse_buttons[0]
+            is_right_click = mouse_buttons[2]
+        else:
+            is_left_click = button == 1
+            is_right_click = button == 3
         
         # Check crafting grid clicks (2x2 only)
         for row in range(2):
@@ -0,0 +1,191 @@
+"""
+Per-subsystem memory accounting and the chunk streaming soak test
+"""
+import gc
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from .constants import *
+from .replay import clear_save
+from .utils import get_rss_bytes
+
+def estimate_chunk_bytes(chunk):
+    """Estimate the bytes held by a chunk's block, biome and texture index payload"""
+    # Block ids are small ints shared by the interpreter, so only the list
+    # slots that point at them count
+    size = sys.getsizeof(chunk) + sys.getsizeof(chunk.__dict__)
+    size += sys.getsizeof(chunk.blocks) + sys.getsizeof(chunk.biomes)
+    size += sum(sys.getsizeof(column) for column in chunk.blocks)
+    size += sum(sys.getsizeof(column) for column in chunk.texture_indexes if column is not None)
+    return size
+
+def estimate_drop_bytes(drop):
+    """Estimate the bytes held by an item drop"""
+    return sys.getsizeof(drop) + sum(sys.getsizeof(value) for value in drop.values())
+
+def estimate_surface_bytes(surface):
+    """Estimate the pixel bytes held by a surface"""
+    if surface is None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+def summarize_objects(objects, estimate):
+    """Count objects and total their estimated bytes"""
+    count = 0
+    total = 0
+    for obj in objects:
+        count += 1
+        total += estimate(obj)
+    return {'count': count, 'bytes': total}
+
+def get_memory_report(world=None, texture_manager=None):
+    """Estimate the memory held by each subsystem
+    
+    Returns a dictionary of subsystem name -> {'count', 'bytes'} with the
+    same names as MEMORY_BUDGETS.
+    """
+    report = {}
+    
+    if world is not None:
+        # Unloaded chunks stay in memory until their save job runs, and
+        # prefetched chunks while they are generated
+        chunks = (list(world.chunks.values()) + list(world.pending_saves.values()) +
+                  list(world.generating.values()))
+        report['chunks'] = summarize_objects(chunks, estimate_chunk_bytes)
+        report['item_drops'] = summarize_objects(world.item_drops, estimate_drop_bytes)
+    
+    if texture_manager is not None:
+        report['textures'] = summarize_objects(texture_manager.textures.values(), estimate_surface_bytes)
+        
+        cached_surfaces = list(getattr(texture_manager, 'breaking_textures', {}).values())
+        cached_surfaces.append(texture_manager.get_player_texture())
+        cached_surfaces.extend(getattr(texture_manager, 'scaled_textures', {}).values())
+        cached_surfaces.extend(getattr(texture_manager, 'tinted_textures', {}).values())
+        cached_surfaces.extend(getattr(texture_manager, 'placeholders', {}).values())
+        report['cached_surfaces'] = summarize_objects(
+            [surface for surface in cached_surfaces if surface is not None], estimate_surface_bytes)
+    
+    return report
+
+def check_budgets(report, budgets=MEMORY_BUDGETS):
+    """Get (subsystem, bytes, budget) for every subsystem over its budget"""
+    return [(name, usage['bytes'], budgets[name])
+            for name, usage in report.items()
+            if name in budgets and usage['bytes'] > budgets[name]]
+
+def format_bytes(size):
+    """Format a byte count for reports"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MiB"
+    return f"{size / 1024:.1f} KiB"
+
+def get_surface_y(world, block_x):
+    """Get the y of the topmost solid block in a column"""
+    for y in range(WORLD_HEIGHT):
+        if world.is_solid(block_x, y):
+            return y
+    return SURFACE_LEVEL
+
+def run_soak(chunks=SOAK_CHUNKS, seed=SOAK_SEED, output=None):
+    """Stream chunks out and back and check retained memory; returns an exit code
+    
+    The walk digs a block (and drops it) every SOAK_DIG_INTERVAL chunks so
+    the return trip reloads modified chunks from disk, and draws the world
+    regularly so render-side caches are exercised as well.
+    """
+    # Soak tests never open a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from .game import Game
+    
+    game = Game(max_fps=0)
+    clear_save(SOAK_SAVE_NAME)
+    game.init_game_world(seed=seed, save_name=SOAK_SAVE_NAME)
+    world = game.world
+    camera = game.camera
+    
+    gc.collect()
+    start_report = get_memory_report(world, game.texture_manager)
+    start_rss = get_rss_bytes()
+    start_time = time.perf_counter()
+    
+    path = list(range(chunks + 1)) + list(range(chunks - 1, -1, -1))
+    peak = {name: 0 for name in start_report}
+    failures = []
+    
+    for step, chunk_x in enumerate(path):
+        block_x = chunk_x * CHUNK_SIZE + CHUNK_SIZE // 2
+        world.ensure_chunks_loaded(block_x * BLOCK_SIZE)
+        
+        outbound = step <= chunks
+        if outbound and chunk_x % SOAK_DIG_INTERVAL == 0:
+            surface_y = get_surface_y(world, block_x)
+            block_type = world.get_block(block_x, surface_y)
+            world.set_block(block_x, surface_y, BLOCK_AIR)
+            world.add_item_drop(block_x * BLOCK_SIZE, surface_y * BLOCK_SIZE, block_type)
+        world.update_item_drops()
+        
+        # Deferred chunk loads and saves get one frame's budget per step
+        game.scheduler.run_frame(time.perf_counter() + 1.0 / FPS)
+        
+        if step % SOAK_DRAW_INTERVAL == 0:
+            # Point the camera straight at the column; Camera.update clamps to the spawn area
+            camera.x = camera.render_x = block_x * BLOCK_SIZE - SCREEN_WIDTH // 2
+            camera.y = camera.render_y = get_surface_y(world, block_x) * BLOCK_SIZE - SCREEN_HEIGHT // 2
+            game.renderer.draw_world(world, camera)
+        
+        if step % SOAK_SAMPLE_INTERVAL == 0:
+            report = get_memory_report(world, game.texture_manager)
+            for name, usage in report.items():
+                peak[name] = max(peak[name], usage['bytes'])
+            for name, size, budget in check_budgets(report):
+                failures.append(f"{name} at chunk {chunk_x}: {format_bytes(size)} over budget {format_bytes(budget)}")
+    
+    # Back at spawn, everything beyond the working set should have been released
+    gc.collect()
+    end_report = get_memory_report(world, game.texture_manager)
+    end_rss = get_rss_bytes()
+    rss_growth = end_rss - start_rss
+    elapsed = time.perf_counter() - start_time
+    
+    for name, size, budget in check_budgets(end_report):
+        failures.append(f"{name} after returning: {format_bytes(size)} over budget {format_bytes(budget)}")
+    if start_rss and rss_growth > SOAK_RSS_GROWTH_LIMIT:
+        failures.append(f"RSS grew by {format_bytes(rss_growth)} "
+                        f"(limit {format_bytes(SOAK_RSS_GROWTH_LIMIT)})")
+    
+    print(f"Walked {chunks} chunks out and back in {elapsed:.1f}s")
+    for name, usage in end_report.items():
+        print(f"{name:>16}: {usage['count']:>6} objects  {format_bytes(usage['bytes']):>10}  "
+              f"(peak {format_bytes(peak[name])}, budget {format_bytes(MEMORY_BUDGETS[name])})")
+    print(f"{'rss':>16}: {format_bytes(start_rss)} -> {format_bytes(end_rss)}")
+    
+    if output is None:
+        os.makedirs("logs", exist_ok=True)
+        output = f"logs/soak_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'seed': seed,
+            'chunks': chunks,
+            'elapsed': round(elapsed, 3),
+            'start': start_report,
+            'end': end_report,
+            'peak_bytes': peak,
+            'budgets': MEMORY_BUDGETS,
+            'rss_start': start_rss,
+            'rss_end': end_rss,
+            'failures': failures
+        }, f, indent=2)
+    print(f"Soak results written to {output}")
+    
+    world.cleanup()
+    clear_save(SOAK_SAVE_NAME)
+    
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    return 0
\ No newline at end of file
@@ -251,4 +251,35 @@ class SettingsMenu:
         pygame.draw.rect(self.screen, GRAY, reset_rect, 2)
         reset_text = self.font_medium.render("Reset", True, WHITE)
         reset_text_rect = reset_text.get_rect(center=reset_rect.center)
-        self.screen.blit(reset_text, reset_text_rect)
\ No newline at end of file
+        self.screen.blit(reset_text, reset_text_rect)
+
+class LoadingScreen:
+    def __init__(self, screen):
+        self.screen = screen
+        self.font_large = pygame.font.Font(None, 48)
+        self.font_small = pygame.font.Font(None, 24)
+    
+    def draw(self, message, progress, detail=""):
+        """Draw the loading screen with a progress bar (progress from 0 to 1)"""
+        self.screen.fill((40, 30, 20))
+        
+        # Message
+        text = self.font_large.render(message, True, WHITE)
+        text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+        self.screen.blit(text, text_rect)
+        
+        # Progress bar
+        bar_width = 400
+        bar_height = 20
+        bar_rect = pygame.Rect((SCREEN_WIDTH - bar_width) // 2, SCREEN_HEIGHT // 2, bar_width, bar_height)
+        pygame.draw.rect(self.screen, (60, 60, 60), bar_rect)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_width * max(0.0, min(1.0, progress)))
+        pygame.draw.rect(self.screen, GREEN, fill_rect)
+        pygame.draw.rect(self.screen, WHITE, bar_rect, 2)
+        
+        # Detail line (e.g. chunk counts)
+        if detail:
+            text = self.font_small.render(detail, True, LIGHT_GRAY)
+            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 45))
+            self.screen.blit(text, text_rect)
\ No newline at end of file
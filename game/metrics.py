@@ -0,0 +1,185 @@
+"""
+Lightweight metrics registry with periodic time-series dumps
+"""
+import bisect
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from .constants import *
+
+class Counter:
+    """Monotonically increasing count"""
+    __slots__ = ('name', 'registry', 'value')
+    
+    def __init__(self, name, registry):
+        self.name = name
+        self.registry = registry
+        self.value = 0
+    
+    def inc(self, amount=1):
+        """Increase the counter"""
+        if self.registry.enabled:
+            self.value += amount
+    
+    def snapshot(self):
+        """Get the values for a time-series sample"""
+        return {self.name: self.value}
+
+class Gauge:
+    """Value that can go up and down"""
+    __slots__ = ('name', 'registry', 'value')
+    
+    def __init__(self, name, registry):
+        self.name = name
+        self.registry = registry
+        self.value = 0
+    
+    def set(self, value):
+        """Set the current value"""
+        if self.registry.enabled:
+            self.value = value
+    
+    def snapshot(self):
+        """Get the values for a time-series sample"""
+        return {self.name: self.value}
+
+class Histogram:
+    """Distribution of observed values over fixed bucket bounds"""
+    __slots__ = ('name', 'registry', 'bounds', 'buckets', 'count', 'total', 'max')
+    
+    def __init__(self, name, registry, bounds=METRICS_HISTOGRAM_BOUNDS):
+        self.name = name
+        self.registry = registry
+        self.bounds = list(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.total = 0
+        self.max = 0
+    
+    def observe(self, value):
+        """Record a value"""
+        if self.registry.enabled:
+            self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+    
+    def quantile(self, fraction):
+        """Estimate a quantile as the upper bound of the bucket that contains it"""
+        if self.count == 0:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+    
+    def snapshot(self):
+        """Get the values for a time-series sample"""
+        return {
+            f"{self.name}.count": self.count,
+            f"{self.name}.mean": self.total / self.count if self.count else 0,
+            f"{self.name}.p95": self.quantile(0.95),
+            f"{self.name}.max": self.max
+        }
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, dumped as CSV/JSON lines time series
+    
+    Metrics are created once and kept by the code that updates them; while
+    the registry is disabled every update is a single attribute check.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.metrics = {}
+        self.columns = []
+        self.dump_interval = METRICS_DUMP_INTERVAL
+        self.last_dump = 0
+        self.start_time = 0
+        self.csv_path = None
+        self.json_path = None
+    
+    def get_or_create(self, metric_class, name, *args):
+        """Get a metric by name, creating it on first use"""
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = metric_class(name, self, *args)
+        return metric
+    
+    def counter(self, name):
+        """Get or create a counter"""
+        return self.get_or_create(Counter, name)
+    
+    def gauge(self, name):
+        """Get or create a gauge"""
+        return self.get_or_create(Gauge, name)
+    
+    def histogram(self, name, bounds=METRICS_HISTOGRAM_BOUNDS):
+        """Get or create a histogram"""
+        return self.get_or_create(Histogram, name, bounds)
+    
+    def enable(self, dump_interval=METRICS_DUMP_INTERVAL, directory="logs"):
+        """Start collecting and dumping metrics"""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.csv_path = os.path.join(directory, f"metrics_{timestamp}.csv")
+        self.json_path = os.path.join(directory, f"metrics_{timestamp}.jsonl")
+        self.dump_interval = dump_interval
+        self.start_time = self.last_dump = time.perf_counter()
+        self.enabled = True
+    
+    def snapshot(self):
+        """Get the current value of every metric as a flat dictionary"""
+        values = {}
+        for name in sorted(self.metrics):
+            values.update(self.metrics[name].snapshot())
+        return values
+    
+    def maybe_dump(self):
+        """Append a time-series sample and dump once the interval has passed"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if now - self.last_dump >= self.dump_interval:
+            self.last_dump = now
+            self.dump()
+    
+    def dump(self):
+        """Append a sample to the CSV and JSON lines time series"""
+        if not self.enabled:
+            return
+        
+        sample = {'time': round(time.perf_counter() - self.start_time, 3)}
+        sample.update(self.snapshot())
+        
+        # Metrics can appear mid-session; only then is the CSV rewritten with a wider header
+        new_columns = [name for name in sample if name not in self.columns]
+        if new_columns:
+            self.rewrite_csv(self.columns + new_columns)
+        with open(self.csv_path, 'a', newline='') as f:
+            csv.DictWriter(f, fieldnames=self.columns, restval=0).writerow(sample)
+        
+        with open(self.json_path, 'a') as f:
+            f.write(json.dumps(sample) + "\n")
+    
+    def rewrite_csv(self, columns):
+        """Rewrite the CSV with a new header, filling earlier rows' new columns with 0"""
+        rows = []
+        if self.columns and os.path.exists(self.csv_path):
+            with open(self.csv_path, 'r', newline='') as f:
+                rows = list(csv.DictReader(f))
+        
+        with open(self.csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+            writer.writeheader()
+            writer.writerows(rows)
+        self.columns = columns
+
+# Shared registry instrumented throughout the game
+metrics = MetricsRegistry()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Local HTTP endpoint exposing game health in Prometheus text format
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .constants import *
+from .utils import get_rss_bytes
+
+# Exposed health values: (name, type, label for dictionary values, help)
+# Summaries also expose name_sum and name_count from the health values of the same name
+HEALTH_METRICS = [
+    ('minecraft_frame_time_ms', 'summary', 'quantile', "Frame time percentiles over the recent frame window; sum and count cover the session"),
+    ('minecraft_fps', 'gauge', None, "Average frames per second over the recent frame window"),
+    ('minecraft_frame_hitches_total', 'counter', 'threshold_ms', "Frames this session slower than each threshold"),
+    ('minecraft_job_queue_depth', 'gauge', None, "Jobs waiting in the frame-budgeted scheduler"),
+    ('minecraft_job_starved_frames_total', 'counter', None, "Frames that ended with jobs queued but none run"),
+    ('minecraft_job_max_wait_frames', 'gauge', None, "Longest a job has waited to run, in frames"),
+    ('minecraft_loaded_chunks', 'gauge', None, "Chunks currently loaded in the world"),
+    ('minecraft_item_drops', 'gauge', None, "Item drops currently in the world"),
+    ('minecraft_chunks_pending_save', 'gauge', None, "Chunks with changes not yet saved to disk"),
+    ('minecraft_save_queue_depth', 'gauge', None, "Unloaded chunks waiting for their save job"),
+    ('minecraft_memory_estimate_bytes', 'gauge', 'subsystem', "Estimated bytes held by each subsystem"),
+]
+
+def format_prometheus(health, registry_values):
+    """Format a health snapshot and registry values as Prometheus text"""
+    lines = []
+    for name, metric_type, label_name, help_text in HEALTH_METRICS:
+        if name not in health:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        value = health[name]
+        if isinstance(value, dict):
+            # Labelled series, e.g. frame time by quantile
+            for label, label_value in value.items():
+                lines.append(f'{name}{{{label_name}="{label}"}} {label_value}')
+        else:
+            lines.append(f"{name} {value}")
+        if metric_type == 'summary':
+            lines.append(f"{name}_sum {health.get(f'{name}_sum', 0)}")
+            lines.append(f"{name}_count {health.get(f'{name}_count', 0)}")
+    
+    lines.append("# HELP minecraft_resident_memory_bytes Resident set size of the game process")
+    lines.append("# TYPE minecraft_resident_memory_bytes gauge")
+    lines.append(f"minecraft_resident_memory_bytes {get_rss_bytes()}")
+    
+    # Values from the metrics registry when --metrics is enabled
+    for name, value in registry_values.items():
+        metric_name = "minecraft_" + name.replace('.', '_')
+        lines.append(f"{metric_name} {value}")
+    
+    return "\n".join(lines) + "\n"
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serve the latest published snapshot; never touches live game objects"""
+    
+    def do_GET(self):
+        if self.path not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        
+        health, registry_values = self.server.snapshot
+        body = format_prometheus(health, registry_values).encode()
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Scrapes would otherwise print a line to stderr every few seconds
+        pass
+
+class MetricsServer:
+    """Background HTTP server for scraping game health during long sessions
+    
+    The main loop publishes plain-value snapshots with publish(); request
+    handlers only read the most recent snapshot, so a slow or stuck scraper
+    can never stall a frame.
+    """
+    
+    def __init__(self, port, host=METRICS_HOST):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+    
+    def start(self):
+        """Bind the endpoint and serve it from a daemon thread"""
+        self.server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        self.server.daemon_threads = True
+        self.server.snapshot = ({}, {})
+        self.port = self.server.server_address[1]
+        
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name="metrics-server", daemon=True)
+        self.thread.start()
+    
+    def publish(self, health, registry_values=None):
+        """Replace the snapshot served to scrapers"""
+        if self.server:
+            # A single reference assignment, so handlers see old or new, never half
+            self.server.snapshot = (health, registry_values or {})
+    
+    def stop(self):
+        """Shut the endpoint down"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
\ No newline at end of file
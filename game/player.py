@@ -2,6 +2,7 @@ import pygame
 import math
 import os
 from .constants import *
+from .utils import lerp
 
 class Player:
     def __init__(self, x, y, keybinds, texture_manager):
@@ -12,6 +13,10 @@ class Player:
         self.vel_x = 0
         self.vel_y = 0
         
+        # Position at the previous simulation tick (for render interpolation)
+        self.prev_x = x
+        self.prev_y = y
+        
         # Movement states
         self.is_sprinting = False
         self.is_crouching = False
@@ -43,8 +48,9 @@ class Player:
         self.breaking_time = 0  # Time spent breaking current block
         self.break_speed = 1.5  # Progress per frame when mining (slower)
         
-        # Load player textures
+        # Load player textures, and again whenever the skin is reloaded
         self.load_player_textures()
+        texture_manager.add_listener(self.on_texture_changed)
         
         # No starting items - player must gather everything!
     
@@ -62,8 +68,16 @@ class Player:
             print(f"Error loading Steve skin: {e}")
             self.player_skin = None
     
+    def on_texture_changed(self, texture_key):
+        """Pick up a new skin when the texture packs are reloaded"""
+        if texture_key is None or texture_key == PLAYER_SKIN_TEXTURE:
+            self.load_player_textures()
+    
     def update(self, world):
         """Update player physics and position"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Apply gravity
         self.vel_y += self.gravity
         
@@ -146,22 +160,29 @@ class Player:
                 return True
         return False
     
+    def get_key_code(self, keybind_name):
+        """Convert a keybind string to the pygame key it is read from"""
+        key_name = self.keybinds.get(keybind_name, '')
+        if key_name == 'space':
+            return pygame.K_SPACE
+        elif key_name == 'left_ctrl':
+            return pygame.K_LCTRL
+        elif key_name == 'left_shift':
+            return pygame.K_LSHIFT
+        elif len(key_name) == 1:
+            return getattr(pygame, f'K_{key_name}', pygame.K_UNKNOWN)
+        return None
+    
     def handle_input(self, keys):
         """Handle player input using configurable keybinds"""
         self.vel_x = 0
         
         # Convert keybind strings to pygame keys
         def get_key_pressed(keybind_name):
-            key_name = self.keybinds.get(keybind_name, '')
-            if key_name == 'space':
-                return keys[pygame.K_SPACE]
-            elif key_name == 'left_ctrl':
-                return keys[pygame.K_LCTRL]
-            elif key_name == 'left_shift':
-                return keys[pygame.K_LSHIFT]
-            elif len(key_name) == 1:
-                return keys[getattr(pygame, f'K_{key_name}', pygame.K_UNKNOWN)]
-            return False
+            key_code = self.get_key_code(keybind_name)
+            if key_code is None:
+                return False
+            return keys[key_code]
         
         # Check movement states
         self.is_sprinting = get_key_pressed('sprint') and self.on_ground
@@ -442,10 +463,15 @@ class Player:
             return -1
         return min(9, int(self.breaking_progress / 10))
     
-    def draw(self, screen, camera_x, camera_y):
+    def get_render_position(self, alpha):
+        """Get the position interpolated between the last two simulation ticks"""
+        return lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+    
+    def draw(self, screen, camera_x, camera_y, alpha=1.0):
         """Draw player with Minecraft Steve texture or fallback"""
-        screen_x = self.x - camera_x
-        screen_y = self.y - camera_y
+        render_x, render_y = self.get_render_position(alpha)
+        screen_x = render_x - camera_x
+        screen_y = render_y - camera_y
         
         # Adjust height when crouching
         draw_height = self.height
@@ -0,0 +1,104 @@
+"""
+Per-subsystem frame profiling
+"""
+import time
+from collections import deque
+from .constants import *
+from .utils import percentile
+from .tracing import tracer
+
+# Zones reported by the debug overlay, in display order
+PROFILER_ZONES = [
+    'events', 'player update', 'item drops', 'chunk streaming',
+    'world draw', 'ui', 'inventory', 'jobs', 'display flip'
+]
+
+class ProfileZone:
+    """Context manager that adds its elapsed time to a profiler zone"""
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+    
+    def __enter__(self):
+        if tracer.active:
+            tracer.add_event(self.name, 'zone', 'B')
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.profiler.add_time(self.name, time.perf_counter_ns() - self.start)
+        if tracer.active:
+            tracer.add_event(self.name, 'zone', 'E')
+        return False
+
+class FrameProfiler:
+    """Time named zones with perf_counter_ns and keep rolling per-frame statistics"""
+    
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.zones = {}  # name -> ProfileZone
+        self.frame_times = {}  # name -> nanoseconds spent this frame
+        self.history = {}  # name -> deque of milliseconds per frame
+        self.counts = {}  # name -> count for this frame
+        self.last_counts = {}  # counts of the last completed frame
+        self.frame_count = 0
+        self.cached_stats = {}
+        
+        for name in PROFILER_ZONES:
+            self.history[name] = deque(maxlen=window)
+    
+    def zone(self, name):
+        """Get the timing context manager for a zone"""
+        zone = self.zones.get(name)
+        if zone is None:
+            zone = self.zones[name] = ProfileZone(self, name)
+        return zone
+    
+    def add_time(self, name, nanoseconds):
+        """Add time to a zone for the current frame"""
+        self.frame_times[name] = self.frame_times.get(name, 0) + nanoseconds
+    
+    def set_count(self, name, value):
+        """Set a per-frame counter"""
+        self.counts[name] = value
+    
+    def add_count(self, name, amount=1):
+        """Increment a per-frame counter"""
+        self.counts[name] = self.counts.get(name, 0) + amount
+    
+    def begin_frame(self):
+        """Start collecting a new frame"""
+        self.frame_times = {}
+        self.counts = {}
+    
+    def end_frame(self):
+        """Fold the current frame into the rolling history"""
+        for name in self.frame_times:
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+        
+        # Zones that didn't run this frame cost nothing
+        for name, samples in self.history.items():
+            samples.append(self.frame_times.get(name, 0) / 1000000.0)
+        
+        self.last_counts = self.counts
+        self.frame_count += 1
+        if self.frame_count % PROFILER_STATS_INTERVAL == 0:
+            self.cached_stats = {}
+    
+    def get_zone_stats(self, name):
+        """Get (p50, p95, p99) in milliseconds for a zone over the rolling window"""
+        stats = self.cached_stats.get(name)
+        if stats is None:
+            samples = list(self.history.get(name, ()))
+            stats = (percentile(samples, 50), percentile(samples, 95), percentile(samples, 99))
+            self.cached_stats[name] = stats
+        return stats
+    
+    def get_zone_names(self):
+        """Get zone names, overlay zones first"""
+        extra = sorted(name for name in self.history if name not in PROFILER_ZONES)
+        return PROFILER_ZONES + extra
\ No newline at end of file
@@ -1,6 +1,13 @@
+import math
 import pygame
 from .constants import *
-from .utils import draw_text_with_shadow, get_block_name
+from .utils import draw_text_with_shadow, get_block_name, lerp
+from .tracing import traced
+from .metrics import metrics
+
+# Renderer metrics (no-ops unless the registry is enabled)
+frames_drawn = metrics.counter("render.frames")
+world_blits = metrics.histogram("render.world_blits", [100, 250, 500, 1000, 2000, 4000])
 
 class Renderer:
     def __init__(self, screen, texture_manager):
@@ -9,62 +16,57 @@ class Renderer:
         self.font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
     
-    def draw_world(self, world, camera):
+        # World blits issued by the last draw_world call (for the debug overlay)
+        self.blit_count = 0
+    
+    @traced("Renderer.draw_world", "render")
+    def draw_world(self, world, camera, alpha=1.0):
         """Draw the world blocks with Minecraft textures"""
-        # Calculate visible block range with some padding
-        start_x = max(-50, int(camera.x // BLOCK_SIZE) - 1)
-        end_x = int((camera.x + SCREEN_WIDTH) // BLOCK_SIZE) + 2
-        start_y = max(0, int(camera.y // BLOCK_SIZE) - 1)
-        end_y = min(WORLD_HEIGHT, int((camera.y + SCREEN_HEIGHT) // BLOCK_SIZE) + 2)
+        camera_x = camera.render_x
+        camera_y = camera.render_y
         
-        # Ensure chunks are loaded for visible area
-        world.ensure_chunks_loaded(camera.x + SCREEN_WIDTH // 2)
+        # Columns and rows at least partly on screen
+        start_x = max(-50, math.ceil((camera_x - BLOCK_SIZE) / BLOCK_SIZE))
+        end_x = math.floor((camera_x + SCREEN_WIDTH) / BLOCK_SIZE) + 1
+        start_y = max(0, math.ceil((camera_y - BLOCK_SIZE) / BLOCK_SIZE))
+        end_y = min(WORLD_HEIGHT, math.floor((camera_y + SCREEN_HEIGHT) / BLOCK_SIZE) + 1)
         
-        # Draw visible blocks
+        # Each cell's texture index is worked out once per column by its
+        # chunk, from the block and its neighbours, so drawing a cell is
+        # just a list lookup and a blit
+        columns = []
+        used = set()
         for x in range(start_x, end_x):
-            for y in range(start_y, end_y):
-                block_type = world.get_block(x, y)
-                if block_type != BLOCK_AIR:
-                    screen_x = x * BLOCK_SIZE - camera.x
-                    screen_y = y * BLOCK_SIZE - camera.y
-                    
-                    # Only draw if on screen
-                    if (-BLOCK_SIZE <= screen_x <= SCREEN_WIDTH and 
-                        -BLOCK_SIZE <= screen_y <= SCREEN_HEIGHT):
-                        
-                        # Draw block with texture
-                        self.draw_block_texture(screen_x, screen_y, block_type)
+            indexes = world.get_texture_indexes(x, self.texture_manager)
+            if indexes is not None:
+                visible = indexes[start_y:end_y]
+                used.update(visible)
+                columns.append((x * BLOCK_SIZE - camera_x, visible))
         
-        # Draw item drops
-        self.draw_item_drops(world, camera)
-    
-    def draw_block_texture(self, x, y, block_type):
-        """Draw block using Minecraft textures with proper variants"""
-        # Get appropriate texture variant for certain blocks
-        variant = None
-        if block_type == BLOCK_GRASS:
-            # Use side texture for grass blocks in 2D view (shows the grass on dirt)
-            variant = "side"
-        elif block_type == BLOCK_WOOD:
-            # Use side texture for wood logs
-            variant = "side"
+        # Fetched after the columns, which may have added texture slots
+        self.texture_manager.mark_indexes_used(used)
+        textures = self.texture_manager.get_texture_table()
+        rows = [y * BLOCK_SIZE - camera_y for y in range(start_y, end_y)]
+        blit = self.screen.blit
+        blit_count = 0
+        for screen_x, visible in columns:
+            for index, screen_y in zip(visible, rows):
+                if index:
+                    blit(textures[index], (screen_x, screen_y))
+                    blit_count += 1
+        self.blit_count = blit_count
         
-        texture = self.texture_manager.get_texture(block_type, variant)
+        # Draw item drops
+        self.draw_item_drops(world, camera, alpha)
         
-        if texture:
-            # Draw the texture
-            self.screen.blit(texture, (x, y))
-        else:
-            # Fallback to color rendering if texture not available
-            color = BLOCK_COLORS.get(block_type, (200, 200, 200))
-            pygame.draw.rect(self.screen, color, (x, y, BLOCK_SIZE, BLOCK_SIZE))
-            pygame.draw.rect(self.screen, BLACK, (x, y, BLOCK_SIZE, BLOCK_SIZE), 1)
+        frames_drawn.inc()
+        world_blits.observe(self.blit_count)
     
-    def draw_item_drops(self, world, camera):
+    def draw_item_drops(self, world, camera, alpha=1.0):
         """Draw item drops in the world with textures and stacking"""
         for item in world.item_drops:
-            screen_x = item['x'] - camera.x
-            screen_y = item['y'] - camera.y
+            screen_x = lerp(item['prev_x'], item['x'], alpha) - camera.render_x
+            screen_y = lerp(item['prev_y'], item['y'], alpha) - camera.render_y
             
             # Only draw if on screen
             if (-20 <= screen_x <= SCREEN_WIDTH and -20 <= screen_y <= SCREEN_HEIGHT):
@@ -73,6 +75,7 @@ class Renderer:
                 
                 # Get texture for item
                 texture = self.texture_manager.get_scaled_texture(item['type'], item_size)
+                self.blit_count += 2
                 
                 if texture:
                     # Create a surface with alpha for the glow effect
@@ -117,7 +120,7 @@ class Renderer:
     
     def draw_block_selection(self, player, world, camera, mouse_x, mouse_y):
         """Draw selection outline around block that can be interacted with"""
-        world_x, world_y = player.get_block_at_mouse(mouse_x, mouse_y, camera.x, camera.y)
+        world_x, world_y = player.get_block_at_mouse(mouse_x, mouse_y, camera.render_x, camera.render_y)
         
         # Check if player can interact with this block
         if player.can_interact_with_block(world, world_x, world_y):
@@ -125,8 +128,8 @@ class Renderer:
             
             # Only show selection if there's a block to mine or empty space to place
             if block_type != BLOCK_AIR or player.get_selected_block() != BLOCK_AIR:
-                screen_x = world_x * BLOCK_SIZE - camera.x
-                screen_y = world_y * BLOCK_SIZE - camera.y
+                screen_x = world_x * BLOCK_SIZE - camera.render_x
+                screen_y = world_y * BLOCK_SIZE - camera.render_y
                 
                 # Draw selection outline
                 selection_color = (255, 255, 255, 100)  # White with transparency
@@ -142,8 +145,8 @@ class Renderer:
         """Draw block breaking animation using textures from ZIP"""
         if player.breaking_block is not None:
             world_x, world_y = player.breaking_block
-            screen_x = world_x * BLOCK_SIZE - camera.x
-            screen_y = world_y * BLOCK_SIZE - camera.y
+            screen_x = world_x * BLOCK_SIZE - camera.render_x
+            screen_y = world_y * BLOCK_SIZE - camera.render_y
             
             # Only draw if on screen
             if (-BLOCK_SIZE <= screen_x <= SCREEN_WIDTH and 
@@ -298,4 +301,30 @@ class Renderer:
             )
         
         # Draw hotbar
-        self.draw_hotbar(player)
\ No newline at end of file
+        self.draw_hotbar(player)
+    
+    def draw_debug_overlay(self, profiler, performance_monitor):
+        """Draw the F3 overlay with per-zone frame timings and frame counters"""
+        rows = [("FPS", f"{performance_monitor.get_fps():.0f}"), ("zone", "p50 / p95 / p99 ms")]
+        for name in profiler.get_zone_names():
+            p50, p95, p99 = profiler.get_zone_stats(name)
+            rows.append((name, f"{p50:.2f} / {p95:.2f} / {p99:.2f}"))
+        
+        counts = profiler.counts
+        for name in ['chunks', 'drops', 'blits', 'ticks', 'jobs']:
+            rows.append((name, str(counts.get(name, 0))))
+        
+        # Background panel in the top-right corner
+        line_height = 18
+        panel_width = 280
+        panel_height = len(rows) * line_height + 10
+        panel_x = SCREEN_WIDTH - panel_width - 10
+        bg_surface = pygame.Surface((panel_width, panel_height))
+        bg_surface.set_alpha(170)
+        bg_surface.fill((0, 0, 0))
+        self.screen.blit(bg_surface, (panel_x, 10))
+        
+        for i, (label, value) in enumerate(rows):
+            y = 15 + i * line_height
+            draw_text_with_shadow(self.screen, self.small_font, label, panel_x + 8, y, LIGHT_GRAY, BLACK)
+            draw_text_with_shadow(self.screen, self.small_font, value, panel_x + 130, y, WHITE, BLACK)
\ No newline at end of file
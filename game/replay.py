@@ -0,0 +1,212 @@
+"""
+Deterministic input recording and replay
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import pygame
+from .constants import *
+
+# Keybinds read from the keyboard state every tick by Player.handle_input
+MOVEMENT_KEYBINDS = ['move_left', 'move_right', 'jump', 'sprint', 'crouch']
+
+class RecordedKeys:
+    """Stand-in for pygame.key.get_pressed() built from a set of key codes"""
+    
+    def __init__(self, pressed):
+        self.pressed = frozenset(pressed)
+    
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class TickInput:
+    """Everything the simulation reads from the player during one tick"""
+    
+    def __init__(self, keys, mouse_pos, mouse_buttons=(False, False, False), actions=None):
+        self.keys = keys
+        self.mouse_pos = mouse_pos
+        self.mouse_buttons = mouse_buttons
+        self.actions = actions or []
+    
+    @classmethod
+    def sample(cls, actions=None):
+        """Sample live input from pygame"""
+        return cls(pygame.key.get_pressed(), pygame.mouse.get_pos(),
+                   pygame.mouse.get_pressed(), actions)
+    
+    def to_dict(self, tracked_keys):
+        """Convert to a compact dictionary, keeping only the tracked keys"""
+        return {
+            'keys': [key for key in tracked_keys if self.keys[key]],
+            'mouse': list(self.mouse_pos),
+            'buttons': [int(bool(pressed)) for pressed in self.mouse_buttons],
+            'actions': [list(action) for action in self.actions]
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create tick input from a recorded dictionary"""
+        return cls(
+            RecordedKeys(data['keys']),
+            tuple(data['mouse']),
+            tuple(bool(pressed) for pressed in data['buttons']),
+            [tuple(action) for action in data['actions']]
+        )
+
+def clear_save(save_name):
+    """Delete a scratch save so its world is regenerated from the seed"""
+    shutil.rmtree(os.path.join("saves", save_name), ignore_errors=True)
+
+def compute_state_hash(game):
+    """Hash the simulation state that replays must reproduce exactly"""
+    player = game.player
+    digest = hashlib.sha1()
+    
+    digest.update(repr((
+        player.x, player.y, player.vel_x, player.vel_y, player.on_ground,
+        player.is_sprinting, player.is_crouching, player.selected_slot,
+        player.hotbar, sorted(player.inventory.items(), key=lambda item: str(item[0])),
+        player.breaking_block, player.breaking_progress,
+        game.camera.x, game.camera.y, game.mouse_held,
+        game.inventory_gui.is_open, game.inventory_gui.selected_item,
+        game.inventory_gui.crafting_system.crafting_grid
+    )).encode())
+    
+    for item in game.world.item_drops:
+        digest.update(repr((
+            item['type'], item['x'], item['y'], item['vel_x'], item['vel_y'],
+            item['count'], item['on_ground'], item['time']
+        )).encode())
+    
+    # Chunks beyond simulation distance are prefetched whenever frames have
+    # time to spare, so only the simulated chunks are part of the state
+    for chunk_x in sorted(game.world.required_chunks):
+        digest.update(repr((chunk_x, game.world.chunks[chunk_x].blocks)).encode())
+    
+    return digest.hexdigest()
+
+class InputRecorder:
+    """Record per-tick input and periodic state hashes of a live session"""
+    
+    def __init__(self, path, hash_interval=REPLAY_HASH_INTERVAL):
+        self.path = path
+        self.hash_interval = hash_interval
+        self.ticks = []
+        self.hashes = []
+        self.tracked_keys = []
+        self.seed = None
+        self.keybinds = {}
+        self.tick_rate = TICK_RATE
+    
+    def start(self, game):
+        """Begin recording a freshly initialized game world"""
+        self.seed = game.world.seed
+        self.keybinds = dict(game.keybinds)
+        self.tick_rate = game.tick_rate
+        self.tracked_keys = sorted({
+            game.player.get_key_code(name) for name in MOVEMENT_KEYBINDS
+        } - {None})
+    
+    def record(self, tick_input):
+        """Record the input consumed by one tick"""
+        self.ticks.append(tick_input.to_dict(self.tracked_keys))
+    
+    def after_tick(self, game):
+        """Record a state hash every hash_interval ticks"""
+        if len(self.ticks) % self.hash_interval == 0:
+            self.hashes.append([len(self.ticks), compute_state_hash(game)])
+    
+    def save(self):
+        """Write the recording to disk"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with open(self.path, 'w') as f:
+            json.dump({
+                'version': RECORDING_VERSION,
+                'seed': self.seed,
+                'tick_rate': self.tick_rate,
+                'keybinds': self.keybinds,
+                'hash_interval': self.hash_interval,
+                'ticks': self.ticks,
+                'hashes': self.hashes
+            }, f)
+
+class InputReplayer:
+    """Drive Game.update_game from a recording and check for divergence"""
+    
+    def __init__(self, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        
+        self.version = data.get('version', 1)
+        self.seed = data['seed']
+        self.tick_rate = data.get('tick_rate', TICK_RATE)
+        self.keybinds = data['keybinds']
+        self.hash_interval = data.get('hash_interval', REPLAY_HASH_INTERVAL)
+        self.ticks = data['ticks']
+        self.expected_hashes = data.get('hashes', [])
+    
+    def run(self, game, hash_interval=None):
+        """Replay every recorded tick and return the state hashes and elapsed time"""
+        hash_interval = hash_interval or self.hash_interval
+        
+        game.keybinds = dict(self.keybinds)
+        clear_save(REPLAY_SAVE_NAME)
+        game.init_game_world(seed=self.seed, save_name=REPLAY_SAVE_NAME)
+        
+        hashes = []
+        start_time = time.perf_counter()
+        for tick, tick_data in enumerate(self.ticks, 1):
+            game.update_game(TickInput.from_dict(tick_data))
+            if tick % hash_interval == 0:
+                hashes.append([tick, compute_state_hash(game)])
+        elapsed = time.perf_counter() - start_time
+        
+        return hashes, elapsed
+    
+    def find_divergence(self, hashes):
+        """Return the first tick whose hash differs from the recording, or None"""
+        expected = dict((tick, state_hash) for tick, state_hash in self.expected_hashes)
+        for tick, state_hash in hashes:
+            if tick in expected and expected[tick] != state_hash:
+                return tick
+        return None
+
+def replay_session(path, hash_interval=None, hash_output=None):
+    """Replay a recording headlessly and report divergence; returns an exit code"""
+    # Replays never open a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from .game import Game
+    
+    replayer = InputReplayer(path)
+    game = Game(tick_rate=replayer.tick_rate)
+    hashes, elapsed = replayer.run(game, hash_interval)
+    
+    tick_count = len(replayer.ticks)
+    ticks_per_second = tick_count / elapsed if elapsed > 0 else 0
+    print(f"Replayed {tick_count} ticks in {elapsed:.2f}s ({ticks_per_second:.0f} ticks/s)")
+    
+    if hash_output:
+        with open(hash_output, 'w') as f:
+            json.dump({'recording': path, 'seed': replayer.seed, 'hashes': hashes}, f, indent=2)
+    
+    if replayer.version != RECORDING_VERSION:
+        print(f"Recording format {replayer.version} hashes different state, skipping divergence check")
+        return 0
+    
+    if hash_interval and hash_interval != replayer.hash_interval:
+        print("Hash interval differs from the recording, skipping divergence check")
+        return 0
+    
+    divergent_tick = replayer.find_divergence(hashes)
+    if divergent_tick is not None:
+        print(f"Replay diverged from the recording at tick {divergent_tick}")
+        return 1
+    
+    print(f"Replay matches the recording ({len(replayer.expected_hashes)} state hashes)")
+    return 0
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+Indexed resource packs: texture lookup and blockstate/model resolution
+"""
+import json
+import zipfile
+
+# Folders used by pre-1.13 packs, mapped to their current names
+LEGACY_FOLDERS = {'blocks': 'block', 'items': 'item'}
+
+# Model texture variables tried, in order, for each face a block is drawn with
+FACE_TEXTURE_VARIABLES = {
+    'side': ['side', 'north', 'south', 'east', 'west', 'all', 'particle'],
+    'top': ['top', 'up', 'end', 'all', 'side', 'particle'],
+    'bottom': ['bottom', 'down', 'end', 'all', 'side', 'particle'],
+    'overlay': ['overlay']
+}
+
+MAX_MODEL_DEPTH = 32  # Parent links followed before a model chain is treated as a cycle
+
+def resource_location(name, namespace="minecraft"):
+    """Normalize a resource reference such as 'block/dirt' to 'minecraft:block/dirt'"""
+    if ':' not in name:
+        return f"{namespace}:{name}"
+    return name
+
+def split_asset_path(path):
+    """Split a ZIP entry under assets/<namespace>/ into (namespace, path below it)"""
+    parts = path.split('/', 2)
+    if len(parts) == 3 and parts[0] == 'assets':
+        return parts[1], parts[2]
+    # Packs that left out the assets folder
+    if path.startswith('minecraft/'):
+        return 'minecraft', path[len('minecraft/'):]
+    return 'minecraft', path
+
+def texture_location(path):
+    """Get the resource location of a PNG entry, e.g. 'minecraft:block/dirt'"""
+    namespace, name = split_asset_path(path[:-len('.png')])
+    if name.startswith('textures/'):
+        name = name[len('textures/'):]
+    
+    folder, sep, rest = name.partition('/')
+    if sep and folder in LEGACY_FOLDERS:
+        name = f"{LEGACY_FOLDERS[folder]}/{rest}"
+    return f"{namespace}:{name}"
+
+class ResourcePack:
+    """A resource pack ZIP with its entries indexed by resource location"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.zip_file = zipfile.ZipFile(path, 'r')
+        self.textures = {}  # location -> PNG entry
+        self.texture_meta = {}  # location -> .png.mcmeta entry
+        self.models = {}  # location -> model JSON entry
+        self.blockstates = {}  # location -> blockstate JSON entry
+        self.build_index()
+    
+    def build_index(self):
+        """Index the ZIP's entries once so lookups never scan the name list"""
+        for path in self.zip_file.namelist():
+            if path.endswith('.png'):
+                location = texture_location(path)
+                # Canonical paths win over legacy or loose copies of a texture
+                if path.startswith('assets/') or location not in self.textures:
+                    self.textures[location] = path
+            elif path.endswith('.png.mcmeta'):
+                self.texture_meta[texture_location(path[:-len('.mcmeta')])] = path
+            elif path.endswith('.json'):
+                namespace, name = split_asset_path(path[:-len('.json')])
+                if name.startswith('models/'):
+                    self.models[f"{namespace}:{name[len('models/'):]}"] = path
+                elif name.startswith('blockstates/'):
+                    self.blockstates[f"{namespace}:{name[len('blockstates/'):]}"] = path
+    
+    def read(self, path):
+        """Read a ZIP entry (safe from several threads at once)"""
+        return self.zip_file.read(path)
+    
+    def close(self):
+        """Close the ZIP file"""
+        self.zip_file.close()
+
+class ResourcePackStack:
+    """Resource packs layered by priority; the first pack providing a resource wins
+    
+    Blockstates, models and textures are each looked up separately, so a
+    pack that only overrides a texture still uses the models of the packs
+    below it.
+    """
+    
+    def __init__(self, paths):
+        self.packs = [ResourcePack(path) for path in paths]  # Highest priority first
+        self.model_cache = {}
+        self.block_cache = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close every pack"""
+        for pack in self.packs:
+            pack.close()
+    
+    def find(self, kind, location):
+        """Get (pack, entry) for a resource of the given index ('textures', 'models', ...)"""
+        for pack in self.packs:
+            path = getattr(pack, kind).get(location)
+            if path is not None:
+                return pack, path
+        return None, None
+    
+    def read(self, kind, location):
+        """Read a resource, or return None if no pack has it"""
+        pack, path = self.find(kind, location)
+        if pack is None:
+            return None
+        return pack.read(path)
+    
+    def read_json(self, kind, location):
+        """Read and parse a JSON resource, or return None if it is missing or invalid"""
+        data = self.read(kind, location)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            print(f"Error parsing {kind} {location}: {e}")
+            return None
+    
+    def find_texture(self, name, texture_type=None):
+        """Get the location of a texture by name, e.g. ('dirt', 'block'), or None"""
+        candidates = [name]
+        if texture_type:
+            candidates.insert(0, f"{texture_type}/{name}")
+        
+        for candidate in candidates:
+            location = resource_location(candidate)
+            if self.find('textures', location)[0] is not None:
+                return location
+        return None
+    
+    def resolve_model(self, location):
+        """Get a block model's texture variables, following parents, as variable -> texture location"""
+        if location in self.model_cache:
+            return self.model_cache[location]
+        
+        variables = {}
+        model_location = location
+        for _ in range(MAX_MODEL_DEPTH):
+            model = self.read_json('models', model_location)
+            if model is None:
+                break
+            # Variables of a child model override its parents'
+            for variable, value in model.get('textures', {}).items():
+                variables.setdefault(variable, value)
+            parent = model.get('parent')
+            if not parent:
+                break
+            model_location = resource_location(parent)
+        
+        textures = {}
+        for variable, value in variables.items():
+            # '#name' refers to another variable of the same model
+            seen = set()
+            while value.startswith('#') and value[1:] in variables and value not in seen:
+                seen.add(value)
+                value = variables[value[1:]]
+            if not value.startswith('#'):
+                textures[variable] = resource_location(value)
+        
+        self.model_cache[location] = textures
+        return textures
+    
+    def get_block_models(self, location):
+        """List a block's candidate model locations, default blockstate variant first"""
+        blockstate = self.read_json('blockstates', location) or {}
+        variants = []
+        
+        if blockstate.get('variants'):
+            states = blockstate['variants']
+            variants = ([states['']] if '' in states else []) + list(states.values())
+        elif blockstate.get('multipart'):
+            variants = [part.get('apply') for part in blockstate['multipart']]
+        
+        models = []
+        for variant in variants:
+            # Weighted variants list alternatives; the first is the default
+            if isinstance(variant, list):
+                variant = variant[0] if variant else None
+            if isinstance(variant, dict) and variant.get('model'):
+                models.append(resource_location(variant['model']))
+        
+        # Without a usable blockstate, fall back to the model named after the block
+        namespace, name = location.split(':', 1)
+        models.append(f"{namespace}:block/{name}")
+        return models
+    
+    def resolve_block(self, name):
+        """Resolve a block id such as 'grass_block' to face -> texture location
+        
+        Only faces whose texture exists in the stack are included.
+        """
+        location = resource_location(name)
+        if location in self.block_cache:
+            return self.block_cache[location]
+        
+        faces = {}
+        # Variants whose model is missing from the packs are skipped
+        for model in self.get_block_models(location):
+            textures = self.resolve_model(model)
+            for face, variables in FACE_TEXTURE_VARIABLES.items():
+                for variable in variables:
+                    texture = textures.get(variable)
+                    if texture and self.find('textures', texture)[0] is not None:
+                        faces[face] = texture
+                        break
+            if faces:
+                break
+        
+        self.block_cache[location] = faces
+        return faces
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Frame-budgeted job scheduler for deferred main-thread work
+"""
+import heapq
+import itertools
+import time
+from .constants import *
+from .metrics import metrics
+from .tracing import tracer
+
+# Scheduler metrics (no-ops unless the registry is enabled)
+jobs_run_counter = metrics.counter("scheduler.jobs_run")
+starved_frames_counter = metrics.counter("scheduler.starved_frames")
+queue_depth_gauge = metrics.gauge("scheduler.queue_depth")
+job_wait_frames = metrics.histogram("scheduler.job_wait_frames", [1, 2, 5, 10, 30, 60, 120])
+
+class Job:
+    """Queued unit of work, ordered by priority then submission order"""
+    __slots__ = ('priority', 'sequence', 'name', 'func', 'key', 'frame', 'cancelled')
+    
+    def __init__(self, priority, sequence, name, func, key, frame):
+        self.priority = priority
+        self.sequence = sequence
+        self.name = name
+        self.func = func
+        self.key = key
+        self.frame = frame
+        self.cancelled = False
+    
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+class JobScheduler:
+    """Run queued jobs on the main thread while the current frame has time left
+    
+    Lower priority values run first. Jobs left when the frame's deadline
+    passes carry over to the next frame; a job submitted with a key is
+    only queued once until it runs or is cancelled. A job only starts if
+    its name's average run time fits in the time left, so long jobs wait
+    for a frame with room rather than overrunning the budget, while
+    cheaper jobs behind them still run.
+    """
+    
+    def __init__(self):
+        self.queue = []
+        self.jobs_by_key = {}
+        self.pending = 0  # Queued jobs that have not been cancelled
+        self.sequence = itertools.count()
+        self.frame = 0
+        self.cost_estimates = {}  # Job name -> smoothed run time in seconds
+        self.oversized_jobs = set()  # Job names already reported for running over the estimate cap
+        
+        # Statistics
+        self.jobs_run = 0
+        self.jobs_run_last_frame = 0
+        self.time_last_frame = 0.0
+        self.starved_frames = 0  # Frames that ended with work queued but none run
+        self.starved_streak = 0
+        self.max_wait_frames = 0
+    
+    def submit(self, func, priority=JOB_PRIORITY_NORMAL, name="job", key=None):
+        """Queue a job; returns False if a job with the same key is already queued"""
+        if key is not None and key in self.jobs_by_key:
+            return False
+        job = Job(priority, next(self.sequence), name, func, key, self.frame)
+        if key is not None:
+            self.jobs_by_key[key] = job
+        heapq.heappush(self.queue, job)
+        self.pending += 1
+        return True
+    
+    def cancel(self, key):
+        """Cancel a queued job by key; returns True if one was queued"""
+        job = self.jobs_by_key.pop(key, None)
+        if job is None:
+            return False
+        job.cancelled = True  # Dropped lazily when it reaches the top of the heap
+        self.pending -= 1
+        return True
+    
+    def is_queued(self, key):
+        """Check whether a job with this key is waiting to run"""
+        return key in self.jobs_by_key
+    
+    def clear(self):
+        """Drop every queued job"""
+        self.queue = []
+        self.jobs_by_key = {}
+        self.pending = 0
+    
+    def peek(self):
+        """Get the highest priority job without running it, or None"""
+        while self.queue and self.queue[0].cancelled:
+            heapq.heappop(self.queue)
+        return self.queue[0] if self.queue else None
+    
+    def run_next(self):
+        """Run the highest priority job; returns False if the queue is empty"""
+        while self.queue:
+            job = heapq.heappop(self.queue)
+            if job.cancelled:
+                continue
+            if job.key is not None:
+                del self.jobs_by_key[job.key]
+            self.pending -= 1
+            
+            wait = self.frame - job.frame
+            self.max_wait_frames = max(self.max_wait_frames, wait)
+            job_wait_frames.observe(wait)
+            
+            if tracer.active:
+                tracer.begin(job.name, "job")
+            start = time.perf_counter()
+            try:
+                job.func()
+            finally:
+                if tracer.active:
+                    tracer.end(job.name, "job")
+            
+            elapsed = time.perf_counter() - start
+            self.update_estimate(job.name, elapsed)
+            self.jobs_run += 1
+            jobs_run_counter.inc()
+            return True
+        return False
+    
+    def update_estimate(self, name, elapsed):
+        """Fold a job's run time into its name's estimate
+        
+        Estimates are capped at SCHEDULER_MAX_JOB_ESTIMATE so a job that
+        once ran long still fits in a lightly loaded frame instead of only
+        running through the starvation fallback.
+        """
+        if elapsed > SCHEDULER_MAX_JOB_ESTIMATE and name not in self.oversized_jobs:
+            self.oversized_jobs.add(name)
+            print(f"Job '{name}' took {elapsed * 1000:.1f} ms, over the "
+                  f"{SCHEDULER_MAX_JOB_ESTIMATE * 1000:.1f} ms estimate cap")
+        
+        estimate = self.cost_estimates.get(name)
+        if estimate is None:
+            estimate = elapsed
+        else:
+            estimate += (elapsed - estimate) * SCHEDULER_COST_SMOOTHING
+        self.cost_estimates[name] = min(estimate, SCHEDULER_MAX_JOB_ESTIMATE)
+    
+    def run_frame(self, deadline):
+        """Run jobs until the perf_counter deadline and return the number run
+        
+        Called once per frame. Jobs that do not fit in the time left are
+        passed over for cheaper ones behind them and keep their place in
+        the queue. If jobs have been starved for SCHEDULER_MAX_STARVED_FRAMES
+        frames in a row, one job runs even without time left so deferred
+        work always makes progress.
+        """
+        start = time.perf_counter()
+        ran = 0
+        
+        if self.pending and self.starved_streak >= SCHEDULER_MAX_STARVED_FRAMES:
+            if self.run_next():
+                ran += 1
+        
+        skipped = []
+        while self.pending and len(skipped) < SCHEDULER_MAX_SKIPPED_JOBS:
+            job = self.peek()
+            if job is None:
+                break
+            if time.perf_counter() + self.cost_estimates.get(job.name, 0.0) > deadline:
+                skipped.append(heapq.heappop(self.queue))
+                continue
+            self.run_next()
+            ran += 1
+        for job in skipped:
+            heapq.heappush(self.queue, job)
+        
+        if ran == 0 and self.pending:
+            self.starved_frames += 1
+            self.starved_streak += 1
+            starved_frames_counter.inc()
+        else:
+            self.starved_streak = 0
+        
+        self.jobs_run_last_frame = ran
+        self.time_last_frame = time.perf_counter() - start
+        self.frame += 1
+        queue_depth_gauge.set(self.pending)
+        return ran
+    
+    def run_all(self):
+        """Run every queued job regardless of time (e.g. before saving and quitting)"""
+        while self.run_next():
+            pass
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Disk cache of decoded and scaled textures, stored as one raw RGBA atlas
+"""
+import hashlib
+import json
+import mmap
+import os
+import pygame
+from .constants import *
+
+def hash_file(path):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_pack_hash(pack_path):
+    """Hash a resource pack, reusing the last hash while its size and mtime are unchanged"""
+    stat = os.stat(pack_path)
+    hashes_path = os.path.join(TEXTURE_CACHE_DIR, "pack_hashes.json")
+    hashes = {}
+    if os.path.exists(hashes_path):
+        try:
+            with open(hashes_path, 'r') as f:
+                hashes = json.load(f)
+        except (OSError, ValueError):
+            hashes = {}
+    
+    key = os.path.abspath(pack_path)
+    entry = hashes.get(key)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha1']
+    
+    sha1 = hash_file(pack_path)
+    hashes[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': sha1}
+    os.makedirs(TEXTURE_CACHE_DIR, exist_ok=True)
+    write_atomic(hashes_path, json.dumps(hashes, indent=2).encode())
+    return sha1
+
+def get_cache_key(pack_paths, block_size):
+    """Key of the cached atlas for a stack of packs and a block size"""
+    packs_hash = hashlib.sha1(" ".join(get_pack_hash(path) for path in pack_paths).encode()).hexdigest()
+    return f"{packs_hash[:16]}_{block_size}_v{TEXTURE_CACHE_VERSION}"
+
+def write_atomic(path, data):
+    """Write a file so readers never see it half written"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def pack_rects(sizes, width):
+    """Place (w, h) rectangles on shelves of the given width
+    
+    Returns the (x, y) of each rectangle and the total height.
+    """
+    positions = []
+    x = y = shelf_height = 0
+    for w, h in sizes:
+        if x + w > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        positions.append((x, y))
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions, y + shelf_height
+
+def save_atlas(key, groups):
+    """Write groups of named surfaces to the cache as one atlas plus an index
+    
+    groups maps a group name to a dict of texture key -> surface, except
+    'animations', which maps texture keys to their .mcmeta animation and
+    is stored in the index. Texture keys must be ints or strings so they
+    survive the JSON index.
+    """
+    entries = [(group, name, surface) for group, surfaces in groups.items() if group != 'animations'
+               for name, surface in surfaces.items() if surface is not None]
+    # Tallest first keeps the shelves tight
+    entries.sort(key=lambda entry: -entry[2].get_height())
+    width = max([TEXTURE_ATLAS_WIDTH] + [surface.get_width() for _, _, surface in entries])
+    positions, height = pack_rects([surface.get_size() for _, _, surface in entries], width)
+    
+    atlas = pygame.Surface((width, max(1, height)), pygame.SRCALPHA)
+    index = {'version': TEXTURE_CACHE_VERSION, 'width': width, 'height': max(1, height), 'entries': [],
+             'animations': [[name, animation] for name, animation in groups.get('animations', {}).items()]}
+    for (group, name, surface), (x, y) in zip(entries, positions):
+        atlas.blit(surface, (x, y))
+        index['entries'].append([group, name, x, y, surface.get_width(), surface.get_height()])
+    
+    os.makedirs(TEXTURE_CACHE_DIR, exist_ok=True)
+    base = os.path.join(TEXTURE_CACHE_DIR, key)
+    write_atomic(f"{base}.rgba", pygame.image.tobytes(atlas, "RGBA"))
+    # The index is written last so it only exists for a complete atlas
+    write_atomic(f"{base}.json", json.dumps(index).encode())
+
+def load_atlas(key):
+    """Load a cached atlas back into groups of surfaces, or None if it is not cached
+    
+    The surfaces are not converted for the display, so this can run on
+    any thread.
+    """
+    base = os.path.join(TEXTURE_CACHE_DIR, key)
+    try:
+        with open(f"{base}.json", 'r') as f:
+            index = json.load(f)
+        if index.get('version') != TEXTURE_CACHE_VERSION:
+            return None
+        
+        size = (index['width'], index['height'])
+        with open(f"{base}.rgba", 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as pixels:
+                if len(pixels) != size[0] * size[1] * 4:
+                    return None
+                # Copied so the surface does not outlive the map
+                atlas = pygame.image.frombuffer(pixels, size, "RGBA").copy()
+    except (OSError, ValueError, KeyError, pygame.error):
+        return None
+    
+    groups = {'animations': {name: animation for name, animation in index.get('animations', [])}}
+    for group, name, x, y, w, h in index['entries']:
+        groups.setdefault(group, {})[name] = atlas.subsurface((x, y, w, h)).copy()
+    return groups
+
+class AtlasReader:
+    """Random access to single textures of a cached atlas through a memory map"""
+    
+    def __init__(self, key):
+        base = os.path.join(TEXTURE_CACHE_DIR, key)
+        with open(f"{base}.json", 'r') as f:
+            index = json.load(f)
+        if index.get('version') != TEXTURE_CACHE_VERSION:
+            raise ValueError(f"texture cache {key} has version {index.get('version')}")
+        
+        self.width = index['width']
+        self.height = index['height']
+        self.entries = {(group, name): (x, y, w, h) for group, name, x, y, w, h in index['entries']}
+        self.animations = {name: animation for name, animation in index.get('animations', [])}
+        self.file = open(f"{base}.rgba", 'rb')
+        self.pixels = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.pixels) != self.width * self.height * 4:
+            self.close()
+            raise ValueError(f"texture cache {key} is truncated")
+    
+    @classmethod
+    def open(cls, key):
+        """Open a cached atlas, or return None if it is not cached"""
+        try:
+            return cls(key)
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def read(self, group, name):
+        """Copy one texture out of the atlas as an unconverted surface"""
+        x, y, w, h = self.entries[(group, name)]
+        stride = self.width * 4
+        rows = b''.join(self.pixels[(y + row) * stride + x * 4:(y + row) * stride + (x + w) * 4]
+                        for row in range(h))
+        return pygame.image.frombytes(rows, (w, h), "RGBA")
+    
+    def read_group(self, group):
+        """Copy every texture of a group out of the atlas"""
+        return {name: self.read(group, name) for entry_group, name in self.entries if entry_group == group}
+    
+    def close(self):
+        """Unmap and close the atlas"""
+        self.pixels.close()
+        self.file.close()
\ No newline at end of file
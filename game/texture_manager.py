@@ -1,15 +1,106 @@
 import pygame
+import io
 import os
-import zipfile
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from .constants import *
+from .resource_pack import ResourcePackStack
+from .texture_cache import AtlasReader, get_cache_key, load_atlas, save_atlas
+
+def decode_texture(packs, location, size):
+    """Read and decode a texture, scaled to size if given (runs on a worker thread)
+    
+    Animated textures come back as a vertical strip of their frames, each
+    scaled to size.
+    """
+    image = pygame.image.load(io.BytesIO(packs.read('textures', location)))
+    animation = read_animation(packs, location)
+    if animation is not None:
+        strip = slice_frames(image, animation, size)
+        if strip is not None:
+            return strip
+    if size:
+        image = pygame.transform.scale(image, size)
+    return image
+
+def read_animation(packs, location):
+    """Get the animation section of a texture's .mcmeta, or None if it is not animated"""
+    if packs.find('texture_meta', location)[0] is None:
+        return None
+    meta = packs.read_json('texture_meta', location)
+    animation = meta.get('animation') if isinstance(meta, dict) else None
+    return animation if isinstance(animation, dict) else None
+
+def slice_frames(image, animation, size):
+    """Cut an animation's frames out of its image and stack them in a vertical strip
+    
+    Frames are square unless the .mcmeta gives their width and height,
+    and are read left to right, top to bottom. Each is scaled to size
+    before stacking so neighbouring frames never bleed into each other.
+    Returns None if the image holds no whole frame.
+    """
+    width, height = image.get_size()
+    frame_width = int(animation.get('width', min(width, height)))
+    frame_height = int(animation.get('height', frame_width))
+    if frame_width <= 0 or frame_height <= 0:
+        return None
+    
+    frames = [image.subsurface((x, y, frame_width, frame_height))
+              for y in range(0, height - frame_height + 1, frame_height)
+              for x in range(0, width - frame_width + 1, frame_width)]
+    if not frames:
+        return None
+    if size:
+        frames = [pygame.transform.scale(frame, size) for frame in frames]
+    
+    frame_width, frame_height = frames[0].get_size()
+    pixels = b''.join(pygame.image.tobytes(frame, "RGBA") for frame in frames)
+    return pygame.image.frombytes(pixels, (frame_width, frame_height * len(frames)), "RGBA")
+
+def get_frame_timeline(animation, frame_count):
+    """List the frame shown on each tick of one animation cycle, following the .mcmeta"""
+    frame_time = max(1, int(animation.get('frametime', 1)))
+    timeline = []
+    for frame in animation.get('frames') or range(frame_count):
+        index, ticks = frame, frame_time
+        if isinstance(frame, dict):
+            index, ticks = frame.get('index', 0), max(1, int(frame.get('time', frame_time)))
+        if isinstance(index, int) and 0 <= index < frame_count:
+            timeline.extend([index] * ticks)
+    return timeline or [0]
+
+def read_source(source, size):
+    """Read a lazily loaded texture from its source (safe on any thread)"""
+    kind, origin, name = source
+    if kind == 'atlas':
+        return origin.read('textures', name)
+    return decode_texture(origin, name, size)
+
+def get_block_variant(block_type, above):
+    """Pick the texture variant a block is drawn with, given the block above it"""
+    if block_type == BLOCK_GRASS:
+        # Grass open to the sky shows its grass-topped side; covered grass
+        # shows the dirt underneath
+        return "side" if above == BLOCK_AIR else "bottom"
+    if block_type == BLOCK_WOOD:
+        return "side"
+    return None
+
+def is_same_image(a, b):
+    """Check whether two surfaces hold the same pixels"""
+    if a is None or b is None:
+        return a is b
+    return a.get_size() == b.get_size() and pygame.image.tobytes(a, "RGBA") == pygame.image.tobytes(b, "RGBA")
 
 class TextureManager:
-    def __init__(self):
+    def __init__(self, texture_pack_path=TEXTURE_PACK_PATH, override_pack_paths=(), background=False,
+                 lazy=False, hot_reload=False):
         self.textures = {}
         self.block_size = BLOCK_SIZE
         self.assets_path = "game/assets"
-        self.texture_pack_path = "game/assets/VanillaDefault 1.21.5.zip"
+        self.texture_pack_path = texture_pack_path
+        self.override_pack_paths = override_pack_paths  # Packs layered over the base pack, highest first
         
         # Comprehensive block and item mappings
         self.block_mappings = {
@@ -38,264 +129,597 @@ class TextureManager:
             BLOCK_IRON: ["iron_ore", "iron_block"],
         }
         
-        self.load_textures()
+        # Faces drawn tinted with the biome's colour from a colormap:
+        # (item type, variant) -> colormap. Grass sides get the tinted
+        # overlay drawn over them
+        self.tinted_faces = {
+            (BLOCK_GRASS, 'top'): 'grass',
+            (BLOCK_GRASS, 'overlay'): 'grass',
+            (BLOCK_LEAVES, None): 'foliage',
+        }
+        self.tinted_types = {item_type for item_type, variant in self.tinted_faces}
+        self.fallback_types = set()  # Item types the packs have no texture for
+        
+        # Background loading state; the thread outlives the hand-over while it writes the cache
+        self.loaded = False
+        self.loading = False  # A load is running whose textures have not been swapped in yet
+        self.load_thread = None
+        self.load_result = None
+        self.load_done = threading.Event()
+        
+        # Hot reload: the packs are polled and reloaded when they change on disk
+        self.hot_reload = hot_reload
+        self.pack_stamps = None  # (path, mtime, size) of each pack when last loaded
+        self.last_reload_check = 0.0
+        
+        # Lazy loading: block and item textures are only read or decoded
+        # the first time they are drawn, and can be evicted again
+        self.lazy = lazy
+        # Texture key -> ('atlas', atlas reader, name) or ('pack', pack stack, location)
+        self.sources = {}
+        self.pending = {}  # Texture key -> future decoding it from the packs
+        self.last_used = {}  # Texture key -> frame it was last requested
+        self.texture_bytes = 0  # Estimated bytes of lazily loaded textures
+        self.frame = 0
+        self.decode_executor = None
+        self.placeholders = {}  # Item type -> fallback shown while its texture loads
+        
+        # Animated textures: each is loaded as a strip of pre-scaled frames,
+        # and the frame the animation clock is on is swapped into textures
+        self.animation_meta = {}  # Texture key -> .mcmeta animation section
+        self.animations = {}  # Texture key -> (strip, frames, frame shown on each tick)
+        self.animation_start = time.perf_counter()
+        self.animation_tick = 0
+        self.dirty_textures = []  # Keys whose animation frame changed in the last update()
+        
+        # Derived surfaces and the callbacks told when a texture changes
+        self.scaled_textures = {}  # (item type, variant, size) -> scaled texture
+        self.tinted_textures = {}  # (item type, variant, biome) -> tinted texture
+        self.biome_colors = self.get_biome_colors({})  # (colormap, biome) -> colour
+        
+        # Texture slots: the (block type, variant) pairs chunks are drawn
+        # with, numbered as they are first seen. A cell's texture index is
+        # slot * BIOME_COUNT + biome; slot 0 is air and is never drawn
+        self.texture_slots = [(BLOCK_AIR, None)]
+        self.texture_slot_indexes = {(BLOCK_AIR, None): 0}
+        
+        # Texture of every texture index chunks are drawn with, rebuilt
+        # only after a texture changes
+        self.texture_table = []
+        self.texture_table_dirty = True
+        self.listeners = []
+        
+        if background:
+            self.start_background_load()
+        else:
+            self.load_textures()
     
     def load_textures(self):
-        """Load all textures from the ZIP file"""
-        if os.path.exists(self.texture_pack_path):
-            self.load_from_zip()
+        """Load all textures, blocking until they are ready"""
+        self.pack_stamps = self.get_pack_stamps()
+        source, groups, cache_key = self.read_textures()
+        self.apply_textures(source, groups)
+        if self.lazy:
+            # Writing a lazy cache decodes the whole stack, which is never done on the main thread
+            self.load_thread = threading.Thread(target=self.write_cache, args=(source, groups, cache_key),
+                                                name="texture-cache", daemon=True)
+            self.load_thread.start()
         else:
-            print(f"Texture pack not found: {self.texture_pack_path}")
-            self.create_fallback_textures()
+            self.write_cache(source, groups, cache_key)
     
-    def load_from_zip(self):
-        """Load textures from ZIP file with comprehensive mapping"""
-        try:
-            with zipfile.ZipFile(self.texture_pack_path, 'r') as zip_file:
-                # Get list of all files in the ZIP
-                file_list = zip_file.namelist()
-                
-                # Try to find and load mapping file first
-                mapping_data = self.load_mapping_file(zip_file, file_list)
-                
-                # Load block textures
-                for block_id, minecraft_name in self.block_mappings.items():
-                    self.load_texture_from_zip(zip_file, file_list, block_id, minecraft_name, "block", mapping_data)
-                
-                # Load item textures
-                item_types = [ITEM_STICK, ITEM_CRAFTING_TABLE, ITEM_WOODEN_PICKAXE]
-                for item_id in item_types:
-                    minecraft_name = self.block_mappings.get(item_id)
-                    if minecraft_name:
-                        self.load_texture_from_zip(zip_file, file_list, item_id, minecraft_name, "item", mapping_data)
-                
-                # Load special textures
-                self.load_special_textures_from_zip(zip_file, file_list)
-                
-                # Load breaking animation textures
-                self.load_breaking_textures_from_zip(zip_file, file_list)
-                
-                # Load player skin
-                self.load_player_skin_from_zip(zip_file, file_list)
-                
-                print(f"Loaded {len(self.textures)} textures from ZIP file")
+    def start_background_load(self):
+        """Load textures on a background thread; placeholders are used until update() swaps them in"""
+        self.create_fallback_textures()
+        self.start_load_thread()
+    
+    def start_load_thread(self, previous=None):
+        """Start the background thread loading the textures"""
+        self.pack_stamps = self.get_pack_stamps()
+        self.load_result = None
+        self.load_done.clear()
+        self.loading = True
+        self.load_thread = threading.Thread(target=self.background_load, args=(previous,),
+                                            name="texture-load", daemon=True)
+        self.load_thread.start()
+    
+    def background_load(self, previous=None):
+        """Background thread body reading and decoding the textures
         
+        When reloading, previous holds the textures in use, and only the
+        ones whose pixels changed are handed over to be swapped in.
+        """
+        source, groups, changed, cache_key = None, None, None, None
+        try:
+            source, groups, cache_key = self.read_textures()
+            if previous is not None and groups is not None:
+                if self.lazy:
+                    groups['textures'] = self.read_loaded_textures(groups['sources'], previous)
+                changed = self.find_changed_textures(previous, groups)
         except Exception as e:
-            print(f"Error loading from ZIP: {e}")
-            self.create_fallback_textures()
-    
-    def load_mapping_file(self, zip_file, file_list):
-        """Try to load mapping file from the ZIP"""
-        mapping_files = [
-            "assets/minecraft/blockstates/",
-            "assets/minecraft/models/block/",
-            "assets/minecraft/models/item/",
-            "pack.mcmeta"
-        ]
+            print(f"Error loading textures: {e}")
+            source, groups = None, None
+        finally:
+            self.load_result = (source, groups, changed)
+            self.load_done.set()
         
-        # For now, we'll use our own mapping since Minecraft's structure is complex
-        # In a real implementation, you'd parse the JSON files to get proper mappings
-        return None
+        # The cache is written after the textures are handed over. A lazy
+        # reload only read the textures in use, and the whole stack is not
+        # decoded again for every change to a pack being edited
+        if previous is None or not self.lazy:
+            self.write_cache(source, groups, cache_key)
+    
+    def write_cache(self, source, groups, cache_key):
+        """Cache textures read from the packs so later launches skip decoding the ZIP
+        
+        Lazy loads only located the textures, so every texture is decoded
+        here first; this only runs on a background thread, once for each
+        pack stack without a cache entry.
+        """
+        if source != 'pack':
+            return
+        if self.lazy:
+            groups = self.read_from_zip()
+            # The packs are read again here, so they must still be the ones the key was made from
+            try:
+                if get_cache_key(self.get_pack_paths(), self.block_size) != cache_key:
+                    return
+            except OSError:
+                return
+        if groups is not None:
+            self.save_to_cache(cache_key, groups)
     
-    def load_texture_from_zip(self, zip_file, file_list, item_id, minecraft_name, texture_type, mapping_data=None):
-        """Load a specific texture from ZIP file with multiple fallbacks"""
-        # Try different possible paths and names
-        names_to_try = [minecraft_name]
-        
-        # Add alternative names if available
-        if item_id in self.alternative_mappings:
-            names_to_try.extend(self.alternative_mappings[item_id])
-        
-        for name in names_to_try:
-            possible_paths = [
-                f"assets/minecraft/textures/{texture_type}/{name}.png",
-                f"minecraft/textures/{texture_type}/{name}.png",
-                f"textures/{texture_type}/{name}.png",
-                f"{texture_type}/{name}.png",
-                f"{name}.png",
-                f"assets/minecraft/textures/blocks/{name}.png",  # Legacy path
-                f"assets/minecraft/textures/items/{name}.png",   # Legacy path
-            ]
+    def update(self):
+        """Swap in textures finished in the background and evict idle ones; call once per frame
+        
+        Returns True once the initial load is done.
+        """
+        self.frame += 1
+        if self.loading:
+            if self.load_done.is_set():
+                self.finish_loading()
+        elif self.hot_reload:
+            self.check_for_reload()
+        if self.pending:
+            self.collect_decoded_textures()
+        self.advance_animations()
+        if self.texture_bytes > TEXTURE_MEMORY_BUDGET:
+            self.evict_textures()
+        return self.loaded
+    
+    def finish_loading(self):
+        """Wait for a background load to finish and swap its textures in"""
+        if self.loading:
+            self.load_done.wait()
+            self.loading = False
+            self.apply_textures(*self.load_result)
+            self.load_result = None
+    
+    def get_pack_stamps(self):
+        """Get the modification time and size of every configured pack (None if missing)"""
+        stamps = []
+        for path in list(self.override_pack_paths) + [self.texture_pack_path]:
+            try:
+                stat = os.stat(path)
+                stamps.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append((path, None, None))
+        return stamps
+    
+    def check_for_reload(self):
+        """Reload the textures in the background if a pack changed on disk"""
+        now = time.perf_counter()
+        if now - self.last_reload_check < TEXTURE_RELOAD_CHECK_INTERVAL:
+            return
+        self.last_reload_check = now
+        
+        # A new load would hash the packs again while the last one still writes their cache
+        if self.load_thread is not None and self.load_thread.is_alive():
+            return
+        if self.get_pack_stamps() != self.pack_stamps:
+            print("Texture packs changed, reloading textures")
+            self.start_reload()
+    
+    def start_reload(self):
+        """Reload the textures in the background, keeping the current ones until the new ones are ready"""
+        previous = {key: self.get_stored_texture(key) for key in self.textures
+                    if not self.lazy or key in self.sources}
+        previous[PLAYER_SKIN_TEXTURE] = self.get_player_texture()
+        self.start_load_thread(previous)
+    
+    def read_loaded_textures(self, sources, previous):
+        """Read the new version of each lazily loaded texture in use (runs on the loading thread)"""
+        textures = {}
+        for texture_key in previous:
+            if texture_key in sources:
+                try:
+                    textures[texture_key] = read_source(sources[texture_key], (self.block_size, self.block_size))
+                except Exception as e:
+                    print(f"Error loading texture {texture_key}: {e}")
+        return textures
+    
+    def find_changed_textures(self, previous, groups):
+        """Get the keys of textures whose pixels differ from previous (runs on the loading thread)"""
+        current = dict(groups.get('textures', {}))
+        current[PLAYER_SKIN_TEXTURE] = groups.get('player', {}).get('skin')
+        return {texture_key for texture_key in previous.keys() | current.keys()
+                if not is_same_image(previous.get(texture_key), current.get(texture_key))}
+    
+    def read_textures(self):
+        """Read textures from the cache, or from the packs on a cache miss
+        
+        Returns (source, groups, cache_key) where groups maps 'textures',
+        'breaking' and 'player' to unconverted surfaces, so this can run
+        off the main thread. source is 'cache' or 'pack', or None if
+        nothing was loaded. cache_key identifies the packs as they were
+        read, so a cache written later never takes the key of newer packs.
+        """
+        if not os.path.exists(self.texture_pack_path):
+            print(f"Texture pack not found: {self.texture_pack_path}")
+            return None, None, None
+        try:
+            cache_key = get_cache_key(self.get_pack_paths(), self.block_size)
+        except OSError as e:
+            print(f"Error hashing texture pack: {e}")
+            cache_key = None
+        if self.lazy:
+            source, groups = self.read_sources(cache_key)
+            return source, groups, cache_key
+        
+        start_time = time.perf_counter()
+        groups = self.read_from_cache(cache_key)
+        if groups is not None:
+            print(f"Read {len(groups.get('textures', {}))} textures from cache in "
+                  f"{(time.perf_counter() - start_time) * 1000:.1f} ms")
+            return 'cache', groups, cache_key
+        
+        groups = self.read_from_zip()
+        return ('pack', groups, cache_key) if groups is not None else (None, None, None)
+    
+    def read_sources(self, cache_key):
+        """Find where each block and item texture will be read from, without decoding them
+        
+        Used in lazy mode. Breaking textures and the player skin are small
+        and always needed, so they are still read here.
+        """
+        reader = AtlasReader.open(cache_key) if cache_key else None
+        if reader is not None:
+            return 'cache', {
+                'sources': {name: ('atlas', reader, name) for group, name in reader.entries if group == 'textures'},
+                'animations': reader.animations,
+                'breaking': reader.read_group('breaking'),
+                'player': reader.read_group('player'),
+                'colormap': reader.read_group('colormap')
+            }
+        
+        try:
+            # Left open for decoding the textures as they are requested
+            packs = ResourcePackStack(self.get_pack_paths())
+            mappings, items, breaking, skin, colormaps = self.locate_textures(packs)
             
-            for path in possible_paths:
-                if path in file_list:
-                    try:
-                        # Extract and load the texture
-                        texture_data = zip_file.read(path)
-                        
-                        # Create a temporary file-like object
-                        import io
-                        texture_file = io.BytesIO(texture_data)
-                        
-                        # Load the image
-                        original_texture = pygame.image.load(texture_file).convert_alpha()
-                        scaled_texture = pygame.transform.scale(original_texture, (self.block_size, self.block_size))
-                        
-                        self.textures[item_id] = scaled_texture
-                        print(f"Loaded {name} from {path}")
-                        return True
-                        
-                    except Exception as e:
-                        print(f"Error loading {path}: {e}")
-                        continue
-        
-        # If not found, create fallback
-        print(f"Texture not found for {minecraft_name}, creating fallback")
-        self.create_fallback_texture(item_id)
-        return False
-    
-    def load_breaking_textures_from_zip(self, zip_file, file_list):
-        """Load breaking animation textures from ZIP file"""
-        self.breaking_textures = {}
-        
-        # Try to load destroy stage textures from the ZIP
-        for stage in range(10):
-            stage_names = [
-                f"destroy_stage_{stage}",
-                f"destroy_{stage}",
-                f"breaking_{stage}",
-                f"crack_{stage}"
-            ]
+            block_size = (self.block_size, self.block_size)
+            sizes = {location: block_size for location in breaking.values() if location}
+            sizes.update((location, None) for location in colormaps.values() if location)
+            if skin:
+                sizes[skin] = None
+            images = self.decode_images(packs, sizes)
             
-            for stage_name in stage_names:
-                possible_paths = [
-                    f"assets/minecraft/textures/block/{stage_name}.png",
-                    f"minecraft/textures/block/{stage_name}.png",
-                    f"textures/block/{stage_name}.png",
-                    f"block/{stage_name}.png",
-                    f"{stage_name}.png",
-                    f"assets/minecraft/textures/blocks/{stage_name}.png"  # Legacy
-                ]
-                
-                loaded = False
-                for path in possible_paths:
-                    if path in file_list:
-                        try:
-                            import io
-                            texture_data = zip_file.read(path)
-                            texture_file = io.BytesIO(texture_data)
-                            original = pygame.image.load(texture_file).convert_alpha()
-                            scaled = pygame.transform.scale(original, (self.block_size, self.block_size))
-                            self.breaking_textures[stage] = scaled
-                            print(f"Loaded breaking stage {stage} from {path}")
-                            loaded = True
-                            break
-                        except Exception as e:
-                            print(f"Error loading breaking texture {path}: {e}")
-                
-                if loaded:
-                    break
+            sources = {}
+            locations = {location: ('pack', packs, location)
+                         for faces in mappings.values() for location in faces.values()}
+            for block_id, faces in mappings.items():
+                self.add_block_faces(sources, locations, block_id, faces)
+            for item_id, location in items.items():
+                if location:
+                    sources[item_id] = ('pack', packs, location)
+            animated = self.read_animations(packs, {source[2] for source in sources.values()})
+        except Exception as e:
+            print(f"Error loading from ZIP: {e}")
+            return None, None
+        
+        return 'pack', {
+            'sources': sources,
+            'animations': {key: animated[source[2]] for key, source in sources.items() if source[2] in animated},
+            'breaking': {stage: images[location] for stage, location in breaking.items() if images.get(location)},
+            'player': {'skin': images.get(skin)},
+            'colormap': {name: images[location] for name, location in colormaps.items() if images.get(location)}
+        }
+    
+    def apply_textures(self, source, groups, changed=None):
+        """Convert loaded textures for the display and make them current (main thread only)
+        
+        After a reload, changed holds the keys of the textures that differ
+        from the current ones. Only those are converted and reported to
+        the listeners; the others keep their current surfaces.
+        """
+        if groups is None:
+            if self.loaded:
+                print("Keeping the current textures")
+            else:
+                self.create_fallback_textures()
+                self.loaded = True
+            return
+        
+        # Lazy decodes still running read from the packs about to be closed
+        if self.pending:
+            wait(list(self.pending.values()))
+            self.pending = {}
+        previous_sources = self.sources
+        self.sources = groups.get('sources', {})
+        
+        textures = {}
+        for key, surface in groups.get('textures', {}).items():
+            current = self.get_stored_texture(key)
+            if changed is None or key in changed or current is None:
+                textures[key] = surface.convert_alpha()
+            else:
+                textures[key] = current
+        self.fallback_types = set()
+        for item_id, minecraft_name in self.block_mappings.items():
+            if item_id in textures or item_id in self.sources:
+                continue
+            self.fallback_types.add(item_id)
+            if changed is not None and item_id not in changed and item_id in self.textures:
+                textures[item_id] = self.textures[item_id]
+            else:
+                print(f"Texture not found for {minecraft_name}, creating fallback")
+                textures[item_id] = self.create_fallback_surface(item_id)
+        previous_textures = self.textures
+        self.textures = textures
         
-        # If we couldn't load breaking textures from ZIP, create fallback ones
+        # Animations whose strip and timing are unchanged keep running as they are
+        previous_meta, previous_animations = self.animation_meta, self.animations
+        self.animation_meta = groups.get('animations', {})
+        self.animations = {}
+        for key in self.animation_meta.keys() & textures.keys():
+            animation = previous_animations.get(key)
+            if (animation is not None and animation[0] is textures[key]
+                    and previous_meta.get(key) == self.animation_meta[key]):
+                self.animations[key] = animation
+                textures[key] = previous_textures[key]
+            else:
+                self.start_animation(key)
+        
+        # Breaking animation textures, with fallbacks if the packs have none
+        self.breaking_textures = {stage: surface.convert_alpha()
+                                  for stage, surface in groups.get('breaking', {}).items()}
         if not self.breaking_textures:
             print("Creating fallback breaking animation textures")
             self.create_breaking_animation_textures()
+        
+        if changed is None or PLAYER_SKIN_TEXTURE in changed:
+            skin = groups.get('player', {}).get('skin')
+            self.player_skin = skin.convert_alpha() if skin else None
+            print("Loaded Steve skin" if self.player_skin else "Steve skin not found in texture packs")
+        
+        biome_colors = self.get_biome_colors(groups.get('colormap', {}))
+        if biome_colors != self.biome_colors:
+            self.biome_colors = biome_colors
+            self.tinted_textures = {}
+        
+        self.texture_bytes = sum(self.get_texture_bytes(key) for key in textures if key in self.sources)
+        self.last_used = {key: frame for key, frame in self.last_used.items() if key in textures}
+        if changed is None:
+            self.notify_listeners(None)
+        else:
+            # Lazy textures loaded during the reload are dropped too
+            replaced = {key for key, texture in previous_textures.items() if self.textures.get(key) is not texture}
+            for key in changed | replaced:
+                self.notify_listeners(key)
+        
+        for origin in {source[1] for source in previous_sources.values()}:
+            origin.close()
+        self.loaded = True
     
-    def load_special_textures_from_zip(self, zip_file, file_list):
-        """Load special texture variants from ZIP"""
-        # Grass block side texture
-        grass_side_paths = [
-            "assets/minecraft/textures/block/grass_block_side.png",
-            "minecraft/textures/block/grass_block_side.png",
-            "textures/block/grass_block_side.png",
-            "block/grass_block_side.png",
-            "assets/minecraft/textures/blocks/grass_side.png"  # Legacy
-        ]
+    def get_biome_colors(self, colormaps):
+        """Look up each biome's grass and foliage colour by its climate, as Minecraft does"""
+        colors = {}
+        for name, default_color in COLORMAP_DEFAULT_COLORS.items():
+            colormap = colormaps.get(name)
+            for biome, (temperature, downfall) in BIOME_CLIMATES.items():
+                if colormap is None:
+                    colors[(name, biome)] = default_color
+                    continue
+                temperature = min(max(temperature, 0.0), 1.0)
+                downfall = min(max(downfall, 0.0), 1.0) * temperature
+                width, height = colormap.get_size()
+                x = int((1.0 - temperature) * (width - 1))
+                y = int((1.0 - downfall) * (height - 1))
+                colors[(name, biome)] = tuple(colormap.get_at((x, y)))[:3]
+        return colors
+    
+    def get_pack_paths(self):
+        """Get the texture packs in use, highest priority first"""
+        paths = [path for path in self.override_pack_paths if os.path.exists(path)]
+        return paths + [self.texture_pack_path]
+    
+    def read_from_zip(self):
+        """Read textures from the resource packs, resolving blocks through their models
         
-        for path in grass_side_paths:
-            if path in file_list:
-                try:
-                    import io
-                    texture_data = zip_file.read(path)
-                    texture_file = io.BytesIO(texture_data)
-                    original = pygame.image.load(texture_file).convert_alpha()
-                    self.textures[f"{BLOCK_GRASS}_side"] = pygame.transform.scale(original, (self.block_size, self.block_size))
-                    print("Loaded grass side texture")
-                    break
-                except Exception as e:
-                    print(f"Error loading grass side texture: {e}")
-        
-        # Wood log side texture
-        wood_side_paths = [
-            "assets/minecraft/textures/block/oak_log.png",
-            "minecraft/textures/block/oak_log.png",
-            "textures/block/oak_log.png",
-            "block/oak_log.png",
-            "assets/minecraft/textures/blocks/log_oak.png"  # Legacy
-        ]
+        Every texture is located first, then all of them are read and
+        decoded together on a thread pool. Returns the texture groups, or
+        None if the packs could not be read.
+        """
+        try:
+            with ResourcePackStack(self.get_pack_paths()) as packs:
+                mappings, items, breaking, skin, colormaps = self.locate_textures(packs)
+                
+                # Decoded textures by location, shared by every face that uses one
+                block_size = (self.block_size, self.block_size)
+                sizes = {location: block_size for faces in mappings.values() for location in faces.values()}
+                sizes.update((location, block_size) for location in items.values() if location)
+                sizes.update((location, block_size) for location in breaking.values() if location)
+                # The skin is sliced by the player renderer and colormaps are
+                # looked up by climate, so both keep their size
+                sizes.update((location, None) for location in colormaps.values() if location)
+                if skin:
+                    sizes[skin] = None
+                images = self.decode_images(packs, sizes)
+                animated = self.read_animations(packs, sizes)
+                pack_count = len(packs.packs)
         
-        for path in wood_side_paths:
-            if path in file_list:
-                try:
-                    import io
-                    texture_data = zip_file.read(path)
-                    texture_file = io.BytesIO(texture_data)
-                    original = pygame.image.load(texture_file).convert_alpha()
-                    self.textures[f"{BLOCK_WOOD}_side"] = pygame.transform.scale(original, (self.block_size, self.block_size))
-                    print("Loaded wood side texture")
-                    break
-                except Exception as e:
-                    print(f"Error loading wood side texture: {e}")
-        
-        # Grass block top texture
-        grass_top_paths = [
-            "assets/minecraft/textures/block/grass_block_top.png",
-            "minecraft/textures/block/grass_block_top.png",
-            "textures/block/grass_block_top.png",
-            "block/grass_block_top.png",
-            "assets/minecraft/textures/blocks/grass_top.png"  # Legacy
-        ]
+        except Exception as e:
+            print(f"Error loading from ZIP: {e}")
+            return None
+    
+        # Block textures, by location first so animations can be matched up
+        texture_locations = {}
+        decoded = {location: location for location, image in images.items() if image}
+        for block_id, faces in mappings.items():
+            self.add_block_faces(texture_locations, decoded, block_id, faces)
         
-        for path in grass_top_paths:
-            if path in file_list:
-                try:
-                    import io
-                    texture_data = zip_file.read(path)
-                    texture_file = io.BytesIO(texture_data)
-                    original = pygame.image.load(texture_file).convert_alpha()
-                    self.textures[f"{BLOCK_GRASS}_top"] = pygame.transform.scale(original, (self.block_size, self.block_size))
-                    print("Loaded grass top texture")
+        # Item textures (over a block's texture when the pack has both)
+        for item_id, location in items.items():
+            if images.get(location):
+                texture_locations[item_id] = location
+        
+        textures = {key: images[location] for key, location in texture_locations.items()}
+        print(f"Loaded {len(textures)} textures from {pack_count} texture pack(s)")
+        return {
+            'textures': textures,
+            'animations': {key: animated[location] for key, location in texture_locations.items()
+                           if location in animated},
+            'breaking': {stage: images[location] for stage, location in breaking.items() if images.get(location)},
+            'player': {'skin': images.get(skin)},
+            'colormap': {name: images[location] for name, location in colormaps.items() if images.get(location)}
+        }
+    
+    def read_from_cache(self, cache_key):
+        """Read the decoded and scaled textures cached under a key, or None"""
+        if cache_key is None:
+            return None
+        return load_atlas(cache_key)
+        
+    def save_to_cache(self, cache_key, groups):
+        """Cache textures read from the packs so later launches skip decoding the ZIP"""
+        if cache_key is None:
+            return
+        try:
+            save_atlas(cache_key, groups)
+        except (OSError, pygame.error) as e:
+            print(f"Error caching textures: {e}")
+    
+    def read_animations(self, packs, locations):
+        """Read the .mcmeta animation of each animated texture among locations"""
+        animations = {}
+        for location in locations:
+            animation = read_animation(packs, location)
+            if animation is not None:
+                animations[location] = animation
+        return animations
+    
+    def locate_textures(self, packs):
+        """Find the locations of every texture: (block faces, items, breaking stages, skin, colormaps)"""
+        item_types = [ITEM_STICK, ITEM_CRAFTING_TABLE, ITEM_WOODEN_PICKAXE]
+        return (
+            self.load_mapping_file(packs),
+            {item_id: self.find_texture(packs, item_id, "item") for item_id in item_types},
+            {stage: self.find_breaking_texture(packs, stage) for stage in range(10)},
+            self.find_player_skin(packs),
+            {name: packs.find_texture(f"colormap/{name}") for name in COLORMAP_DEFAULT_COLORS}
+        )
+    
+    def load_mapping_file(self, packs):
+        """Resolve each mapped block to its face textures through the packs' blockstates and models
+        
+        Returns block id -> {face: texture location}. Names without a
+        blockstate or model fall back to a block texture of the same name.
+        """
+        mappings = {}
+        for item_id, minecraft_name in self.block_mappings.items():
+            for name in [minecraft_name] + self.alternative_mappings.get(item_id, []):
+                faces = packs.resolve_block(name)
+                if not faces:
+                    location = packs.find_texture(name, "block")
+                    faces = {'side': location} if location else {}
+                if faces:
+                    mappings[item_id] = faces
                     break
-                except Exception as e:
-                    print(f"Error loading grass top texture: {e}")
-    
-    def load_player_skin_from_zip(self, zip_file, file_list):
-        """Load player skin from ZIP file"""
-        steve_paths = [
-            "assets/minecraft/textures/entity/player/wide/steve.png",
-            "minecraft/textures/entity/player/wide/steve.png",
-            "textures/entity/player/wide/steve.png",
-            "entity/player/wide/steve.png",
-            "player/wide/steve.png",
-            "steve.png",
-            "assets/minecraft/textures/entity/steve.png"  # Alternative path
-        ]
+        return mappings
+    
+    def find_texture(self, packs, item_id, texture_type):
+        """Find the texture of a mapped id, trying its alternative names"""
+        names = [self.block_mappings[item_id]] + self.alternative_mappings.get(item_id, [])
+        for name in names:
+            location = packs.find_texture(name, texture_type)
+            if location:
+                return location
+        return None
+    
+    def decode_images(self, packs, sizes):
+        """Read and decode textures on a thread pool, returning location -> surface
         
-        for path in steve_paths:
-            if path in file_list:
+        sizes maps each texture location to the size it is scaled to, or
+        None to keep its own size. The surfaces are not converted for the
+        display yet; that happens on the main thread in apply_textures.
+        Textures that fail to decode map to None.
+        """
+        images = {}
+        if not sizes:
+            return images
+        
+        workers = min(len(sizes), TEXTURE_DECODE_WORKERS or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="texture-decode") as executor:
+            futures = {location: executor.submit(decode_texture, packs, location, size)
+                       for location, size in sizes.items()}
+            for location, future in futures.items():
                 try:
-                    import io
-                    texture_data = zip_file.read(path)
-                    texture_file = io.BytesIO(texture_data)
-                    self.player_skin = pygame.image.load(texture_file).convert_alpha()
-                    print("Loaded Steve skin from ZIP")
-                    return
+                    images[location] = future.result()
                 except Exception as e:
-                    print(f"Error loading Steve skin: {e}")
+                    print(f"Error loading {location}: {e}")
+                    images[location] = None
+        return images
+    
+    def add_block_faces(self, textures, images, block_id, faces):
+        """Add a block's side texture, plus top/bottom/overlay variants that differ from it"""
+        side = faces.get('side') or next(iter(faces.values()))
+        if not images.get(side):
+            return
+        textures[block_id] = images[side]
         
-        print("Steve skin not found in ZIP")
-        self.player_skin = None
+        for face in ('top', 'bottom', 'overlay'):
+            location = faces.get(face)
+            if location and location != side and images.get(location):
+                textures[f"{block_id}_{face}"] = images[location]
+                textures[f"{block_id}_side"] = images[side]
+            
+    def find_breaking_texture(self, packs, stage):
+        """Find the breaking animation texture of a stage"""
+        stage_names = [
+            f"destroy_stage_{stage}",
+            f"destroy_{stage}",
+            f"breaking_{stage}",
+            f"crack_{stage}"
+        ]
+        
+        for stage_name in stage_names:
+            location = packs.find_texture(stage_name, "block")
+            if location:
+                return location
+        return None
+            
+    def find_player_skin(self, packs):
+        """Find the player skin texture"""
+        for name in ["entity/player/wide/steve", "entity/steve", "player/wide/steve", "steve"]:
+            location = packs.find_texture(name)
+            if location:
+                return location
+        return None
     
     def create_fallback_textures(self):
         """Create fallback textures for all items"""
         for item_id in self.block_mappings.keys():
             self.create_fallback_texture(item_id)
+        self.fallback_types = set(self.block_mappings)
         
         # Create fallback breaking textures
         self.create_breaking_animation_textures()
     
     def create_fallback_texture(self, item_type):
         """Create a fallback texture if the original can't be loaded"""
+        self.textures[item_type] = self.create_fallback_surface(item_type)
+    
+    def create_fallback_surface(self, item_type):
+        """Draw the flat-colour stand-in for an item type's texture"""
         surface = pygame.Surface((self.block_size, self.block_size))
         
         # Use the original color scheme as fallback
@@ -317,22 +741,325 @@ class TextureManager:
             
             pygame.draw.rect(surface, (0, 0, 0), surface.get_rect(), 1)
         
-        self.textures[item_type] = surface
+        return surface
     
     def get_texture(self, item_type, variant=None):
-        """Get texture for an item type"""
+        """Get texture for an item type
+        
+        In lazy mode the first request for a texture starts loading it; a
+        placeholder (or the base texture, for a variant) is returned until
+        update() swaps the real one in.
+        """
         if variant:
             texture_key = f"{item_type}_{variant}"
             if texture_key in self.textures:
+                self.last_used[texture_key] = self.frame
                 return self.textures[texture_key]
+            if texture_key in self.sources:
+                texture = self.request_texture(texture_key)
+                if texture:
+                    return texture
         
-        return self.textures.get(item_type, None)
+        texture = self.textures.get(item_type)
+        if texture is not None:
+            self.last_used[item_type] = self.frame
+            return texture
+        if item_type in self.sources:
+            return self.request_texture(item_type) or self.get_placeholder(item_type)
+        return None
+    
+    def request_texture(self, texture_key):
+        """Start loading a lazy texture; returns it if it could be read right away"""
+        if texture_key in self.pending:
+            return None
+        
+        source = self.sources[texture_key]
+        size = (self.block_size, self.block_size)
+        if source[0] == 'atlas':
+            # Copying a few rows out of the mapped atlas is cheap enough to do inline
+            texture = read_source(source, size).convert_alpha()
+            self.store_texture(texture_key, texture)
+            return texture
+        
+        if self.decode_executor is None:
+            workers = TEXTURE_DECODE_WORKERS or os.cpu_count() or 1
+            self.decode_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="texture-decode")
+        self.pending[texture_key] = self.decode_executor.submit(read_source, source, size)
+        return None
+    
+    def collect_decoded_textures(self):
+        """Swap in lazy textures whose decode has finished"""
+        for texture_key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[texture_key]
+            try:
+                self.store_texture(texture_key, future.result().convert_alpha())
+            except Exception as e:
+                # Keep showing the placeholder rather than retrying every frame
+                print(f"Error loading texture {texture_key}: {e}")
+                del self.sources[texture_key]
+    
+    def finish_pending_textures(self):
+        """Wait for every requested lazy texture and swap it in"""
+        wait(list(self.pending.values()))
+        self.collect_decoded_textures()
+    
+    def store_texture(self, texture_key, texture):
+        """Add a lazily loaded texture and tell dependent caches"""
+        self.textures[texture_key] = texture
+        if texture_key in self.animation_meta:
+            self.start_animation(texture_key)
+        self.last_used[texture_key] = self.frame
+        self.texture_bytes += self.get_texture_bytes(texture_key)
+        self.notify_listeners(texture_key)
+    
+    def evict_textures(self):
+        """Unload the least recently used lazy textures until under TEXTURE_MEMORY_BUDGET
+        
+        Only textures unused for TEXTURE_EVICTION_MIN_IDLE_FRAMES are
+        evicted, so the textures on screen are never thrashed. Evicted
+        textures are loaded again on their next request; textures drawn
+        through the texture table are marked used by mark_indexes_used.
+        """
+        idle_frame = self.frame - TEXTURE_EVICTION_MIN_IDLE_FRAMES
+        candidates = [texture_key for texture_key, frame in self.last_used.items()
+                      if frame < idle_frame and texture_key in self.sources and texture_key in self.textures]
+        candidates.sort(key=self.last_used.get)
+        
+        for texture_key in candidates:
+            if self.texture_bytes <= TEXTURE_MEMORY_BUDGET:
+                break
+            self.texture_bytes -= self.get_texture_bytes(texture_key)
+            del self.textures[texture_key]
+            self.animations.pop(texture_key, None)
+            del self.last_used[texture_key]
+            self.notify_listeners(texture_key)
+    
+    def get_stored_texture(self, texture_key):
+        """Get a texture as loaded: the whole strip of frames for an animated texture"""
+        animation = self.animations.get(texture_key)
+        if animation is not None:
+            return animation[0]
+        return self.textures.get(texture_key)
+    
+    def get_texture_bytes(self, texture_key):
+        """Estimate the memory a loaded texture takes"""
+        texture = self.get_stored_texture(texture_key)
+        return texture.get_pitch() * texture.get_height()
+    
+    def start_animation(self, texture_key):
+        """Split a loaded strip texture into its frames and show the current one"""
+        strip = self.textures[texture_key]
+        size = strip.get_width()
+        frames = [strip.subsurface((0, y, size, size)) for y in range(0, strip.get_height() - size + 1, size)]
+        timeline = get_frame_timeline(self.animation_meta[texture_key], len(frames))
+        self.animations[texture_key] = (strip, frames, timeline)
+        self.textures[texture_key] = frames[timeline[self.animation_tick % len(timeline)]]
+    
+    def advance_animations(self):
+        """Move animated textures to the frame the global animation clock is on
+        
+        dirty_textures lists the keys whose frame changed, until the next
+        update(), so only the cells drawn with them need redrawing.
+        """
+        tick = int((time.perf_counter() - self.animation_start) * ANIMATION_TICKS_PER_SECOND)
+        dirty = []
+        if tick != self.animation_tick:
+            self.animation_tick = tick
+            for texture_key, (strip, frames, timeline) in self.animations.items():
+                frame = frames[timeline[tick % len(timeline)]]
+                if self.textures[texture_key] is not frame:
+                    self.textures[texture_key] = frame
+                    self.drop_scaled_textures(texture_key)
+                    dirty.append(texture_key)
+            if dirty:
+                self.texture_table_dirty = True
+        self.dirty_textures = dirty
+    
+    def get_placeholder(self, item_type):
+        """Get the fallback shown while an item type's texture loads"""
+        placeholder = self.placeholders.get(item_type)
+        if placeholder is None:
+            placeholder = self.placeholders[item_type] = self.create_fallback_surface(item_type)
+        return placeholder
+    
+    def add_listener(self, callback):
+        """Call callback(texture_key) whenever a texture is swapped in or evicted
+        
+        texture_key is None when every texture changed at once.
+        """
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Stop notifying a callback"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
+    def notify_listeners(self, texture_key):
+        """Drop derived surfaces of a texture and tell the listeners it changed"""
+        self.drop_scaled_textures(texture_key)
+        self.texture_table_dirty = True
+        for callback in self.listeners:
+            callback(texture_key)
+    
+    def drop_scaled_textures(self, texture_key):
+        """Forget the scaled and tinted copies of a texture (of every texture if texture_key is None)"""
+        if texture_key is None:
+            self.scaled_textures = {}
+            self.tinted_textures = {}
+            return
+        for scaled_key in [scaled_key for scaled_key in self.scaled_textures
+                           if texture_key == scaled_key[0] or texture_key == f"{scaled_key[0]}_{scaled_key[1]}"]:
+            del self.scaled_textures[scaled_key]
+        
+        # A tinted face can be made from several textures of its item type
+        item_type = self.get_item_type(texture_key)
+        if item_type in self.tinted_types:
+            for tinted_key in [tinted_key for tinted_key in self.tinted_textures if tinted_key[0] == item_type]:
+                del self.tinted_textures[tinted_key]
+    
+    def get_item_type(self, texture_key):
+        """Get the item type a texture key such as '2_top' belongs to"""
+        if isinstance(texture_key, str):
+            item_type = texture_key.split('_', 1)[0]
+            return int(item_type) if item_type.isdigit() else texture_key
+        return texture_key
+    
+    def get_tinted_texture(self, item_type, biome, variant=None):
+        """Get a texture tinted with a biome's grass or foliage colour
+        
+        Tinted textures are made once per biome and cached, so drawing one
+        costs the same as drawing an untinted texture.
+        """
+        tinted = self.tinted_textures.get((item_type, variant, biome))
+        if tinted is None:
+            tinted = self.create_tinted_texture(item_type, variant, biome)
+        return tinted
+    
+    def create_tinted_texture(self, item_type, variant, biome):
+        """Tint a texture for a biome, caching it once the textures it is made from are loaded"""
+        texture = self.get_texture(item_type, variant)
+        if texture is None:
+            return None
+        ready = self.is_texture_ready(item_type, variant)
+        
+        colormap = self.tinted_faces.get((item_type, variant))
+        if item_type in self.fallback_types:
+            # Fallbacks are drawn in their own colours
+            tinted = texture
+        elif colormap:
+            tinted = texture.copy()
+            tinted.fill(self.biome_colors[(colormap, biome)], special_flags=pygame.BLEND_RGB_MULT)
+        elif variant in (None, 'side') and (item_type, 'overlay') in self.tinted_faces and self.has_variant(
+                item_type, 'overlay'):
+            overlay = self.get_tinted_texture(item_type, biome, 'overlay')
+            ready = ready and self.is_texture_ready(item_type, 'overlay')
+            tinted = texture
+            if ready:
+                tinted = texture.copy()
+                tinted.blit(overlay, (0, 0))
+        else:
+            tinted = texture
+        
+        # Stand-ins for textures still loading are drawn untinted until they arrive
+        if ready:
+            self.tinted_textures[(item_type, variant, biome)] = tinted
+        return tinted
+    
+    def has_variant(self, item_type, variant):
+        """Check whether the packs have a texture for a variant of an item type"""
+        texture_key = f"{item_type}_{variant}"
+        return texture_key in self.textures or texture_key in self.sources
+    
+    def is_texture_ready(self, item_type, variant=None):
+        """Check whether get_texture() gives the real texture rather than a stand-in for one loading"""
+        if variant and self.has_variant(item_type, variant):
+            return f"{item_type}_{variant}" in self.textures
+        return item_type in self.textures
+    
+    def get_texture_slot(self, block_type, variant):
+        """Get the texture slot of a block variant, adding it if it is new"""
+        key = (block_type, variant)
+        slot = self.texture_slot_indexes.get(key)
+        if slot is None:
+            slot = self.texture_slot_indexes[key] = len(self.texture_slots)
+            self.texture_slots.append(key)
+        return slot
+        
+    def get_column_texture_indexes(self, column, biome):
+        """Work out the texture index of every cell of a column of blocks (0 for air)"""
+        indexes = [0] * len(column)
+        above = BLOCK_AIR
+        for y, block_type in enumerate(column):
+            if block_type != BLOCK_AIR:
+                slot = self.get_texture_slot(block_type, get_block_variant(block_type, above))
+                indexes[y] = slot * BIOME_COUNT + biome
+            above = block_type
+        return indexes
+    
+    def get_texture_table(self):
+        """Get the texture of every texture index
+        
+        Index slot * BIOME_COUNT + biome holds that slot's texture for the
+        biome, tinted where needed. Air and missing textures get
+        placeholders, as do slots whose textures are not loaded; those are
+        only requested once mark_indexes_used sees them drawn.
+        """
+        slots = self.texture_slots
+        if self.texture_table_dirty or len(self.texture_table) < len(slots) * BIOME_COUNT:
+            self.texture_table_dirty = False
+            self.texture_table = [self.get_slot_texture(item_type, variant, biome)
+                                  for item_type, variant in slots for biome in range(BIOME_COUNT)]
+        return self.texture_table
+    
+    def get_slot_texture(self, item_type, variant, biome):
+        """Get the texture a texture table entry draws"""
+        if item_type == BLOCK_AIR:
+            return None
+        if any(texture_key not in self.textures and texture_key in self.sources
+               for texture_key in self.get_slot_texture_keys(item_type, variant)):
+            return self.get_placeholder(item_type)
+        if item_type in self.tinted_types:
+            texture = self.get_tinted_texture(item_type, biome, variant)
+        else:
+            texture = self.get_texture(item_type, variant)
+        return texture or self.get_placeholder(item_type)
+    
+    def get_slot_texture_keys(self, item_type, variant):
+        """Get the keys of the textures a slot's texture is made from"""
+        if variant and self.has_variant(item_type, variant):
+            texture_keys = [f"{item_type}_{variant}"]
+        else:
+            texture_keys = [item_type]
+        if ((item_type, 'overlay') in self.tinted_faces and variant in (None, 'side')
+                and self.has_variant(item_type, 'overlay')):
+            texture_keys.append(f"{item_type}_overlay")
+        return texture_keys
+    
+    def mark_indexes_used(self, indexes):
+        """Mark the textures of texture indexes drawn this frame as used, requesting any not loaded
+        
+        Call before get_texture_table() each frame with the indexes on
+        screen, so lazy textures stay loaded exactly while they are drawn.
+        """
+        for slot in {index // BIOME_COUNT for index in indexes if index}:
+            item_type, variant = self.texture_slots[slot]
+            for texture_key in self.get_slot_texture_keys(item_type, variant):
+                if texture_key in self.textures:
+                    self.last_used[texture_key] = self.frame
+                elif texture_key in self.sources:
+                    self.request_texture(texture_key)
     
     def get_scaled_texture(self, item_type, size, variant=None):
-        """Get texture scaled to specific size"""
+        """Get texture scaled to specific size (cached until the texture changes)"""
         texture = self.get_texture(item_type, variant)
         if texture and size != self.block_size:
-            return pygame.transform.scale(texture, (size, size))
+            scaled_key = (item_type, variant, size)
+            scaled = self.scaled_textures.get(scaled_key)
+            if scaled is None:
+                scaled = self.scaled_textures[scaled_key] = pygame.transform.scale(texture, (size, size))
+            return scaled
         return texture
     
     def get_player_texture(self):
@@ -341,7 +1068,7 @@ class TextureManager:
     
     def has_texture(self, item_type):
         """Check if texture exists for item type"""
-        return item_type in self.textures
+        return item_type in self.textures or item_type in self.sources
     
     def create_breaking_animation_textures(self):
         """Create block breaking animation textures"""
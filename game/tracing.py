@@ -0,0 +1,105 @@
+"""
+Chrome trace-event capture for diagnosing frame hitches
+"""
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from .constants import *
+
+class TraceCapture:
+    """Record begin/end events over a number of frames and write Chrome trace-event JSON"""
+    
+    def __init__(self):
+        self.active = False
+        self.events = []
+        self.frames_remaining = 0
+        self.frame_index = 0
+        self.thread_ids = set()
+        self.pid = os.getpid()
+        self.output_path = None
+    
+    def start(self, frames=TRACE_CAPTURE_FRAMES):
+        """Start capturing for the given number of frames"""
+        if self.active:
+            return
+        self.events = []
+        self.thread_ids = set()
+        self.frames_remaining = frames
+        self.frame_index = 0
+        self.output_path = f"logs/trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.active = True
+    
+    def add_event(self, name, category, phase):
+        """Record a trace event on the calling thread"""
+        thread_id = threading.get_ident()
+        if thread_id not in self.thread_ids:
+            # Name the thread once so worker threads are labelled in the viewer
+            self.thread_ids.add(thread_id)
+            self.events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': thread_id,
+                'args': {'name': threading.current_thread().name}
+            })
+        
+        self.events.append({
+            'name': name, 'cat': category, 'ph': phase,
+            'ts': time.perf_counter_ns() / 1000.0, 'pid': self.pid, 'tid': thread_id
+        })
+    
+    def begin(self, name, category="game"):
+        """Record the start of a zone"""
+        if self.active:
+            self.add_event(name, category, 'B')
+    
+    def end(self, name, category="game"):
+        """Record the end of a zone"""
+        if self.active:
+            self.add_event(name, category, 'E')
+    
+    def end_frame(self):
+        """Mark a frame boundary and finish the capture once enough frames are recorded"""
+        if not self.active:
+            return None
+        
+        self.events.append({
+            'name': f"frame {self.frame_index}", 'ph': 'i', 's': 'g',
+            'ts': time.perf_counter_ns() / 1000.0, 'pid': self.pid, 'tid': threading.get_ident()
+        })
+        self.frame_index += 1
+        self.frames_remaining -= 1
+        
+        if self.frames_remaining <= 0:
+            return self.stop()
+        return None
+    
+    def stop(self):
+        """Stop capturing and write the trace, returning its path"""
+        if not self.active:
+            return None
+        self.active = False
+        
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        with open(self.output_path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        self.events = []
+        return self.output_path
+
+# Shared capture used by the traced decorator and profiler zones
+tracer = TraceCapture()
+
+def traced(name, category="game"):
+    """Decorator recording begin/end trace events around a function while capturing"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.active:
+                return func(*args, **kwargs)
+            tracer.add_event(name, category, 'B')
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.add_event(name, category, 'E')
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -3,6 +3,8 @@ Utility functions for the game
 """
 import pygame
 import math
+import os
+import sys
 from .constants import *
 
 def clamp(value, min_value, max_value):
@@ -69,6 +71,31 @@ def draw_text_with_shadow(surface, font, text, x, y, text_color=WHITE, shadow_co
     
     return main_text.get_rect(x=x, y=y)
 
+def percentile(values, pct):
+    """Get the pct-th percentile (nearest rank) of a list of values"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(len(ordered) - 1, max(0, rank - 1))]
+
+def get_rss_bytes():
+    """Get the resident set size of this process in bytes (0 if unknown)"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    try:
+        import resource
+    except ImportError:
+        return 0
+    
+    # Without /proc only the peak RSS is available (bytes on macOS, KiB elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
 def safe_divide(numerator, denominator, default=0):
     """Safely divide two numbers, returning default if denominator is zero"""
     return numerator / denominator if denominator != 0 else default
@@ -2,55 +2,148 @@ import random
 import noise
 import json
 import os
+import time
 from .constants import *
+from .tracing import traced
+from .metrics import metrics
+
+# World metrics (no-ops unless the registry is enabled)
+chunks_generated = metrics.counter("world.chunks_generated")
+chunks_loaded_from_disk = metrics.counter("world.chunks_loaded_from_disk")
+chunks_saved = metrics.counter("world.chunks_saved")
+chunks_unloaded = metrics.counter("world.chunks_unloaded")
+chunk_bytes_saved = metrics.counter("world.chunk_bytes_saved")
+chunk_bytes_loaded = metrics.counter("world.chunk_bytes_loaded")
+chunk_generate_ms = metrics.histogram("world.chunk_generate_ms")
+chunk_stage_ms = metrics.histogram("world.chunk_stage_ms")
+chunk_save_ms = metrics.histogram("world.chunk_save_ms")
+chunk_load_ms = metrics.histogram("world.chunk_load_ms")
+loaded_chunks_gauge = metrics.gauge("world.loaded_chunks")
+residency_updates = metrics.counter("world.residency_updates")
+item_drops_gauge = metrics.gauge("world.item_drops")
+item_drops_merged = metrics.counter("world.item_drops_merged")
+
+def get_biome(world_x):
+    """Get the biome of a world column"""
+    biome_noise = noise.pnoise1(world_x * 0.01, octaves=2, persistence=0.5)
+    
+    if biome_noise < -0.3:
+        return BIOME_DESERT
+    elif biome_noise < 0.1:
+        return BIOME_PLAINS
+    elif biome_noise < 0.4:
+        return BIOME_FOREST
+    return BIOME_MOUNTAINS
+
+def get_surface_height(world_x, biome):
+    """Get the terrain surface height of a world column
+    
+    Depends only on the column, so structure generation can look at
+    neighboring chunks' terrain without generating them.
+    """
+    # Base height with biome variation
+    height_noise = noise.pnoise1(world_x * 0.02, octaves=4, persistence=0.5, lacunarity=2.0)
+    
+    if biome == BIOME_MOUNTAINS:
+        surface_height = int(SURFACE_LEVEL + height_noise * 25)
+    elif biome == BIOME_DESERT:
+        surface_height = int(SURFACE_LEVEL + height_noise * 8)
+    else:
+        surface_height = int(SURFACE_LEVEL + height_noise * 12)
+    
+    # Clamp surface height
+    return max(20, min(WORLD_HEIGHT - 20, surface_height))
+
+def plan_trees(world_seed, chunk_x):
+    """Plan the trees rooted in a chunk as (world_x, surface_y, height, leaves)
+    
+    leaves lists the (dx, dy) crown offsets that get a leaf block. Every
+    column draws the same number of values, so a chunk's plan is the
+    same whichever of its neighbors asks for it.
+    """
+    rng = random.Random(f"{world_seed}:{chunk_x}:trees")
+    trees = []
+    for local_x in range(CHUNK_SIZE):
+        world_x = chunk_x * CHUNK_SIZE + local_x
+        biome = get_biome(world_x)
+        roll = rng.random()
+        height = rng.randint(4, 7)
+        leaves = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 1) if rng.random() < 0.8]
+        
+        # Trees in forest biome, occasional trees in plains
+        if (biome == BIOME_FOREST and roll < 0.15) or (biome == BIOME_PLAINS and roll < 0.05):
+            trees.append((world_x, get_surface_height(world_x, biome), height, leaves))
+    return trees
 
 class Chunk:
     def __init__(self, chunk_x):
         self.chunk_x = chunk_x
         self.blocks = [[BLOCK_AIR for _ in range(WORLD_HEIGHT)] for _ in range(CHUNK_SIZE)]
         self.biomes = [BIOME_PLAINS for _ in range(CHUNK_SIZE)]
+        self.texture_indexes = [None] * CHUNK_SIZE  # Per column, worked out when first drawn
+        self.texture_indexer = None  # Texture manager the texture indexes were worked out by
+        self.stage = GEN_STAGE_NONE  # Last generation stage completed
+        self.ore_rng = None  # Carried into the structure stage by generation version 1
+        self.generate_time = 0.0  # Seconds spent in generation stages so far
         self.generated = False
         self.modified = False  # Track if chunk has been modified
     
-    def generate(self, world_seed=0):
-        """Generate this chunk"""
+    @traced("Chunk.generate", "world")
+    def generate(self, world_seed=0, version=GENERATION_VERSION):
+        """Generate this chunk, running every stage that is left"""
+        while not self.generated:
+            self.advance_generation(world_seed, version)
+    
+    def advance_generation(self, world_seed=0, version=GENERATION_VERSION):
+        """Run the next generation stage; returns True once the chunk is generated
+        
+        Stages only depend on the seed, the chunk index and earlier stages
+        of the same chunk, so a chunk can be advanced a stage at a time
+        across frames and still comes out identical. version picks the
+        generator, so worlds keep generating as they were first created.
+        """
         if self.generated:
-            return
+            return True
         
-        # Set random seed for consistent generation
-        random.seed(world_seed + self.chunk_x * 1000)
+        start_time = time.perf_counter()
+        stage = self.stage + 1
         
-        # Generate biomes for this chunk
-        for local_x in range(CHUNK_SIZE):
-            world_x = self.chunk_x * CHUNK_SIZE + local_x
-            biome_noise = noise.pnoise1(world_x * 0.01, octaves=2, persistence=0.5)
-            
-            if biome_noise < -0.3:
-                self.biomes[local_x] = BIOME_DESERT
-            elif biome_noise < 0.1:
-                self.biomes[local_x] = BIOME_PLAINS
-            elif biome_noise < 0.4:
-                self.biomes[local_x] = BIOME_FOREST
+        if stage == GEN_STAGE_BIOMES:
+            self.generate_biomes()
+        elif stage == GEN_STAGE_TERRAIN:
+            self.generate_terrain()
+        elif stage == GEN_STAGE_ORES:
+            self.ore_rng = random.Random(world_seed + self.chunk_x * 1000)
+            self.generate_ores(self.ore_rng)
+        else:
+            if version == 1:
+                self.generate_structures_v1(self.ore_rng)
             else:
-                self.biomes[local_x] = BIOME_MOUNTAINS
+                self.generate_structures(world_seed)
+            self.ore_rng = None
+        self.stage = stage
+        
+        elapsed = time.perf_counter() - start_time
+        self.generate_time += elapsed
+        chunk_stage_ms.observe(elapsed * 1000)
         
-        # Generate terrain
+        if stage == GEN_STAGE_STRUCTURES:
+            self.generated = True
+            chunks_generated.inc()
+            chunk_generate_ms.observe(self.generate_time * 1000)
+        return self.generated
+    
+    def generate_biomes(self):
+        """Generate biomes for this chunk"""
+        for local_x in range(CHUNK_SIZE):
+            self.biomes[local_x] = get_biome(self.chunk_x * CHUNK_SIZE + local_x)
+            
+    def generate_terrain(self):
+        """Generate the terrain of this chunk"""
         for local_x in range(CHUNK_SIZE):
             world_x = self.chunk_x * CHUNK_SIZE + local_x
             biome = self.biomes[local_x]
-            
-            # Base height with biome variation
-            height_noise = noise.pnoise1(world_x * 0.02, octaves=4, persistence=0.5, lacunarity=2.0)
-            
-            if biome == BIOME_MOUNTAINS:
-                surface_height = int(SURFACE_LEVEL + height_noise * 25)
-            elif biome == BIOME_DESERT:
-                surface_height = int(SURFACE_LEVEL + height_noise * 8)
-            else:
-                surface_height = int(SURFACE_LEVEL + height_noise * 12)
-            
-            # Clamp surface height
-            surface_height = max(20, min(WORLD_HEIGHT - 20, surface_height))
+            surface_height = get_surface_height(world_x, biome)
             
             # Fill blocks from surface down to bottom
             for y in range(WORLD_HEIGHT):
@@ -73,23 +166,12 @@ class Chunk:
                     # Stone below dirt
                     self.blocks[local_x][y] = BLOCK_STONE
         
-        # Generate ores
-        self.generate_ores()
-        
-        # Generate structures
-        self.generate_structures()
-        
-        self.generated = True
-        
-        # Reset random seed
-        random.seed()
-    
-    def generate_ores(self):
+    def generate_ores(self, rng):
         """Generate ore deposits in this chunk"""
         # Coal ore (closer to surface)
         for _ in range(CHUNK_SIZE // 4):
-            local_x = random.randint(0, CHUNK_SIZE - 1)
-            y = random.randint(SURFACE_LEVEL + 10, WORLD_HEIGHT - 10)
+            local_x = rng.randint(0, CHUNK_SIZE - 1)
+            y = rng.randint(SURFACE_LEVEL + 10, WORLD_HEIGHT - 10)
             
             if self.get_block(local_x, y) == BLOCK_STONE:
                 # Create small coal vein
@@ -97,19 +179,54 @@ class Chunk:
                     for dy in range(-1, 2):
                         if (0 <= local_x + dx < CHUNK_SIZE and 0 <= y + dy < WORLD_HEIGHT and
                             self.get_block(local_x + dx, y + dy) == BLOCK_STONE and
-                            random.random() < 0.6):
+                            rng.random() < 0.6):
                             self.blocks[local_x + dx][y + dy] = BLOCK_COAL
         
         # Iron ore (deeper)
         for _ in range(CHUNK_SIZE // 8):
-            local_x = random.randint(0, CHUNK_SIZE - 1)
-            y = random.randint(SURFACE_LEVEL + 20, WORLD_HEIGHT - 5)
+            local_x = rng.randint(0, CHUNK_SIZE - 1)
+            y = rng.randint(SURFACE_LEVEL + 20, WORLD_HEIGHT - 5)
             
-            if self.get_block(local_x, y) == BLOCK_STONE and random.random() < 0.3:
+            if self.get_block(local_x, y) == BLOCK_STONE and rng.random() < 0.3:
                 self.blocks[local_x][y] = BLOCK_IRON
     
-    def generate_structures(self):
-        """Generate trees and other structures in this chunk"""
+    def generate_structures(self, world_seed):
+        """Generate trees and other structures in this chunk
+            
+        Trees rooted in the neighboring chunks are included, so crowns
+        cross chunk borders; each chunk places the blocks falling inside it.
+        """
+        trees = []
+        for chunk_x in (self.chunk_x - 1, self.chunk_x, self.chunk_x + 1):
+            trees.extend(plan_trees(world_seed, chunk_x))
+            
+        for world_x, surface_y, tree_height, leaves in trees:
+            self.generate_tree(world_x - self.chunk_x * CHUNK_SIZE, surface_y, tree_height, leaves)
+            
+    def generate_tree(self, local_x, surface_y, tree_height, leaves):
+        """Place the parts of a tree that fall inside this chunk"""
+        # Tree trunk (going up from surface)
+        if 0 <= local_x < CHUNK_SIZE:
+            for i in range(tree_height):
+                trunk_y = surface_y - 1 - i
+                if trunk_y >= 0:
+                    self.blocks[local_x][trunk_y] = BLOCK_WOOD
+        
+        # Tree leaves (crown above trunk)
+        leaf_center_y = surface_y - tree_height - 1
+        for dx, dy in leaves:
+            leaf_x = local_x + dx
+            leaf_y = leaf_center_y + dy
+                
+            if (0 <= leaf_x < CHUNK_SIZE and 0 <= leaf_y < WORLD_HEIGHT and
+                self.blocks[leaf_x][leaf_y] == BLOCK_AIR):
+                self.blocks[leaf_x][leaf_y] = BLOCK_LEAVES
+    
+    def generate_structures_v1(self, rng):
+        """Generate trees as generation version 1 did, continuing the ore stage's generator
+        
+        Trees stay clear of the chunk edges and are cut off at them.
+        """
         for local_x in range(2, CHUNK_SIZE - 2):
             biome = self.biomes[local_x]
             
@@ -123,34 +240,15 @@ class Chunk:
             if surface_y is None:
                 continue
             
-            # Generate trees in forest biome
-            if biome == BIOME_FOREST and random.random() < 0.15:
-                self.generate_tree(local_x, surface_y)
-            # Occasional trees in plains
-            elif biome == BIOME_PLAINS and random.random() < 0.05:
-                self.generate_tree(local_x, surface_y)
-    
-    def generate_tree(self, local_x, surface_y):
-        """Generate a tree at the given position"""
-        tree_height = random.randint(4, 7)
-        
-        # Tree trunk (going up from surface)
-        for i in range(tree_height):
-            trunk_y = surface_y - 1 - i
-            if trunk_y >= 0:
-                self.blocks[local_x][trunk_y] = BLOCK_WOOD
-        
-        # Tree leaves (crown above trunk)
-        leaf_center_y = surface_y - tree_height - 1
-        for dx in range(-2, 3):
-            for dy in range(-2, 1):
-                leaf_x = local_x + dx
-                leaf_y = leaf_center_y + dy
-                
-                if (0 <= leaf_x < CHUNK_SIZE and 0 <= leaf_y >= 0 and
-                    self.get_block(leaf_x, leaf_y) == BLOCK_AIR and
-                    random.random() < 0.8):
-                    self.blocks[leaf_x][leaf_y] = BLOCK_LEAVES
+            # Trees in forest biome, occasional trees in plains
+            if (biome == BIOME_FOREST and rng.random() < 0.15) or (biome == BIOME_PLAINS and rng.random() < 0.05):
+                tree_height = rng.randint(4, 7)
+                leaf_center_y = surface_y - tree_height - 1
+                leaves = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 1)
+                          if 0 <= local_x + dx < CHUNK_SIZE and leaf_center_y + dy >= 0 and
+                          self.get_block(local_x + dx, leaf_center_y + dy) == BLOCK_AIR and
+                          rng.random() < 0.8]
+                self.generate_tree(local_x, surface_y, tree_height, leaves)
     
     def get_block(self, local_x, y):
         """Get block at local position within chunk"""
@@ -158,10 +256,34 @@ class Chunk:
             return self.blocks[local_x][y]
         return BLOCK_AIR
     
+    def get_biome(self, local_x):
+        """Get the biome of a column within chunk"""
+        if 0 <= local_x < CHUNK_SIZE:
+            return self.biomes[local_x]
+        return BIOME_PLAINS
+    
+    def get_texture_indexes(self, local_x, texture_manager):
+        """Get the texture index of every cell of a column within chunk, or None
+        
+        The indexes are worked out by the texture manager that draws them
+        and kept until the column changes.
+        """
+        if not 0 <= local_x < CHUNK_SIZE:
+            return None
+        if texture_manager is not self.texture_indexer:
+            self.texture_indexer = texture_manager
+            self.texture_indexes = [None] * CHUNK_SIZE
+        indexes = self.texture_indexes[local_x]
+        if indexes is None:
+            indexes = self.texture_indexes[local_x] = texture_manager.get_column_texture_indexes(
+                self.blocks[local_x], self.biomes[local_x])
+        return indexes
+    
     def set_block(self, local_x, y, block_type):
         """Set block at local position within chunk"""
         if 0 <= local_x < CHUNK_SIZE and 0 <= y < WORLD_HEIGHT:
             self.blocks[local_x][y] = block_type
+            self.texture_indexes[local_x] = None  # The block below may change variant too
             self.modified = True  # Mark chunk as modified
             return True
         return False
@@ -183,15 +305,18 @@ class Chunk:
         chunk.blocks = data['blocks']
         chunk.biomes = data['biomes']
         chunk.generated = data['generated']
+        if chunk.generated:
+            chunk.stage = GEN_STAGE_STRUCTURES
         chunk.modified = data.get('modified', False)
         return chunk
 
 
 class World:
-    def __init__(self, seed=None, save_name="default"):
+    def __init__(self, seed=None, save_name="default", scheduler=None):
         self.seed = seed or random.randint(0, 1000000)
         self.save_name = save_name
         self.save_dir = f"saves/{save_name}"
+        self.generation_version = GENERATION_VERSION
         
         # Create save directory if it doesn't exist
         os.makedirs(self.save_dir, exist_ok=True)
@@ -200,9 +325,25 @@ class World:
         self.chunks = {}  # Dictionary of chunk_x -> Chunk
         self.item_drops = []  # List of item drops in the world
         
+        # Chunks around the camera that are loaded immediately and simulated;
+        # the rest of the render distance is prefetched by scheduler jobs
+        # when a scheduler is given, and loaded immediately otherwise
+        self.scheduler = scheduler
+        self.required_chunks = set()
+        self.center_chunk_x = 0
+        self.render_distance = RENDER_DISTANCE
+        self.resident_distance = None  # Render distance residency was last updated for
+        self.queued_loads = set()
+        self.pending_saves = {}  # chunk_x -> unloaded chunk waiting for its save job
+        self.generating = {}  # chunk_x -> prefetched chunk part way through generation
+        
         # Try to load existing world data
         self.load_world_data()
         
+        # Gameplay randomness gets its own seeded generator to keep sessions
+        # reproducible; seeded after loading so saved worlds use their own seed
+        self.rng = random.Random(self.seed)
+        
         # Generate initial chunks around spawn if this is a new world
         if not self.chunks:
             spawn_chunk = 0
@@ -213,83 +354,215 @@ class World:
         """Save world metadata"""
         world_data = {
             'seed': self.seed,
-            'save_name': self.save_name
+            'save_name': self.save_name,
+            'generation_version': self.generation_version
         }
         
         with open(f"{self.save_dir}/world.json", 'w') as f:
             json.dump(world_data, f)
     
     def load_world_data(self):
-        """Load world metadata"""
+        """Load world metadata
+        
+        Raises ValueError for a world made by a generator this version of
+        the game does not have, since its new chunks would not line up.
+        """
         world_file = f"{self.save_dir}/world.json"
         if os.path.exists(world_file):
             try:
                 with open(world_file, 'r') as f:
                     world_data = json.load(f)
                     self.seed = world_data.get('seed', self.seed)
+                    # Worlds saved before versioning used the first generator
+                    self.generation_version = world_data.get('generation_version', 1)
                     print(f"Loaded world with seed: {self.seed}")
             except Exception as e:
                 print(f"Error loading world data: {e}")
+            
+            if not OLDEST_GENERATION_VERSION <= self.generation_version <= GENERATION_VERSION:
+                raise ValueError(f"World {self.save_name} was generated by generation version "
+                                 f"{self.generation_version}, which this version of the game cannot continue")
+            if self.generation_version != GENERATION_VERSION:
+                print(f"World was generated by generation version {self.generation_version}; "
+                      f"new chunks keep using it")
     
+    def get_chunk_path(self, chunk_x):
+        """Get the save file of a chunk"""
+        return f"{self.save_dir}/chunk_{chunk_x}.json"
+    
+    @traced("World.save_chunk", "world")
     def save_chunk(self, chunk):
         """Save a single chunk to disk"""
         if chunk.modified:
-            chunk_file = f"{self.save_dir}/chunk_{chunk.chunk_x}.json"
+            chunk_file = self.get_chunk_path(chunk.chunk_x)
             try:
+                start_time = time.perf_counter()
+                chunk_data = json.dumps(chunk.to_dict())
                 with open(chunk_file, 'w') as f:
-                    json.dump(chunk.to_dict(), f)
+                    f.write(chunk_data)
                 chunk.modified = False  # Reset modified flag after saving
+                
+                chunks_saved.inc()
+                chunk_bytes_saved.inc(len(chunk_data))
+                chunk_save_ms.observe((time.perf_counter() - start_time) * 1000)
             except Exception as e:
                 print(f"Error saving chunk {chunk.chunk_x}: {e}")
     
+    @traced("World.load_chunk_from_disk", "world")
     def load_chunk_from_disk(self, chunk_x):
         """Load a chunk from disk"""
-        chunk_file = f"{self.save_dir}/chunk_{chunk_x}.json"
+        chunk_file = self.get_chunk_path(chunk_x)
         if os.path.exists(chunk_file):
             try:
+                start_time = time.perf_counter()
                 with open(chunk_file, 'r') as f:
-                    chunk_data = json.load(f)
-                    return Chunk.from_dict(chunk_data)
+                    chunk_text = f.read()
+                chunk = Chunk.from_dict(json.loads(chunk_text))
+                
+                chunks_loaded_from_disk.inc()
+                chunk_bytes_loaded.inc(len(chunk_text))
+                chunk_load_ms.observe((time.perf_counter() - start_time) * 1000)
+                return chunk
             except Exception as e:
                 print(f"Error loading chunk {chunk_x}: {e}")
         return None
     
+    @traced("World.load_chunk", "world")
     def load_chunk(self, chunk_x):
         """Load a chunk if it doesn't exist"""
         if chunk_x not in self.chunks:
-            # Try to load from disk first
-            chunk = self.load_chunk_from_disk(chunk_x)
+            # An unloaded chunk still waiting to be saved is newer than its file
+            chunk = self.pending_saves.pop(chunk_x, None)
+            if chunk is not None:
+                self.scheduler.cancel(('save', chunk_x))
+            else:
+                # A prefetch may have generated part of the chunk already
+                chunk = self.generating.pop(chunk_x, None) or self.load_chunk_from_disk(chunk_x)
             
             if chunk is None:
                 # Generate new chunk if not found on disk
                 chunk = Chunk(chunk_x)
-                chunk.generate(self.seed)
+            chunk.generate(self.seed, self.generation_version)
             
             self.chunks[chunk_x] = chunk
+            loaded_chunks_gauge.set(len(self.chunks))
     
     def unload_distant_chunks(self, player_chunk_x):
         """Unload chunks that are too far from the player"""
         chunks_to_unload = []
         for chunk_x in self.chunks:
-            if abs(chunk_x - player_chunk_x) > RENDER_DISTANCE + 2:
+            if abs(chunk_x - player_chunk_x) > self.render_distance + 2:
                 chunks_to_unload.append(chunk_x)
         
         for chunk_x in chunks_to_unload:
+            chunk = self.chunks.pop(chunk_x)
+            chunks_unloaded.inc()
+            
             # Save chunk before unloading if it was modified
-            self.save_chunk(self.chunks[chunk_x])
-            del self.chunks[chunk_x]
+            if self.scheduler and chunk.modified:
+                self.pending_saves[chunk_x] = chunk
+                self.scheduler.submit(lambda chunk_x=chunk_x: self.flush_pending_save(chunk_x),
+                                      JOB_PRIORITY_CHUNK_SAVE, "save chunk", ('save', chunk_x))
+            else:
+                self.save_chunk(chunk)
+        
+        if chunks_to_unload:
+            loaded_chunks_gauge.set(len(self.chunks))
     
     def ensure_chunks_loaded(self, player_x):
-        """Ensure chunks around player are loaded"""
+        """Ensure chunks around player are loaded
+        
+        Called every tick, but residency only changes when the player
+        enters another chunk or the render distance changes.
+        """
         player_chunk_x = int(player_x // (CHUNK_SIZE * BLOCK_SIZE))
+        if player_chunk_x != self.center_chunk_x or self.render_distance != self.resident_distance:
+            self.update_residency(player_chunk_x)
+    
+    def set_render_distance(self, distance):
+        """Change the render distance; chunks are loaded or unloaded on the next tick"""
+        self.render_distance = distance
+    
+    @traced("World.update_residency", "world")
+    def update_residency(self, player_chunk_x):
+        """Diff the chunks wanted around the player against the loaded ones"""
+        self.center_chunk_x = player_chunk_x
+        self.resident_distance = self.render_distance
+        residency_updates.inc()
         
-        # Load chunks in render distance
-        for chunk_x in range(player_chunk_x - RENDER_DISTANCE, player_chunk_x + RENDER_DISTANCE + 1):
+        # Chunks in simulation distance are needed right away
+        simulation_distance = min(SIMULATION_DISTANCE, self.render_distance)
+        self.required_chunks = set(range(player_chunk_x - simulation_distance,
+                                         player_chunk_x + simulation_distance + 1))
+        for chunk_x in sorted(self.required_chunks - self.chunks.keys()):
             self.load_chunk(chunk_x)
         
+        # Load the rest of the render distance, nearest first
+        wanted_chunks = set(range(player_chunk_x - self.render_distance,
+                                  player_chunk_x + self.render_distance + 1))
+        for chunk_x in sorted(wanted_chunks - self.chunks.keys(), key=lambda x: abs(x - player_chunk_x)):
+            if self.scheduler is None:
+                self.load_chunk(chunk_x)
+            else:
+                self.queue_prefetch(chunk_x, abs(chunk_x - player_chunk_x))
+        
+        # Drop queued loads the player has moved away from
+        for chunk_x in self.queued_loads - wanted_chunks:
+            self.scheduler.cancel(('load', chunk_x))
+            self.queued_loads.discard(chunk_x)
+            self.generating.pop(chunk_x, None)
+        
         # Unload distant chunks to save memory
         self.unload_distant_chunks(player_chunk_x)
     
+    def get_streaming_progress(self):
+        """Get (loaded, wanted) chunk counts for the render distance around the camera"""
+        wanted = range(self.center_chunk_x - self.render_distance, self.center_chunk_x + self.render_distance + 1)
+        return sum(1 for chunk_x in wanted if chunk_x in self.chunks), len(wanted)
+    
+    def queue_prefetch(self, chunk_x, distance):
+        """Queue the next prefetch step of a chunk, nearer chunks first"""
+        chunk = self.generating.get(chunk_x)
+        if chunk is not None:
+            name = f"generate {GEN_STAGE_NAMES[chunk.stage + 1]}"
+        else:
+            name = "load chunk"
+        if self.scheduler.submit(lambda: self.prefetch_chunk(chunk_x),
+                                 JOB_PRIORITY_CHUNK_LOAD + distance, name, ('load', chunk_x)):
+            self.queued_loads.add(chunk_x)
+    
+    def prefetch_chunk(self, chunk_x):
+        """Scheduler job loading a chunk in render distance ahead of time
+        
+        Saved chunks load in one job; new chunks run one generation stage
+        per job so no single job takes a whole chunk's generation time.
+        """
+        self.queued_loads.discard(chunk_x)
+        distance = abs(chunk_x - self.center_chunk_x)
+        if distance > self.render_distance:
+            self.generating.pop(chunk_x, None)
+            return
+        if chunk_x in self.chunks:
+            return
+        
+        chunk = self.generating.get(chunk_x)
+        if chunk is None:
+            if chunk_x in self.pending_saves or os.path.exists(self.get_chunk_path(chunk_x)):
+                self.load_chunk(chunk_x)
+                return
+            chunk = self.generating[chunk_x] = Chunk(chunk_x)
+        
+        if chunk.advance_generation(self.seed, self.generation_version):
+            self.load_chunk(chunk_x)
+        else:
+            self.queue_prefetch(chunk_x, distance)
+    
+    def flush_pending_save(self, chunk_x):
+        """Scheduler job saving a chunk that was unloaded"""
+        chunk = self.pending_saves.pop(chunk_x, None)
+        if chunk is not None:
+            self.save_chunk(chunk)
+    
     def world_to_chunk_coords(self, world_x):
         """Convert world x coordinate to chunk coordinates"""
         chunk_x = world_x // CHUNK_SIZE
@@ -310,6 +583,22 @@ class World:
             return self.chunks[chunk_x].get_block(local_x, y)
         return BLOCK_AIR
     
+    def get_biome(self, x):
+        """Get the biome of a world column (plains where no chunk is loaded)"""
+        chunk_x, local_x = self.world_to_chunk_coords(x)
+        
+        if chunk_x in self.chunks:
+            return self.chunks[chunk_x].get_biome(local_x)
+        return BIOME_PLAINS
+    
+    def get_texture_indexes(self, x, texture_manager):
+        """Get the texture index of every cell of a world column, or None if it is not loaded"""
+        chunk_x, local_x = self.world_to_chunk_coords(x)
+        
+        if chunk_x in self.chunks:
+            return self.chunks[chunk_x].get_texture_indexes(local_x, texture_manager)
+        return None
+    
     def set_block(self, x, y, block_type):
         """Set block at world position"""
         if y < 0 or y >= WORLD_HEIGHT:
@@ -334,17 +623,28 @@ class World:
         self.item_drops.append({
             'x': x,
             'y': y,
+            'prev_x': x,  # Position at the previous tick (for render interpolation)
+            'prev_y': y,
             'type': item_type,
             'vel_y': -2,  # Initial upward velocity
-            'vel_x': random.uniform(-1, 1),  # Random horizontal velocity
+            'vel_x': self.rng.uniform(-1, 1),  # Random horizontal velocity
             'time': 0,
             'on_ground': False,
             'count': 1  # Stack count
         })
     
+    @traced("World.update_item_drops", "world")
     def update_item_drops(self):
         """Update physics for item drops with stacking"""
         for item in self.item_drops:
+            item['prev_x'] = item['x']
+            item['prev_y'] = item['y']
+            
+            # Only drops in simulated chunks move; elsewhere the chunk may
+            # not be loaded and with no blocks under them they would fall forever
+            if int(item['x'] // BLOCK_SIZE) // CHUNK_SIZE not in self.required_chunks:
+                continue
+            
             item['time'] += 1
             
             # Apply gravity only if not on ground
@@ -395,6 +695,7 @@ class World:
         
         # Stack nearby items of the same type
         self.stack_nearby_items()
+        item_drops_gauge.set(len(self.item_drops))
     
     def stack_nearby_items(self):
         """Stack nearby items of the same type"""
@@ -420,6 +721,7 @@ class World:
                         # Merge completely
                         item1['count'] = total_count
                         self.item_drops.remove(item2)
+                        item_drops_merged.inc()
                         break  # Break inner loop since we modified the list
                     else:
                         # Partial merge
@@ -446,11 +748,21 @@ class World:
         """Get list of loaded chunk coordinates"""
         return list(self.chunks.keys())
     
+    def get_pending_save_count(self):
+        """Get the number of chunks with unsaved changes, loaded or queued for saving"""
+        return sum(1 for chunk in self.chunks.values() if chunk.modified) + len(self.pending_saves)
+    
     def save_all_chunks(self):
         """Save all loaded chunks"""
         for chunk in self.chunks.values():
             self.save_chunk(chunk)
         
+        # Unloaded chunks whose save jobs haven't run yet
+        for chunk_x in list(self.pending_saves):
+            if self.scheduler:
+                self.scheduler.cancel(('save', chunk_x))
+            self.flush_pending_save(chunk_x)
+        
         # Save world metadata
         self.save_world_data()
     
@@ -1,10 +1,88 @@
+import argparse
 import pygame
 import sys
+from game.constants import (TICK_RATE, FPS, VSYNC, BENCHMARK_FRAMES, BENCHMARK_SEED,
+                            METRICS_DUMP_INTERVAL, SOAK_CHUNKS, SOAK_SEED)
 from game.game import Game
+from game.replay import replay_session
+from game.benchmark import run_benchmark, BENCHMARK_SCENARIOS
+from game.metrics import metrics
+from game.memory import run_soak
+from game.generation_check import check_generation
+
+def positive_int(value):
+    """argparse type for an int greater than zero"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="2D Minecraft")
+    parser.add_argument("--tick-rate", type=positive_int, default=TICK_RATE,
+                        help="simulation ticks per second")
+    parser.add_argument("--max-fps", type=int, default=FPS,
+                        help="render frame cap (0 = uncapped)")
+    parser.add_argument("--vsync", action="store_true", default=VSYNC,
+                        help="synchronise rendering to the display refresh rate")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record per-tick input of a fresh world to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording headlessly and check its state hashes")
+    parser.add_argument("--hash-interval", type=int,
+                        help="ticks between state hashes when replaying")
+    parser.add_argument("--hash-output", metavar="PATH",
+                        help="write replay state hashes to PATH as JSON")
+    parser.add_argument("--trace-frames", type=int, default=0, metavar="N",
+                        help="write a Chrome trace of the first N frames after entering a world")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect metrics and dump them to logs/metrics_<time>.csv/.jsonl")
+    parser.add_argument("--metrics-interval", type=float, default=METRICS_DUMP_INTERVAL,
+                        help="seconds between metrics samples")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve game health in Prometheus text format on localhost:PORT")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="run the headless rendering benchmark and exit")
+    parser.add_argument("--benchmark-frames", type=int, default=BENCHMARK_FRAMES,
+                        help="measured frames per benchmark scenario")
+    parser.add_argument("--benchmark-seed", type=int, default=BENCHMARK_SEED,
+                        help="world seed used by the benchmark")
+    parser.add_argument("--benchmark-scenario", action="append", choices=list(BENCHMARK_SCENARIOS),
+                        help="benchmark scenario to run (repeatable, default all)")
+    parser.add_argument("--benchmark-output", metavar="PATH",
+                        help="write benchmark results to PATH (default logs/benchmark_<time>.json)")
+    parser.add_argument("--soak", action="store_true",
+                        help="walk across chunks and back headlessly, failing if memory exceeds budgets")
+    parser.add_argument("--soak-chunks", type=int, default=SOAK_CHUNKS,
+                        help="chunks walked out (and back) by the soak test")
+    parser.add_argument("--soak-seed", type=int, default=SOAK_SEED,
+                        help="world seed used by the soak test")
+    parser.add_argument("--check-generation", action="store_true",
+                        help="check terrain generation against the golden chunk hashes and exit")
+    parser.add_argument("--update-generation-golden", action="store_true",
+                        help="record golden chunk hashes for the current generation version and exit")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    if args.metrics:
+        metrics.enable(args.metrics_interval)
+    
+    if args.replay:
+        sys.exit(replay_session(args.replay, args.hash_interval, args.hash_output))
+    if args.benchmark:
+        sys.exit(run_benchmark(args.benchmark_frames, args.benchmark_seed,
+                               args.benchmark_output, args.benchmark_scenario))
+    if args.check_generation or args.update_generation_golden:
+        sys.exit(check_generation(update=args.update_generation_golden))
+    if args.soak:
+        sys.exit(run_soak(args.soak_chunks, args.soak_seed))
+    
     pygame.init()
-    game = Game()
+    game = Game(tick_rate=args.tick_rate, max_fps=args.max_fps, vsync=args.vsync,
+                record_path=args.record, trace_frames=args.trace_frames,
+                metrics_port=args.metrics_port)
     game.run()
     pygame.quit()
     sys.exit()